@@ -1,10 +1,11 @@
+import abc
 import sys
 import math
 import cv2
 import numpy as np
 import traceback
 import pyttsx3
-from collections import deque
+from collections import deque, OrderedDict
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QLabel, QVBoxLayout, QHBoxLayout,
     QTextEdit, QPushButton, QGridLayout, QSpacerItem, QSizePolicy,
@@ -13,18 +14,31 @@ from PyQt5.QtWidgets import (
 from PyQt5.QtCore import QTimer, Qt, QThread, pyqtSignal
 from PyQt5.QtGui import QImage, QPixmap, QFont, QIcon
 from cvzone.HandTrackingModule import HandDetector
-from keras.models import load_model
 from googletrans import Translator, LANGUAGES
 from gtts import gTTS
 import pygame
 import io
 import os
+import glob
+import json
+import time
+import queue
+import threading
+import argparse
 import tempfile
+import asyncio
+import multiprocessing
+from multiprocessing import shared_memory
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from http import HTTPStatus
 import enchant
 from string import ascii_uppercase
 
-# Initialize pygame mixer for audio playback
-pygame.mixer.init()
+try:
+    import websockets
+except ImportError:
+    websockets = None  # only needed for the network API
 
 
 # -------------------------
@@ -38,13 +52,2170 @@ def distance(x, y):
 # Load model (Keras .h5)
 # -------------------------
 MODEL_PATH = "A.h5"
-try:
-    model = load_model(MODEL_PATH)
-    print("Loaded model:", MODEL_PATH)
-except Exception as e:
-    print("Error loading model:", e)
-    traceback.print_exc()
-    model = None
+model = None
+model_loaded = False
+
+
+def get_model():
+    """Load the classifier on first use; detection worker processes never import Keras"""
+    global model, model_loaded
+    if not model_loaded:
+        model_loaded = True
+        try:
+            from keras.models import load_model
+            model = load_model(MODEL_PATH)
+            print("Loaded model:", MODEL_PATH)
+        except Exception as e:
+            print("Error loading model:", e)
+            traceback.print_exc()
+            model = None
+    return model
+
+
+# -------------------------
+# Capture sources
+# -------------------------
+class CaptureSource(abc.ABC):
+    """Frame source with the cv2.VideoCapture read()/release() interface.
+
+    After each successful read(), timestamp holds the time.monotonic() at
+    which the frame was captured, so callers can measure glass-to-prediction
+    latency. skipped counts frames dropped to stay current.
+    """
+
+    fps = 30.0
+    frame_size = (640, 480)
+
+    def __init__(self):
+        self.timestamp = 0.0
+        self.skipped = 0
+
+    def isOpened(self):
+        return True
+
+    def set_rate(self, fps=None):
+        """Limit how often the source captures frames; None restores the full rate"""
+        pass
+
+    @abc.abstractmethod
+    def read(self):
+        """Return (ok, frame) like cv2.VideoCapture.read()"""
+
+    def release(self):
+        pass
+
+
+class CameraSource(CaptureSource):
+    """Live camera on the platform's native backend with buffering kept to the newest frame.
+
+    V4L2 on Linux, DirectShow on Windows, AVFoundation on macOS. MJPG,
+    resolution and frame rate are requested and read back, and the driver
+    queue is set to one buffer. With threaded=True a grabber thread keeps
+    draining the device so read() always returns the latest frame even when
+    the caller is slower than the camera.
+    """
+
+    def __init__(self, index=0, size=(640, 480), fps=30, fourcc="MJPG", threaded=True):
+        super().__init__()
+        if sys.platform.startswith("linux"):
+            backend = cv2.CAP_V4L2
+        elif sys.platform == "win32":
+            backend = cv2.CAP_DSHOW
+        elif sys.platform == "darwin":
+            backend = cv2.CAP_AVFOUNDATION
+        else:
+            backend = cv2.CAP_ANY
+        self.cap = cv2.VideoCapture(index, backend)
+        if not self.cap.isOpened():
+            self.cap = cv2.VideoCapture(index)
+
+        if fourcc:
+            self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*fourcc))
+        if size:
+            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, size[0])
+            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, size[1])
+        if fps:
+            self.cap.set(cv2.CAP_PROP_FPS, fps)
+        self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        self.frame_size = (int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)) or 640,
+                           int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT)) or 480)
+        self.fps = self.cap.get(cv2.CAP_PROP_FPS) or 30.0
+
+        self.latest = None
+        self.returned = None
+        self.condition = threading.Condition()
+        self.min_interval = 0.0
+        self.rate_changed = threading.Event()
+        self.running = threaded and self.cap.isOpened()
+        self.thread = None
+        if self.running:
+            self.thread = threading.Thread(target=self.grab_loop, daemon=True)
+            self.thread.start()
+
+    def isOpened(self):
+        return self.cap.isOpened()
+
+    def set_rate(self, fps=None):
+        self.min_interval = 1.0 / fps if fps else 0.0
+        self.rate_changed.set()
+
+    def capture_time(self):
+        # V4L2 reports the buffer timestamp on the monotonic clock; other backends give stream time
+        driver = self.cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
+        now = time.monotonic()
+        return driver if 0 < now - driver < 1.0 else now
+
+    def grab_loop(self):
+        while self.running:
+            ret, frame = self.cap.read()
+            if not ret:
+                time.sleep(0.01)
+                continue
+            captured = self.capture_time()
+            with self.condition:
+                if self.latest is not None and self.latest is not self.returned:
+                    self.skipped += 1
+                self.latest = (frame, captured)
+                self.condition.notify_all()
+            if self.min_interval:
+                # Throttled: leave the device alone until the next frame is due or the rate changes
+                self.rate_changed.wait(self.min_interval)
+                self.rate_changed.clear()
+
+    def read(self):
+        if not self.running:
+            ret, frame = self.cap.read()
+            if ret:
+                self.timestamp = self.capture_time()
+            return ret, frame
+        with self.condition:
+            # Wait for a frame newer than the one handed out last time
+            if not self.condition.wait_for(lambda: self.latest is not self.returned or not self.running,
+                                           timeout=1.0) or self.latest is None:
+                return False, None
+            self.returned = self.latest
+        frame, self.timestamp = self.returned
+        return True, frame
+
+    def release(self):
+        self.running = False
+        if self.thread:
+            self.thread.join(timeout=1.0)
+        self.cap.release()
+
+
+class VideoFileSource(CaptureSource):
+    """Recorded video; with realtime=True it is paced at its frame rate and skips frames when the reader falls behind"""
+
+    def __init__(self, path, realtime=True, loop=False):
+        super().__init__()
+        self.path = path
+        self.realtime = realtime
+        self.loop = loop
+        self.cap = cv2.VideoCapture(path)
+        self.fps = self.cap.get(cv2.CAP_PROP_FPS) or 30.0
+        self.frame_size = (int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)) or 640,
+                           int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT)) or 480)
+        self.next_time = None
+
+    def isOpened(self):
+        return self.cap.isOpened()
+
+    def read(self):
+        if self.realtime:
+            interval = 1.0 / self.fps
+            now = time.monotonic()
+            if self.next_time is None:
+                self.next_time = now
+            # Behind schedule: skip frames like a live camera would
+            while now - self.next_time > interval and self.cap.grab():
+                self.skipped += 1
+                self.next_time += interval
+            if self.next_time > now:
+                time.sleep(self.next_time - now)
+            self.next_time += interval
+
+        ret, frame = self.cap.read()
+        if not ret and self.loop:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, frame = self.cap.read()
+        self.timestamp = time.monotonic()
+        return ret, frame
+
+    def release(self):
+        self.cap.release()
+
+
+class ImageSequenceSource(CaptureSource):
+    """Still images from a folder or glob pattern, read in name order at a fixed rate"""
+
+    extensions = (".jpg", ".jpeg", ".png", ".bmp")
+
+    def __init__(self, pattern, fps=30.0, realtime=True, loop=False):
+        super().__init__()
+        if os.path.isdir(pattern):
+            self.paths = sorted(os.path.join(pattern, name) for name in os.listdir(pattern)
+                                if name.lower().endswith(self.extensions))
+        else:
+            self.paths = sorted(glob.glob(pattern))
+        self.fps = fps
+        self.realtime = realtime
+        self.loop = loop
+        self.position = 0
+        self.next_time = None
+        if self.paths:
+            first = cv2.imread(self.paths[0])
+            if first is not None:
+                self.frame_size = (first.shape[1], first.shape[0])
+
+    def isOpened(self):
+        return bool(self.paths)
+
+    def read(self):
+        if self.position >= len(self.paths):
+            if not self.loop or not self.paths:
+                return False, None
+            self.position = 0
+        if self.realtime:
+            now = time.monotonic()
+            if self.next_time is None:
+                self.next_time = now
+            if self.next_time > now:
+                time.sleep(self.next_time - now)
+            self.next_time += 1.0 / self.fps
+        frame = cv2.imread(self.paths[self.position])
+        self.position += 1
+        self.timestamp = time.monotonic()
+        return frame is not None, frame
+
+
+def open_capture_source(source, realtime=True, **options):
+    """Camera index, stream URL, video file, image folder or glob pattern to a CaptureSource"""
+    if isinstance(source, int) or (isinstance(source, str) and source.isdigit()):
+        return CameraSource(int(source), **options)
+    if "://" in source:
+        # Network streams arrive at their own pace, and URLs may contain ? or [
+        return VideoFileSource(source, realtime=False)
+    if os.path.isdir(source) or any(ch in source for ch in "*?["):
+        return ImageSequenceSource(source, realtime=realtime)
+    return VideoFileSource(source, realtime=realtime)
+
+
+# -------------------------
+# Hand detection
+# -------------------------
+def find_hand(detector, frame, widths=None):
+    """Hand bbox (x, y, w, h) in full-resolution coordinates, or None.
+
+    widths is the detection pyramid: the frame is downscaled to each width
+    in turn, stopping at the first level that finds a hand, and the box is
+    scaled back up. None searches the full-resolution frame only.
+    """
+    for width in widths or [None]:
+        if width is None or width >= frame.shape[1]:
+            image, scale = frame, 1.0
+        else:
+            scale = width / frame.shape[1]
+            image = cv2.resize(frame, (width, max(1, int(round(frame.shape[0] * scale)))),
+                               interpolation=cv2.INTER_AREA)
+        hands, _ = detector.findHands(image, draw=False, flipType=True)
+        if hands:
+            x, y, wbox, hbox = hands[0]['bbox']
+            return (int(x / scale), int(y / scale), int(round(wbox / scale)), int(round(hbox / scale)))
+    return None
+
+
+def detect_hand(detector, hd2, frame, offset, widths=None):
+    """Two-stage hand detection: find the hand in the frame, then landmarks on the padded crop.
+
+    The first stage may run on downscaled copies (see find_hand); the crop
+    and the landmark pass always use the full-resolution frame. Returns None,
+    or a dict with the hand bbox (x, y, w, h), the crop origin (x1, y1) and
+    pts, an int32 (21, 3) array of crop-relative landmarks.
+    """
+    bbox = find_hand(detector, frame, widths)
+    if bbox is None:
+        return None
+    x, y, wbox, hbox = bbox
+
+    # process crop and landmarks via hd2
+    y1 = max(0, y - offset)
+    y2 = min(frame.shape[0], y + hbox + offset)
+    x1 = max(0, x - offset)
+    x2 = min(frame.shape[1], x + wbox + offset)
+    if y2 <= y1 or x2 <= x1:
+        return None
+    image = frame[y1:y2, x1:x2]
+    if image.size == 0:
+        return None
+    handz, _ = hd2.findHands(image, draw=False, flipType=True)
+    if not handz or len(handz[0]['lmList']) < 21:
+        return None
+    return {'bbox': (x, y, wbox, hbox), 'origin': (x1, y1),
+            'pts': np.array(handz[0]['lmList'][:21], dtype=np.int32)}
+
+
+def detection_worker(shm_name, slots, frame_shape, offset, widths, tasks, results):
+    """Worker process: run detect_hand on frames in the shared ring and send back landmarks"""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        # The parent owns the segment; keep this process's tracker from unlinking it on exit
+        from multiprocessing import resource_tracker
+        resource_tracker.unregister(shm._name, "shared_memory")
+    except Exception:
+        pass
+    ring = np.ndarray((slots,) + tuple(frame_shape), dtype=np.uint8, buffer=shm.buf)
+    detector = HandDetector(maxHands=1)
+    hd2 = HandDetector(maxHands=1)
+    try:
+        while True:
+            task = tasks.get()
+            if task is None:
+                break
+            seq, slot, h, w = task
+            try:
+                detection = detect_hand(detector, hd2, ring[slot, :h, :w], offset, widths)
+            except Exception as e:
+                print("Detection error:", e)
+                detection = None
+            results.put((seq, slot, detection))
+    finally:
+        del ring
+        shm.close()
+
+
+class DetectionPool:
+    """Hand detection in worker processes fed through a shared-memory frame ring.
+
+    submit() copies a frame into a free slot of a SharedMemory ring and
+    queues only (sequence, slot, size); workers read the slot in place and
+    return the compact detect_hand() result, so frames are never pickled.
+    poll() frees the slots of finished frames and returns results strictly
+    in submission order through a reorder buffer. When every slot is busy
+    submit() drops the frame and returns None. Use from a single thread.
+    """
+
+    def __init__(self, workers=None, frame_shape=(480, 640, 3), slots=None, offset=29, widths=None):
+        self.workers = workers or max(1, (os.cpu_count() or 2) - 1)
+        self.slots = slots or self.workers * 3
+        self.frame_shape = tuple(frame_shape)
+        frame_bytes = int(np.prod(self.frame_shape))
+        self.shm = shared_memory.SharedMemory(create=True, size=frame_bytes * self.slots)
+        self.ring = np.ndarray((self.slots,) + self.frame_shape, dtype=np.uint8, buffer=self.shm.buf)
+        self.free_slots = deque(range(self.slots))
+        self.contexts = {}  # seq -> caller context, until the result is delivered
+        self.reorder = {}  # seq -> (context, detection) waiting for earlier frames
+        self.next_seq = 0
+        self.next_out = 0
+        self.dropped = 0
+
+        # spawn: workers must not inherit Qt or camera handles from the parent
+        ctx = multiprocessing.get_context("spawn")
+        self.tasks = ctx.Queue()
+        self.results = ctx.Queue()
+        self.processes = [ctx.Process(target=detection_worker, daemon=True,
+                                      args=(self.shm.name, self.slots, self.frame_shape, offset, widths,
+                                            self.tasks, self.results))
+                          for _ in range(self.workers)]
+        for process in self.processes:
+            process.start()
+
+    def submit(self, frame, context=None):
+        """Queue a BGR frame for detection; returns its sequence number, or None if dropped"""
+        h, w = frame.shape[:2]
+        if h > self.frame_shape[0] or w > self.frame_shape[1]:
+            raise ValueError(f"Frame {w}x{h} does not fit the {self.frame_shape[1]}x{self.frame_shape[0]} ring")
+        if not self.free_slots:
+            self.dropped += 1
+            return None
+        slot = self.free_slots.popleft()
+        self.ring[slot, :h, :w] = frame
+        seq = self.next_seq
+        self.next_seq += 1
+        self.contexts[seq] = context
+        self.tasks.put((seq, slot, h, w))
+        return seq
+
+    def poll(self, timeout=0.0):
+        """Return [(seq, context, detection)] for every result now deliverable in order.
+
+        With a timeout, waits up to that long for the first result to arrive.
+        """
+        block = timeout > 0
+        while True:
+            try:
+                seq, slot, detection = self.results.get(block, timeout) if block else self.results.get_nowait()
+            except queue.Empty:
+                break
+            block = False
+            self.free_slots.append(slot)
+            self.reorder[seq] = (self.contexts.pop(seq), detection)
+
+        ready = []
+        while self.next_out in self.reorder:
+            context, detection = self.reorder.pop(self.next_out)
+            ready.append((self.next_out, context, detection))
+            self.next_out += 1
+        return ready
+
+    @property
+    def pending(self):
+        return self.next_seq - self.next_out
+
+    def close(self):
+        for _ in self.processes:
+            self.tasks.put(None)
+        for process in self.processes:
+            process.join(timeout=2.0)
+            if process.is_alive():
+                process.terminate()
+        del self.ring
+        self.shm.close()
+        self.shm.unlink()
+
+
+class SharedDetectionPool:
+    """Thread-safe front for a DetectionPool shared by several capture threads.
+
+    A dispatcher thread owns the pool: detect() queues the frame with a
+    one-shot reply queue and blocks until its detection comes back. Requests
+    wait in a backlog while every ring slot is busy, so callers slow down to
+    the speed of the worker processes instead of losing frames here.
+    """
+
+    def __init__(self, workers=None, frame_shape=(480, 640, 3), offset=29):
+        self.pool = DetectionPool(workers, frame_shape=frame_shape, offset=offset)
+        self.requests = queue.Queue()
+        self.dispatcher = threading.Thread(target=self.dispatch_loop, daemon=True)
+        self.dispatcher.start()
+
+    def detect(self, frame):
+        """Run detect_hand on a worker process; blocks until the result is back"""
+        reply = queue.Queue(1)
+        self.requests.put((frame, reply))
+        return reply.get()
+
+    def dispatch_loop(self):
+        backlog = deque()
+        running = True
+        while running or self.pool.pending:
+            busy = backlog or self.pool.pending
+            try:
+                request = self.requests.get_nowait() if busy else self.requests.get(timeout=0.05)
+                while request is not None:
+                    backlog.append(request)
+                    request = self.requests.get_nowait()
+                running = False
+            except queue.Empty:
+                pass
+            while backlog and self.pool.free_slots:
+                frame, reply = backlog.popleft()
+                try:
+                    self.pool.submit(frame, context=reply)
+                except ValueError as e:
+                    print("Detection error:", e)
+                    reply.put(None)
+            for _, reply, detection in self.pool.poll(timeout=0.002 if self.pool.pending else 0.0):
+                reply.put(detection)
+        for _, reply in backlog:
+            reply.put(None)
+
+    def close(self):
+        self.requests.put(None)
+        self.dispatcher.join(timeout=5.0)
+        self.pool.close()
+
+
+def process_video_file(path, workers=0, flip=False, widths=None):
+    """Run hand detection over a recorded video and write <name>_landmarks.jsonl.
+
+    workers=0 detects in this process; otherwise a DetectionPool is used.
+    Prints the throughput so both modes can be compared.
+    """
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        print("Cannot open video:", path)
+        return
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+    height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    out_path = os.path.splitext(path)[0] + "_landmarks.jsonl"
+
+    pool = DetectionPool(workers, frame_shape=(height, width, 3), widths=widths) if workers else None
+    detector = None if pool else HandDetector(maxHands=1)
+    hd2 = None if pool else HandDetector(maxHands=1)
+    frames = 0
+    start = time.perf_counter()
+
+    def write(out, index, detection):
+        landmarks = None
+        if detection is not None:
+            x1, y1 = detection['origin']
+            landmarks = [[int(p[0]) + x1, int(p[1]) + y1, int(p[2])] for p in detection['pts']]
+        out.write(json.dumps({"t": round(index / fps, 4), "frame": index, "landmarks": landmarks}) + "\n")
+
+    try:
+        with open(out_path, "w", encoding="utf-8") as out:
+            while True:
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                if flip:
+                    frame = cv2.flip(frame, 1)
+                if pool:
+                    # Every frame is needed offline: wait for a free slot instead of dropping
+                    while pool.submit(frame, context=frames) is None:
+                        for _, index, detection in pool.poll(timeout=0.05):
+                            write(out, index, detection)
+                    for _, index, detection in pool.poll():
+                        write(out, index, detection)
+                else:
+                    write(out, frames, detect_hand(detector, hd2, frame, 29, widths))
+                frames += 1
+            while pool and pool.pending:
+                for _, index, detection in pool.poll(timeout=0.05):
+                    write(out, index, detection)
+    finally:
+        cap.release()
+        if pool:
+            pool.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"{frames} frames in {elapsed:.1f}s ({frames / max(elapsed, 1e-6):.1f} fps) "
+          f"with {workers or 'no'} worker processes -> {out_path}")
+
+
+def benchmark_detection(path, levels=((160,), (240,), (320,), (480,), (320, None)), max_frames=600):
+    """Sweep detection pyramids over a recorded video against full-resolution detection.
+
+    Each setting is timed on the same frames and compared with the
+    full-resolution pass: how many of its hands are still found and how
+    often the predicted letter is the same. Lesson recordings are cropped
+    to their camera area.
+    """
+    model = get_model()
+    if model is None:
+        return
+
+    def run(widths):
+        cap = cv2.VideoCapture(path)
+        detector = HandDetector(maxHands=1)
+        hd2 = HandDetector(maxHands=1)
+        symbols, times = [], []
+        try:
+            while len(symbols) < max_frames:
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                if (frame.shape[1], frame.shape[0]) == SignLanguageApp.LESSON_FRAME_SIZE:
+                    frame = frame[0:480, 0:640]
+                started = time.perf_counter()
+                detection = detect_hand(detector, hd2, frame, 29, widths)
+                times.append(time.perf_counter() - started)
+                if detection is None:
+                    symbols.append(None)
+                    continue
+                x, y, wbox, hbox = detection['bbox']
+                pts = detection['pts'].tolist()
+                prob = model.predict(render_skeleton(pts, wbox, hbox).reshape(1, 400, 400, 3), verbose=0)[0]
+                symbols.append(str(classify(prob, pts)))
+        finally:
+            cap.release()
+        return symbols, times
+
+    reference, reference_times = run(None)
+    hands = sum(symbol is not None for symbol in reference)
+    if not reference:
+        print("No frames in", path)
+        return
+    print(f"{len(reference)} frames, {hands} with a hand at full resolution, "
+          f"{sum(reference_times) / len(reference_times) * 1000:.1f} ms per detection")
+
+    for widths in levels:
+        symbols, times = run(widths)
+        found = sum(a is not None and b is not None for a, b in zip(reference, symbols))
+        same = sum(a is not None and a == b for a, b in zip(reference, symbols))
+        label = "/".join("full" if width is None else str(width) for width in widths)
+        print(f"{label:>10}: {sum(times) / len(times) * 1000:6.1f} ms mean, {percentile(times, 95) * 1000:6.1f} ms p95, "
+              f"{100.0 * found / max(hands, 1):5.1f}% hands found, {100.0 * same / max(hands, 1):5.1f}% same letter")
+
+
+# -------------------------
+# Recognition
+# -------------------------
+def classify(prob, pts):
+    """Turn the model's class probabilities and the 21 hand landmarks into a symbol.
+
+    The CNN separates eight groups of similar handshapes; the landmark
+    rules below pick the letter within each group. Returns a letter,
+    " ", "next" or "Backspace".
+    """
+    prob = np.array(prob, dtype='float32')
+    ch1 = np.argmax(prob, axis=0)
+    prob[ch1] = 0
+    ch2 = np.argmax(prob, axis=0)
+    prob[ch2] = 0
+    ch3 = np.argmax(prob, axis=0)
+    prob[ch3] = 0
+
+    pl = [ch1, ch2]
+
+    # All the condition checks from the original code
+    # Condition for [Aemnst]
+    l = [[5, 2], [5, 3], [3, 5], [3, 6], [3, 0], [3, 2], [6, 4], [6, 1], [6, 2], [6, 6], [6, 7], [6, 0], [6, 5],
+         [4, 1], [1, 0], [1, 1], [6, 3], [1, 6], [5, 6], [5, 1], [4, 5], [1, 4], [1, 5], [2, 0], [2, 6], [4, 6],
+         [1, 0], [5, 7], [1, 6], [6, 1], [7, 6], [2, 5], [7, 1], [5, 4], [7, 0], [7, 5], [7, 2]]
+    if pl in l:
+        if (pts[6][1] < pts[8][1] and pts[10][1] < pts[12][1] and pts[14][1] < pts[16][1] and pts[18][1] < pts[20][
+            1]):
+            ch1 = 0
+
+    # Condition for [o][s]
+    l = [[2, 2], [2, 1]]
+    if pl in l:
+        if (pts[5][0] < pts[4][0]):
+            ch1 = 0
+
+    # Condition for [c0][aemnst]
+    l = [[0, 0], [0, 6], [0, 2], [0, 5], [0, 1], [0, 7], [5, 2], [7, 6], [7, 1]]
+    pl = [ch1, ch2]
+    if pl in l:
+        if (pts[0][0] > pts[8][0] and pts[0][0] > pts[4][0] and pts[0][0] > pts[12][0] and pts[0][0] > pts[16][
+            0] and pts[0][0] > pts[20][0]) and pts[5][0] > pts[4][0]:
+            ch1 = 2
+
+    # Condition for [c0][aemnst]
+    l = [[6, 0], [6, 6], [6, 2]]
+    pl = [ch1, ch2]
+    if pl in l:
+        if distance(pts[8], pts[16]) < 52:
+            ch1 = 2
+
+    # Condition for [gh][bdfikruvw]
+    l = [[1, 4], [1, 5], [1, 6], [1, 3], [1, 0]]
+    pl = [ch1, ch2]
+
+    if pl in l:
+        if pts[6][1] > pts[8][1] and pts[14][1] < pts[16][1] and pts[18][1] < pts[20][1] and pts[0][0] < pts[8][
+            0] and pts[0][0] < pts[12][0] and pts[0][0] < pts[16][0] and pts[0][0] < pts[20][0]:
+            ch1 = 3
+
+    # Con for [gh][l]
+    l = [[4, 6], [4, 1], [4, 5], [4, 3], [4, 7]]
+    pl = [ch1, ch2]
+    if pl in l:
+        if pts[4][0] > pts[0][0]:
+            ch1 = 3
+
+    # Con for [gh][pqz]
+    l = [[5, 3], [5, 0], [5, 7], [5, 4], [5, 2], [5, 1], [5, 5]]
+    pl = [ch1, ch2]
+    if pl in l:
+        if pts[2][1] + 15 < pts[16][1]:
+            ch1 = 3
+
+    # Con for [l][x]
+    l = [[6, 4], [6, 1], [6, 2]]
+    pl = [ch1, ch2]
+    if pl in l:
+        if distance(pts[4], pts[11]) > 55:
+            ch1 = 4
+
+    # Con for [l][d]
+    l = [[1, 4], [1, 6], [1, 1]]
+    pl = [ch1, ch2]
+    if pl in l:
+        if (distance(pts[4], pts[11]) > 50) and (
+                pts[6][1] > pts[8][1] and pts[10][1] < pts[12][1] and pts[14][1] < pts[16][1] and pts[18][1] <
+                pts[20][1]):
+            ch1 = 4
+
+    # Con for [l][gh]
+    l = [[3, 6], [3, 4]]
+    pl = [ch1, ch2]
+    if pl in l:
+        if (pts[4][0] < pts[0][0]):
+            ch1 = 4
+
+    # Con for [l][c0]
+    l = [[2, 2], [2, 5], [2, 4]]
+    pl = [ch1, ch2]
+    if pl in l:
+        if (pts[1][0] < pts[12][0]):
+            ch1 = 4
+
+    # Con for [gh][z]
+    l = [[3, 6], [3, 5], [3, 4]]
+    pl = [ch1, ch2]
+    if pl in l:
+        if (pts[6][1] > pts[8][1] and pts[10][1] < pts[12][1] and pts[14][1] < pts[16][1] and pts[18][1] < pts[20][
+            1]) and pts[4][1] > pts[10][1]:
+            ch1 = 5
+
+    # Con for [gh][pq]
+    l = [[3, 2], [3, 1], [3, 6]]
+    pl = [ch1, ch2]
+    if pl in l:
+        if pts[4][1] + 17 > pts[8][1] and pts[4][1] + 17 > pts[12][1] and pts[4][1] + 17 > pts[16][1] and pts[4][
+            1] + 17 > pts[20][1]:
+            ch1 = 5
+
+    # Con for [l][pqz]
+    l = [[4, 4], [4, 5], [4, 2], [7, 5], [7, 6], [7, 0]]
+    pl = [ch1, ch2]
+    if pl in l:
+        if pts[4][0] > pts[0][0]:
+            ch1 = 5
+
+    # Con for [pqz][aemnst]
+    l = [[0, 2], [0, 6], [0, 1], [0, 5], [0, 0], [0, 7], [0, 4], [0, 3], [2, 7]]
+    pl = [ch1, ch2]
+    if pl in l:
+        if pts[0][0] < pts[8][0] and pts[0][0] < pts[12][0] and pts[0][0] < pts[16][0] and pts[0][0] < pts[20][0]:
+            ch1 = 5
+
+    # Con for [pqz][yj]
+    l = [[5, 7], [5, 2], [5, 6]]
+    pl = [ch1, ch2]
+    if pl in l:
+        if pts[3][0] < pts[0][0]:
+            ch1 = 7
+
+    # Con for [l][yj]
+    l = [[4, 6], [4, 2], [4, 4], [4, 1], [4, 5], [4, 7]]
+    pl = [ch1, ch2]
+    if pl in l:
+        if pts[6][1] < pts[8][1]:
+            ch1 = 7
+
+    # Con for [x][yj]
+    l = [[6, 7], [0, 7], [0, 1], [0, 0], [6, 4], [6, 6], [6, 5], [6, 1]]
+    pl = [ch1, ch2]
+    if pl in l:
+        if pts[18][1] > pts[20][1]:
+            ch1 = 7
+
+    # Condition for [x][aemnst]
+    l = [[0, 4], [0, 2], [0, 3], [0, 1], [0, 6]]
+    pl = [ch1, ch2]
+    if pl in l:
+        if pts[5][0] > pts[16][0]:
+            ch1 = 6
+
+    # Condition for [yj][x]
+    l = [[7, 2]]
+    pl = [ch1, ch2]
+    if pl in l:
+        if pts[18][1] < pts[20][1] and pts[8][1] < pts[10][1]:
+            ch1 = 6
+
+    # Condition for [c0][x]
+    l = [[2, 1], [2, 2], [2, 6], [2, 7], [2, 0]]
+    pl = [ch1, ch2]
+    if pl in l:
+        if distance(pts[8], pts[16]) > 50:
+            ch1 = 6
+
+    # Con for [l][x]
+    l = [[4, 6], [4, 2], [4, 1], [4, 4]]
+    pl = [ch1, ch2]
+    if pl in l:
+        if distance(pts[4], pts[11]) < 60:
+            ch1 = 6
+
+    # Con for [x][d]
+    l = [[1, 4], [1, 6], [1, 0], [1, 2]]
+    pl = [ch1, ch2]
+    if pl in l:
+        if pts[5][0] - pts[4][0] - 15 > 0:
+            ch1 = 6
+
+    # Con for [b][pqz]
+    l = [[5, 0], [5, 1], [5, 4], [5, 5], [5, 6], [6, 1], [7, 6], [0, 2], [7, 1], [7, 4], [6, 6], [7, 2], [5, 0],
+         [6, 3], [6, 4], [7, 5], [7, 2]]
+    pl = [ch1, ch2]
+    if pl in l:
+        if (pts[6][1] > pts[8][1] and pts[10][1] > pts[12][1] and pts[14][1] > pts[16][1] and pts[18][1] > pts[20][
+            1]):
+            ch1 = 1
+
+    # Con for [f][pqz]
+    l = [[6, 1], [6, 0], [0, 3], [6, 4], [2, 2], [0, 6], [6, 2], [7, 6], [4, 6], [4, 1], [4, 2], [0, 2], [7, 1],
+         [7, 4], [6, 6], [7, 2], [7, 5], [7, 2]]
+    pl = [ch1, ch2]
+    if pl in l:
+        if (pts[6][1] < pts[8][1] and pts[10][1] > pts[12][1] and pts[14][1] > pts[16][1] and pts[18][1] > pts[20][
+            1]):
+            ch1 = 1
+
+    l = [[6, 1], [6, 0], [4, 2], [4, 1], [4, 6], [4, 4]]
+    pl = [ch1, ch2]
+    if pl in l:
+        if (pts[10][1] > pts[12][1] and pts[14][1] > pts[16][1] and pts[18][1] > pts[20][1]):
+            ch1 = 1
+
+    # Con for [d][pqz]
+    l = [[5, 0], [3, 4], [3, 0], [3, 1], [3, 5], [5, 5], [5, 4], [5, 1], [7, 6]]
+    pl = [ch1, ch2]
+    if pl in l:
+        if ((pts[6][1] > pts[8][1] and pts[10][1] < pts[12][1] and pts[14][1] < pts[16][1] and pts[18][1] < pts[20][
+            1]) and (pts[2][0] < pts[0][0]) and pts[4][1] > pts[14][1]):
+            ch1 = 1
+
+    l = [[4, 1], [4, 2], [4, 4]]
+    pl = [ch1, ch2]
+    if pl in l:
+        if (distance(pts[4], pts[11]) < 50) and (
+                pts[6][1] > pts[8][1] and pts[10][1] < pts[12][1] and pts[14][1] < pts[16][1] and pts[18][1] <
+                pts[20][1]):
+            ch1 = 1
+
+    l = [[3, 4], [3, 0], [3, 1], [3, 5], [3, 6]]
+    pl = [ch1, ch2]
+    if pl in l:
+        if ((pts[6][1] > pts[8][1] and pts[10][1] < pts[12][1] and pts[14][1] < pts[16][1] and pts[18][1] < pts[20][
+            1]) and (pts[2][0] < pts[0][0]) and pts[14][1] < pts[4][1]):
+            ch1 = 1
+
+    l = [[6, 6], [6, 4], [6, 1], [6, 2]]
+    pl = [ch1, ch2]
+    if pl in l:
+        if pts[5][0] - pts[4][0] - 15 < 0:
+            ch1 = 1
+
+    # Con for [i][pqz]
+    l = [[5, 4], [5, 5], [5, 1], [0, 3], [0, 7], [5, 0], [0, 2], [6, 2], [7, 5], [7, 1], [7, 6], [7, 7]]
+    pl = [ch1, ch2]
+    if pl in l:
+        if ((pts[6][1] < pts[8][1] and pts[10][1] < pts[12][1] and pts[14][1] < pts[16][1] and pts[18][1] > pts[20][
+            1])):
+            ch1 = 1
+
+    # Con for [yj][bfdi]
+    l = [[1, 5], [1, 7], [1, 1], [1, 6], [1, 3], [1, 0]]
+    pl = [ch1, ch2]
+    if pl in l:
+        if (pts[4][0] < pts[5][0] + 15) and ((
+                pts[6][1] < pts[8][1] and pts[10][1] < pts[12][1] and pts[14][1] < pts[16][1] and pts[18][1] >
+                pts[20][1])):
+            ch1 = 7
+
+    # Con for [uvr]
+    l = [[5, 5], [5, 0], [5, 4], [5, 1], [4, 6], [4, 1], [7, 6], [3, 0], [3, 5]]
+    pl = [ch1, ch2]
+    if pl in l:
+        if ((pts[6][1] > pts[8][1] and pts[10][1] > pts[12][1] and pts[14][1] < pts[16][1] and pts[18][1] < pts[20][
+            1])) and pts[4][1] > pts[14][1]:
+            ch1 = 1
+
+    # Con for [w]
+    fg = 13
+    l = [[3, 5], [3, 0], [3, 6], [5, 1], [4, 1], [2, 0], [5, 0], [5, 5]]
+    pl = [ch1, ch2]
+    if pl in l:
+        if not (pts[0][0] + fg < pts[8][0] and pts[0][0] + fg < pts[12][0] and pts[0][0] + fg < pts[16][0] and
+                pts[0][0] + fg < pts[20][0]) and not (
+                pts[0][0] > pts[8][0] and pts[0][0] > pts[12][0] and pts[0][0] > pts[16][0] and pts[0][0] > pts[20][
+            0]) and distance(pts[4], pts[11]) < 50:
+            ch1 = 1
+
+    # Con for [w]
+    l = [[5, 0], [5, 5], [0, 1]]
+    pl = [ch1, ch2]
+    if pl in l:
+        if pts[6][1] > pts[8][1] and pts[10][1] > pts[12][1] and pts[14][1] > pts[16][1]:
+            ch1 = 1
+
+    # -------------------------condn for 8 groups  ends
+
+    # -------------------------condn for subgroups  starts
+    if ch1 == 0:
+        ch1 = 'S'
+        if pts[4][0] < pts[6][0] and pts[4][0] < pts[10][0] and pts[4][0] < pts[14][0] and pts[4][0] < pts[18][0]:
+            ch1 = 'A'
+        if pts[4][0] > pts[6][0] and pts[4][0] < pts[10][0] and pts[4][0] < pts[14][0] and pts[4][0] < pts[18][
+            0] and pts[4][1] < pts[14][1] and pts[4][1] < pts[18][1]:
+            ch1 = 'T'
+        if pts[4][1] > pts[8][1] and pts[4][1] > pts[12][1] and pts[4][1] > pts[16][1] and pts[4][1] > pts[20][1]:
+            ch1 = 'E'
+        if pts[4][0] > pts[6][0] and pts[4][0] > pts[10][0] and pts[4][0] > pts[14][0] and pts[4][1] < pts[18][1]:
+            ch1 = 'M'
+        if pts[4][0] > pts[6][0] and pts[4][0] > pts[10][0] and pts[4][1] < pts[18][1] and pts[4][1] < pts[14][1]:
+            ch1 = 'N'
+
+    if ch1 == 2:
+        if distance(pts[12], pts[4]) > 42:
+            ch1 = 'C'
+        else:
+            ch1 = 'O'
+
+    if ch1 == 3:
+        if distance(pts[8], pts[12]) > 72:
+            ch1 = 'G'
+        else:
+            ch1 = 'H'
+
+    if ch1 == 7:
+        if distance(pts[8], pts[4]) > 42:
+            ch1 = 'Y'
+        else:
+            ch1 = 'J'
+
+    if ch1 == 4:
+        ch1 = 'L'
+
+    if ch1 == 6:
+        ch1 = 'X'
+
+    if ch1 == 5:
+        if pts[4][0] > pts[12][0] and pts[4][0] > pts[16][0] and pts[4][0] > pts[20][0]:
+            if pts[8][1] < pts[5][1]:
+                ch1 = 'Z'
+            else:
+                ch1 = 'Q'
+        else:
+            ch1 = 'P'
+
+    if ch1 == 1:
+        if (pts[6][1] > pts[8][1] and pts[10][1] > pts[12][1] and pts[14][1] > pts[16][1] and pts[18][1] > pts[20][
+            1]):
+            ch1 = 'B'
+        if (pts[6][1] > pts[8][1] and pts[10][1] < pts[12][1] and pts[14][1] < pts[16][1] and pts[18][1] < pts[20][
+            1]):
+            ch1 = 'D'
+        if (pts[6][1] < pts[8][1] and pts[10][1] > pts[12][1] and pts[14][1] > pts[16][1] and pts[18][1] > pts[20][
+            1]):
+            ch1 = 'F'
+        if (pts[6][1] < pts[8][1] and pts[10][1] < pts[12][1] and pts[14][1] < pts[16][1] and pts[18][1] > pts[20][
+            1]):
+            ch1 = 'I'
+        if (pts[6][1] > pts[8][1] and pts[10][1] > pts[12][1] and pts[14][1] > pts[16][1] and pts[18][1] < pts[20][
+            1]):
+            ch1 = 'W'
+        if (pts[6][1] > pts[8][1] and pts[10][1] > pts[12][1] and pts[14][1] < pts[16][1] and pts[18][1] < pts[20][
+            1]) and pts[4][1] < pts[9][1]:
+            ch1 = 'K'
+        if ((distance(pts[8], pts[12]) - distance(pts[6], pts[10])) < 8) and (
+                pts[6][1] > pts[8][1] and pts[10][1] > pts[12][1] and pts[14][1] < pts[16][1] and pts[18][1] <
+                pts[20][1]):
+            ch1 = 'U'
+        if ((distance(pts[8], pts[12]) - distance(pts[6], pts[10])) >= 8) and (
+                pts[6][1] > pts[8][1] and pts[10][1] > pts[12][1] and pts[14][1] < pts[16][1] and pts[18][1] <
+                pts[20][1]) and (pts[4][1] > pts[9][1]):
+            ch1 = 'V'
+        if (pts[8][0] > pts[12][0]) and (
+                pts[6][1] > pts[8][1] and pts[10][1] > pts[12][1] and pts[14][1] < pts[16][1] and pts[18][1] <
+                pts[20][1]):
+            ch1 = 'R'
+
+    if ch1 == 1 or ch1 == 'E' or ch1 == 'S' or ch1 == 'X' or ch1 == 'Y' or ch1 == 'B':
+        if (pts[6][1] > pts[8][1] and pts[10][1] < pts[12][1] and pts[14][1] < pts[16][1] and pts[18][1] > pts[20][
+            1]):
+            ch1 = " "
+
+    if ch1 == 'E' or ch1 == 'Y' or ch1 == 'B':
+        if (pts[4][0] < pts[5][0]) and (
+                pts[6][1] > pts[8][1] and pts[10][1] > pts[12][1] and pts[14][1] > pts[16][1] and pts[18][1] >
+                pts[20][1]):
+            ch1 = "next"
+
+    if ch1 == 'Next' or 'B' or 'C' or 'H' or 'F' or 'X':
+        if (pts[0][0] > pts[8][0] and pts[0][0] > pts[12][0] and pts[0][0] > pts[16][0] and pts[0][0] > pts[20][
+            0]) and (
+                pts[4][1] < pts[8][1] and pts[4][1] < pts[12][1] and pts[4][1] < pts[16][1] and pts[4][1] < pts[20][
+            1]) and (
+                pts[4][1] < pts[6][1] and pts[4][1] < pts[10][1] and pts[4][1] < pts[14][1] and pts[4][1] < pts[18][
+            1]):
+            ch1 = 'Backspace'
+
+    return ch1
+
+
+# Shown in the skeleton panel when there is no hand; never drawn on
+BLANK_SKELETON = np.full((400, 400, 3), 255, dtype=np.uint8)
+
+
+def render_skeleton(pts, wbox, hbox):
+    """Draw crop-relative landmarks as a centred skeleton on the 400x400 white canvas the model expects"""
+    # create white 400x400 and draw skeleton & numbers
+    white = 255 * np.ones((400, 400, 3), np.uint8)
+    os_x = ((400 - wbox) // 2) - 15
+    os_y = ((400 - hbox) // 2) - 15
+
+    # Draw finger lines (thumb, index, middle, ring, pinky)
+    try:
+        for t in range(0, 4):
+            cv2.line(white,
+                     (pts[t][0] + os_x, pts[t][1] + os_y),
+                     (pts[t + 1][0] + os_x, pts[t + 1][1] + os_y),
+                     (0, 255, 0), 3)
+        for t in range(5, 8):
+            cv2.line(white,
+                     (pts[t][0] + os_x, pts[t][1] + os_y),
+                     (pts[t + 1][0] + os_x, pts[t + 1][1] + os_y),
+                     (0, 255, 0), 3)
+        for t in range(9, 12):
+            cv2.line(white,
+                     (pts[t][0] + os_x, pts[t][1] + os_y),
+                     (pts[t + 1][0] + os_x, pts[t + 1][1] + os_y),
+                     (0, 255, 0), 3)
+        for t in range(13, 16):
+            cv2.line(white,
+                     (pts[t][0] + os_x, pts[t][1] + os_y),
+                     (pts[t + 1][0] + os_x, pts[t + 1][1] + os_y),
+                     (0, 255, 0), 3)
+        for t in range(17, 20):
+            cv2.line(white,
+                     (pts[t][0] + os_x, pts[t][1] + os_y),
+                     (pts[t + 1][0] + os_x, pts[t + 1][1] + os_y),
+                     (0, 255, 0), 3)
+
+        # Palm connections
+        cv2.line(white, (pts[5][0] + os_x, pts[5][1] + os_y),
+                 (pts[9][0] + os_x, pts[9][1] + os_y), (0, 255, 0), 3)
+        cv2.line(white, (pts[9][0] + os_x, pts[9][1] + os_y),
+                 (pts[13][0] + os_x, pts[13][1] + os_y), (0, 255, 0), 3)
+        cv2.line(white, (pts[13][0] + os_x, pts[13][1] + os_y),
+                 (pts[17][0] + os_x, pts[17][1] + os_y), (0, 255, 0), 3)
+        cv2.line(white, (pts[0][0] + os_x, pts[0][1] + os_y),
+                 (pts[5][0] + os_x, pts[5][1] + os_y), (0, 255, 0), 3)
+        cv2.line(white, (pts[0][0] + os_x, pts[0][1] + os_y),
+                 (pts[17][0] + os_x, pts[17][1] + os_y), (0, 255, 0), 3)
+    except Exception:
+        pass
+
+    # Draw landmark dots
+    for i in range(21):
+        try:
+            cv2.circle(white, (pts[i][0] + os_x, pts[i][1] + os_y), 4, (0, 0, 255), -1)
+        except Exception:
+            pass
+
+    return white
+
+
+class SentenceState:
+    """Sentence built from per-frame symbols under a commit policy.
+
+    "next": the "next" gesture commits the letter held just before it, found
+    through the ten_prev_char lookback. "dwell": a letter is committed once it
+    has been the symbol for min_stable_frames frames with at least
+    min_confidence; the same letter is committed again only after a different
+    symbol has held for min_switch_frames frames, or min_absent_frames frames
+    without a hand, so a single misclassified frame does not re-arm it.
+    """
+
+    POLICIES = ("next", "dwell")
+
+    def __init__(self, policy="next", min_stable_frames=8, min_absent_frames=12, min_confidence=0.6,
+                 min_switch_frames=3):
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown commit policy {policy!r}")
+        self.policy = policy
+        self.text = " "
+        self.current_symbol = "Empty"
+        self.commits = 0
+
+        # "next" lookback
+        self.ten_prev_char = [" "] * 10
+        self.count = -1
+        self.prev_char = ""
+
+        # State machine for adding one char per presentation
+        self.state = "WAIT_HAND"
+        self.current_candidate = None
+        self.stable_count = 0
+        self.min_stable_frames = min_stable_frames
+        self.absent_count = 0
+        self.min_absent_frames = min_absent_frames
+        self.min_confidence = min_confidence
+        # A different symbol must persist this long before it replaces the candidate
+        self.switch_candidate = None
+        self.switch_count = 0
+        self.min_switch_frames = min_switch_frames
+
+    def push(self, ch1, confidence=1.0):
+        """Add the symbol of a frame with a hand; returns the sentence"""
+        self.current_symbol = ch1
+        if self.policy == "dwell":
+            self.push_dwell(ch1, confidence)
+        else:
+            self.push_next(ch1)
+        return self.text
+
+    def absent(self, frames=1):
+        """Note frames without a hand"""
+        self.absent_count += frames
+        if self.absent_count >= self.min_absent_frames:
+            self.state = "WAIT_HAND"
+            self.current_candidate = None
+            self.stable_count = 0
+            self.switch_candidate = None
+            self.switch_count = 0
+
+    def push_dwell(self, ch1, confidence):
+        self.absent_count = 0
+        # Transition poses and unsure frames neither build up nor break a hold
+        if ch1 == "next" or confidence < self.min_confidence:
+            return
+        if ch1 != self.current_candidate:
+            if ch1 != self.switch_candidate:
+                self.switch_candidate = ch1
+                self.switch_count = 0
+            self.switch_count += 1
+            if self.switch_count < self.min_switch_frames:
+                return
+            # The new symbol has held long enough; its frames so far count towards the dwell
+            self.current_candidate = ch1
+            self.stable_count = self.switch_count - 1
+            self.state = "TRACKING"
+        self.switch_candidate = None
+        self.switch_count = 0
+        self.stable_count += 1
+        if self.state == "TRACKING" and self.stable_count >= self.min_stable_frames:
+            self.commit(ch1)
+            self.state = "COMMITTED"
+
+    def commit(self, ch1):
+        if ch1 == "Backspace":
+            self.text = self.text[0:-1]
+        else:
+            self.text = self.text + ch1
+        self.commits += 1
+
+    def push_next(self, ch1):
+        if ch1 == "next" and self.prev_char != "next":
+            if self.ten_prev_char[(self.count - 2) % 10] != "next":
+                if self.ten_prev_char[(self.count - 2) % 10] == "Backspace":
+                    self.text = self.text[0:-1]
+                    self.commits += 1
+                else:
+                    if self.ten_prev_char[(self.count - 2) % 10] != "Backspace":
+                        self.text = self.text + self.ten_prev_char[(self.count - 2) % 10]
+                        self.commits += 1
+            else:
+                if self.ten_prev_char[(self.count - 0) % 10] != "Backspace":
+                    self.text = self.text + self.ten_prev_char[(self.count - 0) % 10]
+                    self.commits += 1
+
+        if ch1 == "  " and self.prev_char != "  ":
+            self.text = self.text + "  "
+
+        self.prev_char = ch1
+        self.count += 1
+        self.ten_prev_char[self.count % 10] = ch1
+
+    def current_word(self):
+        return self.text[self.text.rfind(" ") + 1:]
+
+    def clear(self):
+        self.text = " "
+
+
+def edit_distance(a, b):
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        previous = current
+    return previous[-1]
+
+
+def benchmark_commit_policies(path, expected=None, dwell_frames=(5, 8, 12)):
+    """Replay a _landmarks.jsonl recording through each commit policy.
+
+    Reports committed characters per minute and, against the expected text
+    (by default the last sentence of the matching _transcript.jsonl), the
+    character error rate.
+    """
+    model = get_model()
+    if model is None:
+        return
+    with open(path, encoding="utf-8") as f:
+        rows = [json.loads(line) for line in f if line.strip()]
+    if not rows:
+        print("No frames in", path)
+        return
+    if expected is None:
+        transcript = path.replace("_landmarks.jsonl", "_transcript.jsonl")
+        if transcript != path and os.path.exists(transcript):
+            with open(transcript, encoding="utf-8") as f:
+                texts = [json.loads(line)["text"] for line in f if line.strip()]
+            expected = texts[-1] if texts else None
+
+    # Classify every frame once; None marks frames without a hand
+    frames = []
+    for row in rows:
+        if not row.get("landmarks"):
+            frames.append(None)
+            continue
+        pts, wbox, hbox = skeleton_from_landmarks(row["landmarks"])
+        prob = model.predict(render_skeleton(pts, wbox, hbox).reshape(1, 400, 400, 3), verbose=0)[0]
+        frames.append((classify(prob, pts), float(np.max(prob))))
+    minutes = max(rows[-1].get("t", 0) - rows[0].get("t", 0), 1e-6) / 60.0
+    print(f"{len(frames)} frames, {sum(frame is not None for frame in frames)} with a hand, {minutes * 60:.0f}s")
+    if expected:
+        print(f"Expected: {expected.strip()!r}")
+
+    policies = [("next", {})] + [("dwell", {"min_stable_frames": n}) for n in dwell_frames]
+    for policy, options in policies:
+        sentence = SentenceState(policy, **options)
+        for frame in frames:
+            if frame is None:
+                sentence.absent()
+            else:
+                sentence.push(*frame)
+        text = sentence.text.strip()
+        label = policy + (f" {options['min_stable_frames']}f" if options else "")
+        line = f"{label:>9}: {sentence.commits / minutes:6.1f} chars/min"
+        if expected:
+            line += f", {100.0 * edit_distance(text, expected.strip()) / max(len(expected.strip()), 1):5.1f}% errors"
+        print(line + f"  {text!r}")
+
+
+class OneEuroFilter:
+    """One-Euro low-pass filter applied to all 21x3 landmarks at once.
+
+    Each coordinate gets its own adaptive cutoff, min_cutoff + beta * |speed|
+    in Hz: slow jitter of a held pose is smoothed heavily, fast movement
+    passes through with little lag. Coordinates are pixels and speeds pixels
+    per second. Call reset() when the hand is lost.
+    """
+
+    def __init__(self, min_cutoff=1.0, beta=0.02, d_cutoff=1.0, freq=30.0):
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.freq = freq
+        self.reset()
+
+    def reset(self):
+        self.x_prev = None
+        self.dx_prev = None
+        self.t_prev = None
+
+    @staticmethod
+    def alpha(cutoff, dt):
+        tau = 1.0 / (2.0 * math.pi * cutoff)
+        return 1.0 / (1.0 + tau / dt)
+
+    def __call__(self, x, t=None):
+        x = np.asarray(x, dtype=np.float32)
+        if self.x_prev is None or x.shape != self.x_prev.shape:
+            self.x_prev = x
+            self.dx_prev = np.zeros_like(x)
+            self.t_prev = t
+            return x
+        dt = t - self.t_prev if t is not None and self.t_prev is not None else 1.0 / self.freq
+        dt = max(dt, 1e-3)
+        self.t_prev = t
+
+        dx = (x - self.x_prev) / dt
+        a_d = self.alpha(self.d_cutoff, dt)
+        dx_hat = a_d * dx + (1.0 - a_d) * self.dx_prev
+        a = self.alpha(self.min_cutoff + self.beta * np.abs(dx_hat), dt)
+        x_hat = a * x + (1.0 - a) * self.x_prev
+        self.x_prev = x_hat
+        self.dx_prev = dx_hat
+        return x_hat
+
+
+def benchmark_smoothing(path, settings=((1.0, 0.02), (0.5, 0.02), (1.0, 0.05), (2.0, 0.01)), stable_run=5):
+    """Replay a _landmarks.jsonl recording with and without One-Euro smoothing.
+
+    For each (min_cutoff, beta) setting reports the flicker rate (share of
+    consecutive hand frames whose letter changes), the mean frames until a
+    letter has held for stable_run frames after the hand appears or the
+    letter changes, and the filter's cost per frame.
+    """
+    model = get_model()
+    if model is None:
+        return
+    with open(path, encoding="utf-8") as f:
+        rows = [json.loads(line) for line in f if line.strip()]
+    if not rows:
+        print("No frames in", path)
+        return
+    print(f"{len(rows)} frames, {sum(bool(row.get('landmarks')) for row in rows)} with a hand")
+
+    for setting in (None,) + tuple(settings):
+        smoother = OneEuroFilter(*setting) if setting else None
+        symbols, filter_seconds = [], 0.0
+        for row in rows:
+            if not row.get("landmarks"):
+                symbols.append(None)
+                if smoother:
+                    smoother.reset()
+                continue
+            landmarks = np.asarray(row["landmarks"], dtype=np.float32)
+            if smoother:
+                started = time.perf_counter()
+                landmarks = smoother(landmarks, row.get("t"))
+                filter_seconds += time.perf_counter() - started
+            pts, wbox, hbox = skeleton_from_landmarks(np.rint(landmarks))
+            prob = model.predict(render_skeleton(pts, wbox, hbox).reshape(1, 400, 400, 3), verbose=0)[0]
+            symbols.append(str(classify(prob, pts)))
+
+        changes = pairs = 0
+        waits, waiting_since, run, previous = [], 0, 0, None
+        for i, symbol in enumerate(symbols):
+            if symbol is None:
+                waiting_since, run, previous = i + 1, 0, None
+                continue
+            if previous is not None:
+                pairs += 1
+                if symbol != previous:
+                    changes += 1
+            if symbol == previous:
+                run += 1
+            else:
+                # A stable letter ended: time the next one from here
+                if run >= stable_run:
+                    waiting_since = i
+                run = 1
+            if run == stable_run and waiting_since is not None:
+                waits.append(i - waiting_since + 1)
+                waiting_since = None
+            previous = symbol
+
+        hands = max(sum(symbol is not None for symbol in symbols), 1)
+        label = "raw" if setting is None else f"cutoff {setting[0]:.1f} beta {setting[1]:.2f}"
+        print(f"{label:>22}: {100.0 * changes / max(pairs, 1):5.1f}% flicker, "
+              f"{sum(waits) / max(len(waits), 1):5.1f} frames to a stable letter, "
+              f"{filter_seconds / hands * 1e6:6.1f} us per frame")
+
+
+class PredictionCache:
+    """Reuse the skeleton and symbol of a held pose instead of drawing and predicting again.
+
+    Entries are keyed by a signature of the landmarks: translated to the
+    wrist, scaled by the hand's extent and quantized in steps of tolerance
+    (a fraction of the hand size), so small jitter maps to the same key.
+    Movement of any landmark by more than motion_threshold of the hand size
+    since the previous frame clears the cache. Hit counts and the average
+    cost of a miss give an estimate of the inference time saved.
+    """
+
+    def __init__(self, tolerance=0.04, motion_threshold=0.25, size=16):
+        self.tolerance = tolerance
+        self.motion_threshold = motion_threshold
+        self.size = size
+        self.entries = OrderedDict()
+        self.pending_key = None  # key of the last miss, filled in by store()
+        self.last = None
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.miss_seconds = 0.0
+
+    def normalize(self, pts):
+        points = np.asarray(pts, dtype=np.float32)[:21, :2]
+        points = points - points[0]
+        return points, float(np.ptp(points, axis=0).max()) or 1.0
+
+    def lookup(self, pts):
+        """(skeleton, symbol) cached for this pose, or None"""
+        if not self.tolerance:
+            self.misses += 1
+            return None
+        points, scale = self.normalize(pts)
+        raw = np.asarray(pts, dtype=np.float32)[:21, :2]
+        if self.last is not None and np.abs(raw - self.last).max() / scale > self.motion_threshold:
+            self.entries.clear()
+            self.invalidations += 1
+        self.last = raw
+
+        key = np.round(points / (scale * self.tolerance)).astype(np.int16).tobytes()
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            self.pending_key = key
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def store(self, skeleton, symbol, seconds):
+        """Cache the result for the pose of the last missed lookup"""
+        self.miss_seconds += seconds
+        key, self.pending_key = self.pending_key, None
+        if key is None:
+            return
+        self.entries[key] = (skeleton, symbol)
+        if len(self.entries) > self.size:
+            self.entries.popitem(last=False)
+
+    def saved_seconds(self):
+        return self.hits * self.miss_seconds / max(self.misses, 1)
+
+    def summary(self):
+        total = self.hits + self.misses
+        return (f"Prediction cache: {self.hits}/{total} hits ({100.0 * self.hits / max(total, 1):.0f}%), "
+                f"{self.invalidations} motion resets, ~{self.saved_seconds():.1f}s of inference saved")
+
+
+def cache_report(path, tolerances=(0.02, 0.04, 0.06, 0.08)):
+    """Replay a _landmarks.jsonl recording through PredictionCache at several tolerances.
+
+    Every frame is also predicted in full so the report shows how often a
+    cache hit would have returned a different symbol.
+    """
+    model = get_model()
+    if model is None:
+        return
+    with open(path, encoding="utf-8") as f:
+        frames = [row["landmarks"] for row in map(json.loads, f) if row.get("landmarks")]
+    if not frames:
+        print("No landmarks in", path)
+        return
+
+    # Full prediction for every frame once, timed, as the reference
+    reference = []
+    started = time.perf_counter()
+    for landmarks in frames:
+        pts, wbox, hbox = skeleton_from_landmarks(landmarks)
+        white = render_skeleton(pts, wbox, hbox)
+        prob = model.predict(white.reshape(1, 400, 400, 3), verbose=0)[0]
+        reference.append((pts, str(classify(prob, pts))))
+    per_frame = (time.perf_counter() - started) / len(frames)
+    print(f"{len(frames)} frames with a hand, {per_frame * 1000:.1f} ms per full prediction")
+
+    for tolerance in tolerances:
+        cache = PredictionCache(tolerance)
+        disagreements = 0
+        for pts, symbol in reference:
+            entry = cache.lookup(pts)
+            if entry is None:
+                cache.store(None, symbol, per_frame)
+            elif entry[1] != symbol:
+                disagreements += 1
+        print(f"tolerance {tolerance:.2f}: {100.0 * cache.hits / len(reference):5.1f}% hits, "
+              f"{disagreements} hits with a different symbol, ~{cache.saved_seconds():.1f}s saved")
+
+
+# -------------------------
+# Sequence recognition (dynamic signs)
+# -------------------------
+SEQUENCE_MODEL_PATH = "sequence.h5"
+SEQUENCE_BACKGROUND = "_none"
+# Signs to record training clips for: the moving letters plus a starter word list
+SEQUENCE_VOCABULARY = ["J", "Z", "HELLO", "THANK YOU", "PLEASE", "SORRY", "YES", "NO", "HELP", "NAME"]
+
+
+class LandmarkRing:
+    """Fixed-size history of landmark frames stored twice in one preallocated array.
+
+    Every frame is written at i and i + capacity, so the last capacity frames
+    are always the contiguous slice buffer[index:index + capacity]; window()
+    returns that view without copying or stacking.
+    """
+
+    def __init__(self, capacity, shape=(21, 3)):
+        self.capacity = capacity
+        self.buffer = np.zeros((2 * capacity,) + tuple(shape), dtype=np.float32)
+        self.index = 0
+        self.count = 0
+
+    def push(self, frame):
+        self.buffer[self.index] = frame
+        self.buffer[self.index + self.capacity] = frame
+        self.index = (self.index + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    @property
+    def full(self):
+        return self.count == self.capacity
+
+    def window(self):
+        """The last capacity frames, oldest first (a view into the buffer)"""
+        return self.buffer[self.index:self.index + self.capacity]
+
+    def clear(self):
+        self.count = 0
+
+
+def sequence_features(windows):
+    """(N, W, 21, 3) camera-coordinate landmarks to (N, W, 63) features.
+
+    Coordinates are taken relative to the wrist in the first frame of each
+    window, so the hand's path is kept, and divided by the mean hand size.
+    """
+    windows = np.asarray(windows, dtype=np.float32)
+    origin = windows[:, :1, :1, :]
+    extent = np.ptp(windows[..., :2], axis=2).max(axis=-1)
+    scale = np.maximum(extent.mean(axis=1), 1.0)[:, None, None, None]
+    return ((windows - origin) / scale).reshape(windows.shape[0], windows.shape[1], -1)
+
+
+def build_sequence_model(window, classes):
+    from keras import layers, models
+    model = models.Sequential([
+        layers.Input((window, 63)),
+        layers.Conv1D(64, 5, padding="same", activation="relu"),
+        layers.Conv1D(64, 5, padding="same", activation="relu"),
+        layers.GRU(64),
+        layers.Dense(classes, activation="softmax"),
+    ])
+    model.compile(optimizer="adam", loss="sparse_categorical_crossentropy", metrics=["accuracy"])
+    return model
+
+
+def train_sequence_model(data_dir, model_path=SEQUENCE_MODEL_PATH, window=30, step=3, epochs=40):
+    """Train the sequence model from recorded clips.
+
+    data_dir has one folder per sign (see SEQUENCE_VOCABULARY) holding
+    _landmarks.jsonl recordings, plus optionally a "_none" folder of
+    ordinary signing and idle hands. Windows are cut every step frames.
+    The labels are saved next to the model as <name>_labels.json.
+    """
+    labels = sorted(name for name in os.listdir(data_dir) if os.path.isdir(os.path.join(data_dir, name)))
+    windows, targets = [], []
+    for label_index, label in enumerate(labels):
+        for path in glob.glob(os.path.join(data_dir, label, "*_landmarks.jsonl")):
+            with open(path, encoding="utf-8") as f:
+                frames = [row["landmarks"] for row in map(json.loads, f) if row.get("landmarks")]
+            frames = np.asarray(frames, dtype=np.float32)
+            for start in range(0, len(frames) - window + 1, step):
+                windows.append(frames[start:start + window])
+                targets.append(label_index)
+    if not windows:
+        print("No training windows found in", data_dir)
+        return
+
+    features = sequence_features(np.stack(windows))
+    targets = np.asarray(targets)
+    print(f"Training on {len(targets)} windows of {window} frames, {len(labels)} classes")
+    model = build_sequence_model(window, len(labels))
+    model.fit(features, targets, epochs=epochs, batch_size=64, validation_split=0.2, shuffle=True)
+    model.save(model_path)
+    with open(os.path.splitext(model_path)[0] + "_labels.json", "w", encoding="utf-8") as f:
+        json.dump({"labels": labels, "window": window}, f)
+    print("Saved sequence model:", model_path)
+
+
+class SequenceRecognizer:
+    """Sliding-window recognizer for moving letters and whole-word signs.
+
+    push() is called every frame; landmarks go into a LandmarkRing and the
+    model runs on the last window once every stride frames. A sign is
+    reported once, then the ring starts over. Losing the hand for more than
+    max_gap frames also starts over. Disabled when no trained model exists.
+    """
+
+    def __init__(self, model_path=SEQUENCE_MODEL_PATH, window=30, stride=5, threshold=0.8, max_gap=3):
+        self.model = None
+        self.labels = []
+        self.window = window
+        self.stride = stride
+        self.threshold = threshold
+        self.max_gap = max_gap
+        if os.path.exists(model_path):
+            try:
+                from keras.models import load_model
+                with open(os.path.splitext(model_path)[0] + "_labels.json", encoding="utf-8") as f:
+                    info = json.load(f)
+                self.labels = info["labels"]
+                self.window = info.get("window", window)
+                self.model = load_model(model_path)
+                print("Loaded sequence model:", model_path)
+            except Exception as e:
+                print("Error loading sequence model:", e)
+                self.model = None
+        self.ring = LandmarkRing(self.window)
+        self.frames_since = 0
+        self.gap = 0
+        self.latencies = deque(maxlen=500)
+
+    @property
+    def enabled(self):
+        return self.model is not None
+
+    def push(self, landmarks):
+        """Add one frame's camera-coordinate landmarks, or None without a hand.
+
+        Returns (label, confidence) when a sign is recognised, else None.
+        """
+        if not self.enabled:
+            return None
+        if landmarks is None:
+            self.gap += 1
+            if self.gap > self.max_gap:
+                self.ring.clear()
+                self.frames_since = 0
+            return None
+        self.gap = 0
+        self.ring.push(landmarks)
+        self.frames_since += 1
+        if not self.ring.full or self.frames_since < self.stride:
+            return None
+        self.frames_since = 0
+
+        started = time.perf_counter()
+        features = sequence_features(self.ring.window()[None])
+        # Calling the model directly avoids predict()'s per-call setup for a single window
+        probs = np.asarray(self.model(features, training=False))[0]
+        self.latencies.append(time.perf_counter() - started)
+
+        best = int(np.argmax(probs))
+        label = self.labels[best]
+        if probs[best] < self.threshold or label == SEQUENCE_BACKGROUND:
+            return None
+        self.ring.clear()
+        return label, float(probs[best])
+
+    def summary(self):
+        if not self.latencies:
+            return "Sequence model: no windows evaluated"
+        return (f"Sequence model: {len(self.latencies)} windows, p50 {percentile(self.latencies, 50) * 1000:.1f} ms, "
+                f"p95 {percentile(self.latencies, 95) * 1000:.1f} ms per window")
+
+
+# -------------------------
+# Headless multi-stream server
+# -------------------------
+class RecognitionStream:
+    """One capture source in server mode with its own sentence and counters.
+
+    Hands are detected through a SharedDetectionPool when one is attached,
+    otherwise with this stream's own detectors.
+    """
+
+    def __init__(self, index, source, realtime=True, offset=29, pool=None, policy="next"):
+        self.index = index
+        self.source = source
+        self.offset = offset
+        # Files are paced at their own frame rate so they behave like a camera
+        self.cap = open_capture_source(source, realtime=realtime)
+        if not self.cap.isOpened():
+            raise IOError(f"Cannot open capture source {source!r}")
+        self.pool = pool
+        self.detector = None
+        self.hd2 = None
+        self.sentence = SentenceState(policy)
+
+        # Newest skeleton waiting for the classifier; a newer frame replaces it.
+        # Frames without a hand before it are counted for the sentence's commit policy.
+        self.pending = None
+        self.absent_frames = 0
+        self.lock = threading.Lock()
+        self.finished = False
+
+        self.frames = 0
+        self.hands = 0
+        self.classified = 0
+        self.dropped = 0
+        self.latencies = deque(maxlen=500)
+        self.started = time.perf_counter()
+
+    @property
+    def frame_shape(self):
+        return (self.cap.frame_size[1], self.cap.frame_size[0], 3)
+
+    def detect(self, frame):
+        if self.pool is not None:
+            return self.pool.detect(frame)
+        if self.detector is None:
+            self.detector = HandDetector(maxHands=1)
+            self.hd2 = HandDetector(maxHands=1)
+        return detect_hand(self.detector, self.hd2, frame, self.offset)
+
+    def capture_loop(self, stop_event, wake):
+        try:
+            while not stop_event.is_set():
+                ret, frame = self.cap.read()
+                if not ret:
+                    break
+                captured = self.cap.timestamp
+                self.frames += 1
+                detection = self.detect(frame)
+                if detection is None:
+                    self.absent_frames += 1
+                else:
+                    self.hands += 1
+                    x, y, wbox, hbox = detection['bbox']
+                    pts = detection['pts'].tolist()
+                    item = (render_skeleton(pts, wbox, hbox), pts, captured, self.absent_frames)
+                    self.absent_frames = 0
+                    with self.lock:
+                        if self.pending is not None:
+                            self.dropped += 1
+                        self.pending = item
+                    wake.set()
+        except Exception as e:
+            print(f"Stream {self.index} error:", e)
+        finally:
+            self.cap.release()
+            self.finished = True
+            wake.set()
+
+    def take(self):
+        with self.lock:
+            item, self.pending = self.pending, None
+        return item
+
+    def stats(self):
+        elapsed = max(time.perf_counter() - self.started, 1e-6)
+        return {"stream": self.index, "source": str(self.source),
+                "capture_fps": round(self.frames / elapsed, 1),
+                "classify_fps": round(self.classified / elapsed, 1),
+                "frames": self.frames, "hands": self.hands,
+                "classified": self.classified, "dropped": self.dropped + self.cap.skipped,
+                "latency_ms": round(percentile(self.latencies, 50) * 1000, 1) if self.latencies else None,
+                "text": self.sentence.text.strip()}
+
+
+class RecognitionServer:
+    """Headless recognition for several capture sources sharing one loaded model.
+
+    Each source has a capture thread that runs hand detection (on shared
+    worker processes with detect_workers) and keeps only its newest skeleton
+    for the classifier, so when the CPU is saturated a
+    stream skips frames instead of falling behind. The inference loop takes at
+    most one frame per stream per batch, starting from a rotating stream so
+    none is starved, and classifies the batch with a single model call.
+    Sentence changes are printed as JSON lines.
+    """
+
+    def __init__(self, sources, batch_size=8, report_interval=5.0, realtime=True, detect_workers=0,
+                 policy="next"):
+        self.streams = [RecognitionStream(i, source, realtime, policy=policy) for i, source in enumerate(sources)]
+        # One pool for all streams, with ring slots big enough for the largest source
+        self.detection_pool = None
+        if detect_workers:
+            frame_shape = tuple(max(shape) for shape in zip(*(stream.frame_shape for stream in self.streams)))
+            self.detection_pool = SharedDetectionPool(detect_workers, frame_shape=frame_shape)
+            for stream in self.streams:
+                stream.pool = self.detection_pool
+        self.batch_size = batch_size
+        self.report_interval = report_interval
+        self.stop_event = threading.Event()
+        self.wake = threading.Event()
+        self.turn = 0
+        self.batches = 0
+        self.batched_frames = 0
+        self.started = time.perf_counter()
+
+    def run(self, duration=None):
+        model = get_model()
+        if model is None:
+            if self.detection_pool:
+                self.detection_pool.close()
+            return
+        threads = [threading.Thread(target=stream.capture_loop, args=(self.stop_event, self.wake), daemon=True)
+                   for stream in self.streams]
+        for thread in threads:
+            thread.start()
+
+        self.started = time.perf_counter()
+        next_report = self.started + self.report_interval
+        try:
+            while True:
+                self.wake.wait(0.05)
+                self.wake.clear()
+                batch = self.next_batch()
+                if batch:
+                    self.classify_batch(model, batch)
+                elif all(stream.finished for stream in self.streams):
+                    break
+
+                now = time.perf_counter()
+                if self.report_interval and now >= next_report:
+                    self.report()
+                    next_report = now + self.report_interval
+                if duration and now - self.started >= duration:
+                    break
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop_event.set()
+            for thread in threads:
+                thread.join(timeout=2.0)
+            if self.detection_pool:
+                self.detection_pool.close()
+        self.report()
+
+    def next_batch(self):
+        """At most one pending frame per stream, round-robin from self.turn"""
+        batch = []
+        count = len(self.streams)
+        for k in range(count):
+            stream = self.streams[(self.turn + k) % count]
+            item = stream.take()
+            if item is not None:
+                batch.append((stream,) + item)
+                if len(batch) >= self.batch_size:
+                    break
+        self.turn = (self.turn + 1) % count
+        return batch
+
+    def classify_batch(self, model, batch):
+        probs = model.predict(np.stack([skeleton for _, skeleton, _, _, _ in batch]), verbose=0)
+        for (stream, _, pts, captured, absent_frames), prob in zip(batch, probs):
+            before = stream.sentence.text
+            ch1 = classify(prob, pts)
+            if absent_frames:
+                stream.sentence.absent(absent_frames)
+            stream.sentence.push(ch1, float(np.max(prob)))
+            stream.classified += 1
+            stream.latencies.append(time.monotonic() - captured)
+            if stream.sentence.text != before:
+                print(json.dumps({"stream": stream.index, "source": str(stream.source),
+                                  "text": stream.sentence.text.strip()}), flush=True)
+        self.batches += 1
+        self.batched_frames += len(batch)
+
+    def report(self):
+        elapsed = max(time.perf_counter() - self.started, 1e-6)
+        for stream in self.streams:
+            stats = stream.stats()
+            print(f"[{stats['stream']}] {stats['source']}: {stats['capture_fps']} fps captured, "
+                  f"{stats['classify_fps']} fps classified, {stats['dropped']} dropped, "
+                  f"{stats['latency_ms']} ms median latency", file=sys.stderr)
+        frames = sum(stream.frames for stream in self.streams)
+        classified = sum(stream.classified for stream in self.streams)
+        print(f"Total: {frames / elapsed:.1f} fps captured, {classified / elapsed:.1f} fps classified, "
+              f"{self.batched_frames / max(self.batches, 1):.2f} frames per batch", file=sys.stderr)
+
+
+# -------------------------
+# Network recognition API
+# -------------------------
+# Handshape groups separated by the CNN, in output order
+GROUP_LABELS = ["AEMNST", "BDFIKRUVW", "CO", "GH", "L", "PQZ", "X", "YJ"]
+
+# Open palm in camera coordinates, used by the load test when no landmark file is given
+SAMPLE_HAND = [[320, 400, 0], [280, 380, 0], [255, 350, 0], [240, 320, 0], [230, 295, 0],
+               [290, 300, 0], [285, 260, 0], [282, 235, 0], [280, 212, 0],
+               [320, 295, 0], [320, 250, 0], [320, 222, 0], [320, 198, 0],
+               [350, 300, 0], [353, 258, 0], [355, 232, 0], [357, 210, 0],
+               [378, 312, 0], [385, 280, 0], [389, 260, 0], [392, 242, 0]]
+
+
+def skeleton_from_landmarks(landmarks, offset=29):
+    """Camera-coordinate landmarks, as in the recording sidecar, to crop-relative pts and the hand box size"""
+    points = np.asarray(landmarks, dtype=np.int32)
+    if points.ndim != 2 or points.shape[0] < 21 or points.shape[1] < 2:
+        raise ValueError("Expected 21 [x, y, z] landmarks")
+    points = points[:21, :3].copy()
+    if points.shape[1] == 2:
+        points = np.hstack([points, np.zeros((21, 1), np.int32)])
+    xmin, ymin = points[:, 0].min(), points[:, 1].min()
+    wbox = int(points[:, 0].max() - xmin)
+    hbox = int(points[:, 1].max() - ymin)
+    points[:, 0] -= xmin - offset
+    points[:, 1] -= ymin - offset
+    return points.tolist(), wbox, hbox
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q / 100.0 * (len(ordered) - 1))))]
+
+
+class ClientSession:
+    """Per-connection state: sentence, lazily created detectors and a token-bucket rate limit"""
+
+    def __init__(self, websocket, rate_limit, burst, policy="next"):
+        self.websocket = websocket
+        self.sentence = SentenceState(policy)
+        self.detector = None
+        self.hd2 = None
+        self.word = ""
+        self.suggestions = []
+
+        self.rate_limit = rate_limit
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+        self.received = 0
+        self.answered = 0
+        self.limited = 0
+
+    def allow(self):
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate_limit)
+        self.updated = now
+        if self.tokens < 1.0:
+            return False
+        self.tokens -= 1.0
+        return True
+
+
+class RecognitionService:
+    """Recognition over WebSocket for thin clients on the local network.
+
+    A binary message is one JPEG frame; a text message is JSON, either
+    {"id": ..., "landmarks": [[x, y, z] * 21]} in camera coordinates (the
+    format of the recording sidecar) or {"cmd": "clear"}. Every message is
+    answered in order with the symbol, top-k group probabilities, the
+    sentence and word suggestions.
+
+    Each connection has a queue of at most max_pending messages; when it is
+    full the server stops reading that socket, so a fast client is slowed by
+    TCP instead of growing server memory. Messages over the per-connection
+    rate limit are answered with an error and skipped. Frames from all
+    connections are classified together in micro-batches. GET /stats returns
+    the counters as JSON. The server binds to localhost; serving other
+    machines takes an explicit host.
+    """
+
+    def __init__(self, host="127.0.0.1", port=8765, batch_size=16, batch_wait=0.005, max_pending=4,
+                 rate_limit=30.0, burst=10, top_k=3, workers=None, policy="next"):
+        self.host = host
+        self.port = port
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait
+        self.max_pending = max_pending
+        self.rate_limit = rate_limit
+        self.burst = burst
+        self.top_k = top_k
+        self.policy = policy
+        self.workers = workers or os.cpu_count() or 4
+        self.sessions = set()
+        self.batches = 0
+        self.batched = 0
+        try:
+            self.ddd = enchant.Dict("en-US")
+        except Exception as e:
+            print("Error loading dictionary:", e)
+            self.ddd = None
+
+    def run(self):
+        if websockets is None:
+            print("The network API needs the websockets package (pip install websockets)")
+            return
+        try:
+            asyncio.run(self.serve())
+        except KeyboardInterrupt:
+            pass
+
+    async def serve(self):
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue()
+        self.pool = ThreadPoolExecutor(self.workers)
+        # The model is only ever called from this one thread
+        self.model_pool = ThreadPoolExecutor(1)
+        model = await self.loop.run_in_executor(self.model_pool, get_model)
+        if model is None:
+            return
+        batcher = asyncio.ensure_future(self.batch_loop(model))
+        try:
+            async with websockets.serve(self.handle, self.host, self.port, max_size=2 ** 21,
+                                        process_request=self.process_request):
+                print(f"Recognition API listening on ws://{self.host}:{self.port}")
+                await asyncio.Future()
+        finally:
+            batcher.cancel()
+            self.pool.shutdown(wait=False)
+            self.model_pool.shutdown(wait=False)
+
+    def process_request(self, *args):
+        """Answer GET /stats over plain HTTP; everything else is a WebSocket handshake"""
+        if len(args) == 2 and hasattr(args[1], "path"):
+            # websockets >= 13: (connection, request)
+            connection, request = args
+            if request.path == "/stats":
+                return connection.respond(HTTPStatus.OK, json.dumps(self.stats()) + "\n")
+            return None
+        path, headers = args
+        if path == "/stats":
+            return HTTPStatus.OK, [("Content-Type", "application/json")], (json.dumps(self.stats()) + "\n").encode()
+        return None
+
+    def stats(self):
+        return {"connections": len(self.sessions),
+                "received": sum(session.received for session in self.sessions),
+                "answered": sum(session.answered for session in self.sessions),
+                "rate_limited": sum(session.limited for session in self.sessions),
+                "batches": self.batches,
+                "frames_per_batch": round(self.batched / max(self.batches, 1), 2)}
+
+    async def handle(self, websocket, path=None):
+        session = ClientSession(websocket, self.rate_limit, self.burst, self.policy)
+        self.sessions.add(session)
+        inbox = asyncio.Queue(self.max_pending)
+        worker = asyncio.ensure_future(self.session_loop(session, inbox))
+        try:
+            async for message in websocket:
+                session.received += 1
+                limited = not session.allow()
+                if limited:
+                    session.limited += 1
+                # Blocks while the connection has max_pending messages queued; rate-limited
+                # messages are queued too so their replies keep the request order
+                await inbox.put((message, limited))
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            worker.cancel()
+            self.sessions.discard(session)
+
+    async def session_loop(self, session, inbox):
+        while True:
+            message, limited = await inbox.get()
+            if limited:
+                reply = {"id": self.message_id(message), "error": "rate_limited",
+                         "retry_after": round(1.0 / self.rate_limit, 3)}
+            else:
+                try:
+                    reply = await self.process_message(session, message)
+                except Exception as e:
+                    reply = {"id": self.message_id(message), "error": str(e)}
+            try:
+                await session.websocket.send(json.dumps(reply))
+            except websockets.ConnectionClosed:
+                return
+            session.answered += 1
+
+    @staticmethod
+    def message_id(message):
+        """Request id of a JSON text message, or None"""
+        if isinstance(message, bytes):
+            return None
+        try:
+            request = json.loads(message)
+        except ValueError:
+            return None
+        return request.get("id") if isinstance(request, dict) else None
+
+    async def process_message(self, session, message):
+        request_id = None
+        if isinstance(message, bytes):
+            item = await self.loop.run_in_executor(self.pool, self.detect_jpeg, session, message)
+        else:
+            request = json.loads(message)
+            request_id = request.get("id")
+            if request.get("cmd") == "clear":
+                session.sentence.clear()
+                session.word = ""
+                session.suggestions = []
+                return {"id": request_id, "text": ""}
+            if "landmarks" not in request:
+                raise ValueError("Expected landmarks or a JPEG frame")
+            item = await self.loop.run_in_executor(self.pool, self.prepare_landmarks, request["landmarks"])
+
+        if item is None:
+            session.sentence.absent()
+            return {"id": request_id, "hand": False, "text": session.sentence.text.strip()}
+        skeleton, pts = item
+        future = self.loop.create_future()
+        await self.queue.put((skeleton, future))
+        prob = await future
+        return await self.update_session(session, request_id, prob, pts)
+
+    def detect_jpeg(self, session, data):
+        frame = cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR)
+        if frame is None:
+            raise ValueError("Could not decode JPEG frame")
+        # A connection's messages are handled one at a time, so its detectors are never shared
+        if session.detector is None:
+            session.detector = HandDetector(maxHands=1)
+            session.hd2 = HandDetector(maxHands=1)
+        detection = detect_hand(session.detector, session.hd2, frame, 29)
+        if detection is None:
+            return None
+        x, y, wbox, hbox = detection['bbox']
+        pts = detection['pts'].tolist()
+        return render_skeleton(pts, wbox, hbox), pts
+
+    def prepare_landmarks(self, landmarks):
+        if landmarks is None:
+            return None
+        pts, wbox, hbox = skeleton_from_landmarks(landmarks)
+        return render_skeleton(pts, wbox, hbox), pts
+
+    async def batch_loop(self, model):
+        while True:
+            batch = [await self.queue.get()]
+            deadline = self.loop.time() + self.batch_wait
+            while len(batch) < self.batch_size:
+                if not self.queue.empty():
+                    batch.append(self.queue.get_nowait())
+                    continue
+                timeout = deadline - self.loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            images = np.stack([skeleton for skeleton, _ in batch])
+            try:
+                probs = await self.loop.run_in_executor(self.model_pool, partial(model.predict, images, verbose=0))
+            except Exception as e:
+                print("Prediction error:", e)
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            for (_, future), prob in zip(batch, probs):
+                if not future.done():
+                    future.set_result(prob)
+            self.batches += 1
+            self.batched += len(batch)
+
+    async def update_session(self, session, request_id, prob, pts):
+        ch1 = classify(prob, pts)
+        text = session.sentence.push(ch1, float(np.max(prob)))
+        word = session.sentence.current_word().strip()
+        if word != session.word:
+            session.word = word
+            suggestions = []
+            if word and self.ddd:
+                # enchant lookups can take milliseconds; keep them off the event loop
+                suggestions = (await self.loop.run_in_executor(self.pool, self.ddd.suggest, word))[:4]
+            session.suggestions = suggestions
+        top = np.argsort(prob)[::-1][:self.top_k]
+        return {"id": request_id, "hand": True, "symbol": str(ch1),
+                "top": [{"group": GROUP_LABELS[i], "p": round(float(prob[i]), 4)} for i in top],
+                "text": text.strip(), "word": word, "suggestions": session.suggestions}
+
+
+async def load_test_connection(url, samples, messages, rate, latencies, errors):
+    interval = 1.0 / rate if rate else 0.0
+    async with websockets.connect(url) as websocket:
+        next_send = time.perf_counter()
+        for i in range(messages):
+            payload = json.dumps({"id": i, "landmarks": samples[i % len(samples)]})
+            start = time.perf_counter()
+            await websocket.send(payload)
+            reply = json.loads(await websocket.recv())
+            latencies.append(time.perf_counter() - start)
+            if "error" in reply:
+                errors.append(reply["error"])
+            if interval:
+                next_send += interval
+                delay = next_send - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+
+def run_load_test(url, connection_counts=(1, 2, 4, 8, 16, 32), messages=200, rate=25.0, landmarks_file=None):
+    """Round-trip latency of the recognition API at increasing numbers of landmark-sending clients"""
+    if websockets is None:
+        print("The load test needs the websockets package (pip install websockets)")
+        return
+    samples = [SAMPLE_HAND]
+    if landmarks_file:
+        with open(landmarks_file, encoding="utf-8") as f:
+            samples = [row["landmarks"] for row in map(json.loads, f) if row.get("landmarks")] or samples
+
+    async def run_level(count):
+        latencies, errors = [], []
+        await asyncio.gather(*(load_test_connection(url, samples, messages, rate, latencies, errors)
+                               for _ in range(count)))
+        return latencies, errors
+
+    for count in connection_counts:
+        start = time.perf_counter()
+        latencies, errors = asyncio.run(run_level(count))
+        elapsed = time.perf_counter() - start
+        print(f"{count:4d} connections: p50 {percentile(latencies, 50) * 1000:7.1f} ms  "
+              f"p99 {percentile(latencies, 99) * 1000:7.1f} ms  "
+              f"{len(latencies) / elapsed:7.1f} msg/s  {len(errors)} errors")
 
 
 # Speech worker thread to avoid GUI freezing
@@ -84,20 +2255,167 @@ class SpeechWorker(QThread):
         self.finished.emit()
 
 
+# -------------------------
+# Lesson recording
+# -------------------------
+class ControlChannel(QThread):
+    """JSON-lines control channel with the parent application over stdin/stdout.
+
+    Commands arrive on stdin and are emitted on the GUI thread through the
+    command signal; events are written to the original stdout. Regular
+    print() output is redirected to stderr so it cannot corrupt the protocol.
+    """
+    command = pyqtSignal(dict)
+
+    def __init__(self):
+        super().__init__()
+        self.out = sys.stdout
+        self.lock = threading.Lock()
+        sys.stdout = sys.stderr
+
+    def run(self):
+        for line in sys.stdin:
+            try:
+                message = json.loads(line)
+            except ValueError:
+                print("Ignoring invalid control message:", line.strip())
+                continue
+            self.command.emit(message)
+        # The parent went away
+        self.command.emit({"cmd": "quit"})
+
+    def send(self, event, **fields):
+        fields["event"] = event
+        try:
+            with self.lock:
+                self.out.write(json.dumps(fields) + "\n")
+                self.out.flush()
+        except (OSError, ValueError) as e:
+            print("Control channel error:", e)
+
+
+class LessonRecorder:
+    """Writes the app's composited output straight to a video file.
+
+    Frames are encoded on a background thread at a fixed frame rate (frames
+    are repeated by timestamp when the camera runs slower), alongside two
+    JSON-lines sidecars: <name>_transcript.jsonl with the sentence each time
+    it changes and <name>_landmarks.jsonl with the hand landmarks of every
+    frame in camera coordinates.
+    """
+
+    def __init__(self, path, frame_size, fps=30.0):
+        self.path = path
+        self.fps = fps
+        self.frame_size = frame_size
+        self.writer = None
+        # Lossless FFV1 where the OpenCV build supports it, MJPG otherwise
+        for codec in ("FFV1", "MJPG"):
+            writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*codec), fps, frame_size)
+            if writer.isOpened():
+                self.writer = writer
+                break
+            writer.release()
+        if self.writer is None:
+            raise RuntimeError("Could not open video writer for " + path)
+
+        base = os.path.splitext(path)[0]
+        self.transcript_file = open(base + "_transcript.jsonl", "w", encoding="utf-8")
+        self.landmarks_file = open(base + "_landmarks.jsonl", "w", encoding="utf-8")
+        self.last_text = None
+        self.start_time = time.perf_counter()
+        self.frames = queue.Queue(maxsize=30)
+        self.frame_count = 0  # frames captured
+        self.written = 0  # frames written, including repeats
+        self.dropped = 0
+        self.encoder = threading.Thread(target=self.encode_loop, daemon=True)
+        self.encoder.start()
+
+    def add_frame(self, frame, landmarks, text):
+        """Queue a composited BGR frame; landmarks is a list of (x, y, z) or None"""
+        t = time.perf_counter() - self.start_time
+        index = self.frame_count
+        self.frame_count += 1
+
+        self.landmarks_file.write(json.dumps({"t": round(t, 4), "frame": index,
+                                              "landmarks": landmarks}) + "\n")
+        if text != self.last_text:
+            self.last_text = text
+            self.transcript_file.write(json.dumps({"t": round(t, 4), "text": text}) + "\n")
+
+        try:
+            self.frames.put_nowait((frame, t))
+        except queue.Full:
+            # The encoder is behind; the next frame is repeated to cover this slot
+            self.dropped += 1
+
+    def encode_loop(self):
+        while True:
+            item = self.frames.get()
+            if item is None:
+                break
+            frame, t = item
+            # Repeat the frame for every slot up to its timestamp
+            slots = max(1, int(t * self.fps) + 1 - self.written)
+            for _ in range(slots):
+                self.writer.write(frame)
+            self.written += slots
+
+    def close(self):
+        """Flush pending frames and close all files; returns a summary dict"""
+        duration = time.perf_counter() - self.start_time
+        self.frames.put(None)
+        self.encoder.join()
+        self.writer.release()
+        self.transcript_file.close()
+        self.landmarks_file.close()
+        return {"path": self.path, "frames": self.written, "captured": self.frame_count,
+                "dropped": self.dropped, "duration": round(duration, 2)}
+
+
 # -------------------------
 # GUI Application
 # -------------------------
 class SignLanguageApp(QWidget):
-    def __init__(self):
+    def __init__(self, control=None, detect_workers=0, camera=0, cache_tolerance=0.04, detect_widths=None,
+                 commit_policy="next", dwell_frames=8, sequence_model=SEQUENCE_MODEL_PATH, sequence_stride=5,
+                 smooth_cutoff=1.0, smooth_beta=0.02):
         super().__init__()
         self.setWindowTitle("Sign Language to Text Conversion with Translation")
         self.setGeometry(100, 100, 1800, 1000)
 
         # Camera & detectors
-        self.cap = cv2.VideoCapture(0, cv2.CAP_DSHOW)
+        self.cap = open_capture_source(camera)
+        # Idle mode: after IDLE_AFTER_FRAMES frames without a hand, poll at IDLE_INTERVAL_MS and only
+        # run detection when the detection box changes (or every IDLE_DETECT_EVERY ticks)
+        self.idle = False
+        self.no_hand_frames = 0
+        self.idle_ticks = 0
+        self.motion_reference = None
+        self.skeleton_blank = False
+        self.mode_usage = {False: [0.0, 0.0], True: [0.0, 0.0]}  # idle -> [cpu seconds, wall seconds]
+        self.mode_started = (time.process_time(), time.monotonic())
+
+        # Glass-to-prediction latency of recent frames, in seconds
+        self.latencies = deque(maxlen=300)
+        self.prediction_cache = PredictionCache(cache_tolerance)
+        # Landmark smoothing; a cutoff of 0 disables it
+        self.smoother = OneEuroFilter(smooth_cutoff, smooth_beta) if smooth_cutoff else None
         self.detector = HandDetector(maxHands=1)
         self.hd2 = HandDetector(maxHands=1)
         self.offset = 29
+        # Detection pyramid widths for the first stage; None detects at full resolution
+        self.detect_widths = detect_widths
+        # Optional multi-process detection; the ring is sized for the camera's frames
+        self.detection_pool = None
+        if detect_workers:
+            frame_shape = (self.cap.frame_size[1], self.cap.frame_size[0], 3)
+            self.detection_pool = DetectionPool(detect_workers, frame_shape=frame_shape, offset=self.offset,
+                                                widths=detect_widths)
+        get_model()
+
+        # Initialize pygame mixer for audio playback
+        pygame.mixer.init()
 
         # Sentence formation variables
         self.current_sentence = ""
@@ -105,12 +2423,9 @@ class SignLanguageApp(QWidget):
         self.prediction_count = 0
         self.PREDICTION_THRESHOLD = 5
         self.last_word = ""
-        self.str = " "
+        # Commit policy and its state machine fields live on the sentence
+        self.sentence = SentenceState(commit_policy, min_stable_frames=dwell_frames)
         self.word = " "
-        self.current_symbol = "Empty"
-        self.ten_prev_char = [" "] * 10
-        self.count = -1
-        self.prev_char = ""
 
         # Dictionary for word suggestions
         self.ddd = enchant.Dict("en-US")
@@ -160,16 +2475,16 @@ class SignLanguageApp(QWidget):
         self.speech_worker = None
         self.enable_voice = True
 
-        # State machine for adding one char per presentation
-        self.state = "WAIT_HAND"
-        self.current_candidate = None
-        self.stable_count = 0
-        self.min_stable_frames = 8
-        self.absent_count = 0
-        self.min_absent_frames = 12
-
-        # Movement trail (optional)
+        # Movement trail of the index fingertip, drawn on the feed
         self.trail_points = deque(maxlen=50)
+        # Moving letters and word signs over the recent landmark history
+        self.sequence = SequenceRecognizer(sequence_model, stride=sequence_stride)
+
+        # Lesson recording, controlled by the parent application
+        self.recorder = None
+        self.control = control
+        if self.control:
+            self.control.command.connect(self.handle_command)
 
         # Build UI
         self.init_ui()
@@ -177,7 +2492,11 @@ class SignLanguageApp(QWidget):
         # Timer loop
         self.timer = QTimer()
         self.timer.timeout.connect(self.update_frame)
-        self.timer.start(30)
+        self.timer.start(self.ACTIVE_INTERVAL_MS)
+
+        if self.control:
+            self.control.start()
+            self.control.send("ready")
 
     def init_ui(self):
         main_layout = QHBoxLayout(self)
@@ -346,14 +2665,14 @@ class SignLanguageApp(QWidget):
         suggestions = [self.word1, self.word2, self.word3, self.word4]
         if index < len(suggestions) and suggestions[index].strip():
             # Replace the last word with the suggestion
-            words = self.str.strip().split()
+            words = self.sentence.text.strip().split()
             if words:
                 words[-1] = suggestions[index]
             else:
                 words = [suggestions[index]]
 
-            self.str = " ".join(words)
-            self.text_edit.setPlainText(self.str)
+            self.sentence.text = " ".join(words)
+            self.text_edit.setPlainText(self.sentence.text)
             self.translate_text()
 
     def change_language(self, language):
@@ -412,8 +2731,8 @@ class SignLanguageApp(QWidget):
             self.last_word = ""
 
     def clear_sentence(self):
-        self.str = " "
-        self.text_edit.setPlainText(self.str)
+        self.sentence.clear()
+        self.text_edit.setPlainText(self.sentence.text)
         self.translation_display.setPlainText("")
         self.last_word = ""
         self.word1 = " "
@@ -428,410 +2747,21 @@ class SignLanguageApp(QWidget):
         self.suggestion_btn3.setText(self.word3)
         self.suggestion_btn4.setText(self.word4)
 
-    def predict(self, test_image, pts):
-        white = test_image
-        white = white.reshape(1, 400, 400, 3)
-        prob = np.array(model.predict(white, verbose=0)[0], dtype='float32')
-        ch1 = np.argmax(prob, axis=0)
-        prob[ch1] = 0
-        ch2 = np.argmax(prob, axis=0)
-        prob[ch2] = 0
-        ch3 = np.argmax(prob, axis=0)
-        prob[ch3] = 0
-
-        pl = [ch1, ch2]
-
-        # All the condition checks from the original code
-        # Condition for [Aemnst]
-        l = [[5, 2], [5, 3], [3, 5], [3, 6], [3, 0], [3, 2], [6, 4], [6, 1], [6, 2], [6, 6], [6, 7], [6, 0], [6, 5],
-             [4, 1], [1, 0], [1, 1], [6, 3], [1, 6], [5, 6], [5, 1], [4, 5], [1, 4], [1, 5], [2, 0], [2, 6], [4, 6],
-             [1, 0], [5, 7], [1, 6], [6, 1], [7, 6], [2, 5], [7, 1], [5, 4], [7, 0], [7, 5], [7, 2]]
-        if pl in l:
-            if (pts[6][1] < pts[8][1] and pts[10][1] < pts[12][1] and pts[14][1] < pts[16][1] and pts[18][1] < pts[20][
-                1]):
-                ch1 = 0
-
-        # Condition for [o][s]
-        l = [[2, 2], [2, 1]]
-        if pl in l:
-            if (pts[5][0] < pts[4][0]):
-                ch1 = 0
-
-        # Condition for [c0][aemnst]
-        l = [[0, 0], [0, 6], [0, 2], [0, 5], [0, 1], [0, 7], [5, 2], [7, 6], [7, 1]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if (pts[0][0] > pts[8][0] and pts[0][0] > pts[4][0] and pts[0][0] > pts[12][0] and pts[0][0] > pts[16][
-                0] and pts[0][0] > pts[20][0]) and pts[5][0] > pts[4][0]:
-                ch1 = 2
-
-        # Condition for [c0][aemnst]
-        l = [[6, 0], [6, 6], [6, 2]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if distance(pts[8], pts[16]) < 52:
-                ch1 = 2
-
-        # Condition for [gh][bdfikruvw]
-        l = [[1, 4], [1, 5], [1, 6], [1, 3], [1, 0]]
-        pl = [ch1, ch2]
-
-        if pl in l:
-            if pts[6][1] > pts[8][1] and pts[14][1] < pts[16][1] and pts[18][1] < pts[20][1] and pts[0][0] < pts[8][
-                0] and pts[0][0] < pts[12][0] and pts[0][0] < pts[16][0] and pts[0][0] < pts[20][0]:
-                ch1 = 3
-
-        # Con for [gh][l]
-        l = [[4, 6], [4, 1], [4, 5], [4, 3], [4, 7]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if pts[4][0] > pts[0][0]:
-                ch1 = 3
-
-        # Con for [gh][pqz]
-        l = [[5, 3], [5, 0], [5, 7], [5, 4], [5, 2], [5, 1], [5, 5]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if pts[2][1] + 15 < pts[16][1]:
-                ch1 = 3
-
-        # Con for [l][x]
-        l = [[6, 4], [6, 1], [6, 2]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if distance(pts[4], pts[11]) > 55:
-                ch1 = 4
-
-        # Con for [l][d]
-        l = [[1, 4], [1, 6], [1, 1]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if (distance(pts[4], pts[11]) > 50) and (
-                    pts[6][1] > pts[8][1] and pts[10][1] < pts[12][1] and pts[14][1] < pts[16][1] and pts[18][1] <
-                    pts[20][1]):
-                ch1 = 4
-
-        # Con for [l][gh]
-        l = [[3, 6], [3, 4]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if (pts[4][0] < pts[0][0]):
-                ch1 = 4
-
-        # Con for [l][c0]
-        l = [[2, 2], [2, 5], [2, 4]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if (pts[1][0] < pts[12][0]):
-                ch1 = 4
-
-        # Con for [gh][z]
-        l = [[3, 6], [3, 5], [3, 4]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if (pts[6][1] > pts[8][1] and pts[10][1] < pts[12][1] and pts[14][1] < pts[16][1] and pts[18][1] < pts[20][
-                1]) and pts[4][1] > pts[10][1]:
-                ch1 = 5
-
-        # Con for [gh][pq]
-        l = [[3, 2], [3, 1], [3, 6]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if pts[4][1] + 17 > pts[8][1] and pts[4][1] + 17 > pts[12][1] and pts[4][1] + 17 > pts[16][1] and pts[4][
-                1] + 17 > pts[20][1]:
-                ch1 = 5
-
-        # Con for [l][pqz]
-        l = [[4, 4], [4, 5], [4, 2], [7, 5], [7, 6], [7, 0]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if pts[4][0] > pts[0][0]:
-                ch1 = 5
-
-        # Con for [pqz][aemnst]
-        l = [[0, 2], [0, 6], [0, 1], [0, 5], [0, 0], [0, 7], [0, 4], [0, 3], [2, 7]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if pts[0][0] < pts[8][0] and pts[0][0] < pts[12][0] and pts[0][0] < pts[16][0] and pts[0][0] < pts[20][0]:
-                ch1 = 5
-
-        # Con for [pqz][yj]
-        l = [[5, 7], [5, 2], [5, 6]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if pts[3][0] < pts[0][0]:
-                ch1 = 7
-
-        # Con for [l][yj]
-        l = [[4, 6], [4, 2], [4, 4], [4, 1], [4, 5], [4, 7]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if pts[6][1] < pts[8][1]:
-                ch1 = 7
-
-        # Con for [x][yj]
-        l = [[6, 7], [0, 7], [0, 1], [0, 0], [6, 4], [6, 6], [6, 5], [6, 1]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if pts[18][1] > pts[20][1]:
-                ch1 = 7
-
-        # Condition for [x][aemnst]
-        l = [[0, 4], [0, 2], [0, 3], [0, 1], [0, 6]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if pts[5][0] > pts[16][0]:
-                ch1 = 6
-
-        # Condition for [yj][x]
-        l = [[7, 2]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if pts[18][1] < pts[20][1] and pts[8][1] < pts[10][1]:
-                ch1 = 6
-
-        # Condition for [c0][x]
-        l = [[2, 1], [2, 2], [2, 6], [2, 7], [2, 0]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if distance(pts[8], pts[16]) > 50:
-                ch1 = 6
-
-        # Con for [l][x]
-        l = [[4, 6], [4, 2], [4, 1], [4, 4]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if distance(pts[4], pts[11]) < 60:
-                ch1 = 6
-
-        # Con for [x][d]
-        l = [[1, 4], [1, 6], [1, 0], [1, 2]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if pts[5][0] - pts[4][0] - 15 > 0:
-                ch1 = 6
-
-        # Con for [b][pqz]
-        l = [[5, 0], [5, 1], [5, 4], [5, 5], [5, 6], [6, 1], [7, 6], [0, 2], [7, 1], [7, 4], [6, 6], [7, 2], [5, 0],
-             [6, 3], [6, 4], [7, 5], [7, 2]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if (pts[6][1] > pts[8][1] and pts[10][1] > pts[12][1] and pts[14][1] > pts[16][1] and pts[18][1] > pts[20][
-                1]):
-                ch1 = 1
-
-        # Con for [f][pqz]
-        l = [[6, 1], [6, 0], [0, 3], [6, 4], [2, 2], [0, 6], [6, 2], [7, 6], [4, 6], [4, 1], [4, 2], [0, 2], [7, 1],
-             [7, 4], [6, 6], [7, 2], [7, 5], [7, 2]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if (pts[6][1] < pts[8][1] and pts[10][1] > pts[12][1] and pts[14][1] > pts[16][1] and pts[18][1] > pts[20][
-                1]):
-                ch1 = 1
-
-        l = [[6, 1], [6, 0], [4, 2], [4, 1], [4, 6], [4, 4]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if (pts[10][1] > pts[12][1] and pts[14][1] > pts[16][1] and pts[18][1] > pts[20][1]):
-                ch1 = 1
-
-        # Con for [d][pqz]
-        l = [[5, 0], [3, 4], [3, 0], [3, 1], [3, 5], [5, 5], [5, 4], [5, 1], [7, 6]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if ((pts[6][1] > pts[8][1] and pts[10][1] < pts[12][1] and pts[14][1] < pts[16][1] and pts[18][1] < pts[20][
-                1]) and (pts[2][0] < pts[0][0]) and pts[4][1] > pts[14][1]):
-                ch1 = 1
-
-        l = [[4, 1], [4, 2], [4, 4]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if (distance(pts[4], pts[11]) < 50) and (
-                    pts[6][1] > pts[8][1] and pts[10][1] < pts[12][1] and pts[14][1] < pts[16][1] and pts[18][1] <
-                    pts[20][1]):
-                ch1 = 1
-
-        l = [[3, 4], [3, 0], [3, 1], [3, 5], [3, 6]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if ((pts[6][1] > pts[8][1] and pts[10][1] < pts[12][1] and pts[14][1] < pts[16][1] and pts[18][1] < pts[20][
-                1]) and (pts[2][0] < pts[0][0]) and pts[14][1] < pts[4][1]):
-                ch1 = 1
-
-        l = [[6, 6], [6, 4], [6, 1], [6, 2]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if pts[5][0] - pts[4][0] - 15 < 0:
-                ch1 = 1
-
-        # Con for [i][pqz]
-        l = [[5, 4], [5, 5], [5, 1], [0, 3], [0, 7], [5, 0], [0, 2], [6, 2], [7, 5], [7, 1], [7, 6], [7, 7]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if ((pts[6][1] < pts[8][1] and pts[10][1] < pts[12][1] and pts[14][1] < pts[16][1] and pts[18][1] > pts[20][
-                1])):
-                ch1 = 1
-
-        # Con for [yj][bfdi]
-        l = [[1, 5], [1, 7], [1, 1], [1, 6], [1, 3], [1, 0]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if (pts[4][0] < pts[5][0] + 15) and ((
-                    pts[6][1] < pts[8][1] and pts[10][1] < pts[12][1] and pts[14][1] < pts[16][1] and pts[18][1] >
-                    pts[20][1])):
-                ch1 = 7
-
-        # Con for [uvr]
-        l = [[5, 5], [5, 0], [5, 4], [5, 1], [4, 6], [4, 1], [7, 6], [3, 0], [3, 5]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if ((pts[6][1] > pts[8][1] and pts[10][1] > pts[12][1] and pts[14][1] < pts[16][1] and pts[18][1] < pts[20][
-                1])) and pts[4][1] > pts[14][1]:
-                ch1 = 1
-
-        # Con for [w]
-        fg = 13
-        l = [[3, 5], [3, 0], [3, 6], [5, 1], [4, 1], [2, 0], [5, 0], [5, 5]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if not (pts[0][0] + fg < pts[8][0] and pts[0][0] + fg < pts[12][0] and pts[0][0] + fg < pts[16][0] and
-                    pts[0][0] + fg < pts[20][0]) and not (
-                    pts[0][0] > pts[8][0] and pts[0][0] > pts[12][0] and pts[0][0] > pts[16][0] and pts[0][0] > pts[20][
-                0]) and distance(pts[4], pts[11]) < 50:
-                ch1 = 1
-
-        # Con for [w]
-        l = [[5, 0], [5, 5], [0, 1]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if pts[6][1] > pts[8][1] and pts[10][1] > pts[12][1] and pts[14][1] > pts[16][1]:
-                ch1 = 1
-
-        # -------------------------condn for 8 groups  ends
-
-        # -------------------------condn for subgroups  starts
-        if ch1 == 0:
-            ch1 = 'S'
-            if pts[4][0] < pts[6][0] and pts[4][0] < pts[10][0] and pts[4][0] < pts[14][0] and pts[4][0] < pts[18][0]:
-                ch1 = 'A'
-            if pts[4][0] > pts[6][0] and pts[4][0] < pts[10][0] and pts[4][0] < pts[14][0] and pts[4][0] < pts[18][
-                0] and pts[4][1] < pts[14][1] and pts[4][1] < pts[18][1]:
-                ch1 = 'T'
-            if pts[4][1] > pts[8][1] and pts[4][1] > pts[12][1] and pts[4][1] > pts[16][1] and pts[4][1] > pts[20][1]:
-                ch1 = 'E'
-            if pts[4][0] > pts[6][0] and pts[4][0] > pts[10][0] and pts[4][0] > pts[14][0] and pts[4][1] < pts[18][1]:
-                ch1 = 'M'
-            if pts[4][0] > pts[6][0] and pts[4][0] > pts[10][0] and pts[4][1] < pts[18][1] and pts[4][1] < pts[14][1]:
-                ch1 = 'N'
-
-        if ch1 == 2:
-            if distance(pts[12], pts[4]) > 42:
-                ch1 = 'C'
-            else:
-                ch1 = 'O'
-
-        if ch1 == 3:
-            if distance(pts[8], pts[12]) > 72:
-                ch1 = 'G'
-            else:
-                ch1 = 'H'
-
-        if ch1 == 7:
-            if distance(pts[8], pts[4]) > 42:
-                ch1 = 'Y'
-            else:
-                ch1 = 'J'
-
-        if ch1 == 4:
-            ch1 = 'L'
-
-        if ch1 == 6:
-            ch1 = 'X'
-
-        if ch1 == 5:
-            if pts[4][0] > pts[12][0] and pts[4][0] > pts[16][0] and pts[4][0] > pts[20][0]:
-                if pts[8][1] < pts[5][1]:
-                    ch1 = 'Z'
-                else:
-                    ch1 = 'Q'
-            else:
-                ch1 = 'P'
-
-        if ch1 == 1:
-            if (pts[6][1] > pts[8][1] and pts[10][1] > pts[12][1] and pts[14][1] > pts[16][1] and pts[18][1] > pts[20][
-                1]):
-                ch1 = 'B'
-            if (pts[6][1] > pts[8][1] and pts[10][1] < pts[12][1] and pts[14][1] < pts[16][1] and pts[18][1] < pts[20][
-                1]):
-                ch1 = 'D'
-            if (pts[6][1] < pts[8][1] and pts[10][1] > pts[12][1] and pts[14][1] > pts[16][1] and pts[18][1] > pts[20][
-                1]):
-                ch1 = 'F'
-            if (pts[6][1] < pts[8][1] and pts[10][1] < pts[12][1] and pts[14][1] < pts[16][1] and pts[18][1] > pts[20][
-                1]):
-                ch1 = 'I'
-            if (pts[6][1] > pts[8][1] and pts[10][1] > pts[12][1] and pts[14][1] > pts[16][1] and pts[18][1] < pts[20][
-                1]):
-                ch1 = 'W'
-            if (pts[6][1] > pts[8][1] and pts[10][1] > pts[12][1] and pts[14][1] < pts[16][1] and pts[18][1] < pts[20][
-                1]) and pts[4][1] < pts[9][1]:
-                ch1 = 'K'
-            if ((distance(pts[8], pts[12]) - distance(pts[6], pts[10])) < 8) and (
-                    pts[6][1] > pts[8][1] and pts[10][1] > pts[12][1] and pts[14][1] < pts[16][1] and pts[18][1] <
-                    pts[20][1]):
-                ch1 = 'U'
-            if ((distance(pts[8], pts[12]) - distance(pts[6], pts[10])) >= 8) and (
-                    pts[6][1] > pts[8][1] and pts[10][1] > pts[12][1] and pts[14][1] < pts[16][1] and pts[18][1] <
-                    pts[20][1]) and (pts[4][1] > pts[9][1]):
-                ch1 = 'V'
-            if (pts[8][0] > pts[12][0]) and (
-                    pts[6][1] > pts[8][1] and pts[10][1] > pts[12][1] and pts[14][1] < pts[16][1] and pts[18][1] <
-                    pts[20][1]):
-                ch1 = 'R'
-
-        if ch1 == 1 or ch1 == 'E' or ch1 == 'S' or ch1 == 'X' or ch1 == 'Y' or ch1 == 'B':
-            if (pts[6][1] > pts[8][1] and pts[10][1] < pts[12][1] and pts[14][1] < pts[16][1] and pts[18][1] > pts[20][
-                1]):
-                ch1 = " "
-
-        if ch1 == 'E' or ch1 == 'Y' or ch1 == 'B':
-            if (pts[4][0] < pts[5][0]) and (
-                    pts[6][1] > pts[8][1] and pts[10][1] > pts[12][1] and pts[14][1] > pts[16][1] and pts[18][1] >
-                    pts[20][1]):
-                ch1 = "next"
-
-        if ch1 == 'Next' or 'B' or 'C' or 'H' or 'F' or 'X':
-            if (pts[0][0] > pts[8][0] and pts[0][0] > pts[12][0] and pts[0][0] > pts[16][0] and pts[0][0] > pts[20][
-                0]) and (
-                    pts[4][1] < pts[8][1] and pts[4][1] < pts[12][1] and pts[4][1] < pts[16][1] and pts[4][1] < pts[20][
-                1]) and (
-                    pts[4][1] < pts[6][1] and pts[4][1] < pts[10][1] and pts[4][1] < pts[14][1] and pts[4][1] < pts[18][
-                1]):
-                ch1 = 'Backspace'
-
-        if ch1 == "next" and self.prev_char != "next":
-            if self.ten_prev_char[(self.count - 2) % 10] != "next":
-                if self.ten_prev_char[(self.count - 2) % 10] == "Backspace":
-                    self.str = self.str[0:-1]
-                else:
-                    if self.ten_prev_char[(self.count - 2) % 10] != "Backspace":
-                        self.str = self.str + self.ten_prev_char[(self.count - 2) % 10]
-            else:
-                if self.ten_prev_char[(self.count - 0) % 10] != "Backspace":
-                    self.str = self.str + self.ten_prev_char[(self.count - 0) % 10]
-
-        if ch1 == "  " and self.prev_char != "  ":
-            self.str = self.str + "  "
-
-        self.prev_char = ch1
-        self.current_symbol = ch1
-        self.count += 1
-        self.ten_prev_char[self.count % 10] = ch1
+    def predict(self, test_image, pts, cached=None):
+        if cached is None:
+            started = time.perf_counter()
+            white = test_image
+            white = white.reshape(1, 400, 400, 3)
+            prob = get_model().predict(white, verbose=0)[0]
+            ch1 = classify(prob, pts)
+            confidence = float(np.max(prob))
+            self.prediction_cache.store(test_image, (ch1, confidence), time.perf_counter() - started)
+        else:
+            ch1, confidence = cached
+        self.sentence.push(ch1, confidence)
 
-        if len(self.str.strip()) != 0:
-            st = self.str.rfind(" ")
-            ed = len(self.str)
-            word = self.str[st + 1:ed]
+        if len(self.sentence.text.strip()) != 0:
+            word = self.sentence.current_word()
             self.word = word
             if len(word.strip()) != 0:
                 self.ddd.check(word)
@@ -862,7 +2792,7 @@ class SignLanguageApp(QWidget):
                 self.word4 = " "
 
         self.update_suggestion_buttons()
-        self.text_edit.setPlainText(self.str)
+        self.text_edit.setPlainText(self.sentence.text)
         self.char_label.setText(str(ch1))
         self.translate_text()
 
@@ -872,6 +2802,7 @@ class SignLanguageApp(QWidget):
         ret, frame = self.cap.read()
         if not ret:
             return
+        captured = self.cap.timestamp
 
         frame = cv2.flip(frame, 1)
         h, w, _ = frame.shape
@@ -882,110 +2813,229 @@ class SignLanguageApp(QWidget):
         box_y1 = h // 2 - box_size // 2
         box_x2 = box_x1 + box_size
         box_y2 = box_y1 + box_size
+        if self.idle:
+            self.idle_ticks += 1
+            moved = self.motion_in_box(frame, box_x1, box_y1, box_x2, box_y2)
+            if not moved and self.idle_ticks % self.IDLE_DETECT_EVERY:
+                cv2.rectangle(frame, (box_x1, box_y1), (box_x2, box_y2), (0, 120, 0), 2)
+                cv2.putText(frame, "Idle - show your hand", (30, 40),
+                            cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 120, 0), 2, cv2.LINE_AA)
+                self.display_image(frame, self.video_label)
+                return
+            if moved:
+                self.set_idle(False)
+
         cv2.rectangle(frame, (box_x1, box_y1), (box_x2, box_y2), (0, 200, 0), 2)
 
-        # find hands
-        hands, img = self.detector.findHands(frame, draw=False, flipType=True)
+        if self.detection_pool:
+            # Detection runs in worker processes; show results as they come back in frame order
+            self.detection_pool.submit(frame, context=(frame, box_x1, box_y1, box_x2, box_y2, captured))
+            for seq, context, detection in self.detection_pool.poll():
+                self.process_frame(detection, *context)
+        else:
+            # find hands
+            self.process_frame(detect_hand(self.detector, self.hd2, frame, self.offset, self.detect_widths),
+                               frame, box_x1, box_y1, box_x2, box_y2, captured)
+
+    def process_frame(self, detection, frame, box_x1, box_y1, box_x2, box_y2, captured=None):
+        """Draw the skeleton, run the classifier and update the widgets for one detection result"""
+        landmarks = None
         hand_in_box = False
-        skeleton_viz = np.ones((400, 400, 3), dtype=np.uint8) * 255
+        skeleton_viz = BLANK_SKELETON
         pred_label = None
+        self.update_idle(detection is not None)
+        if detection is None:
+            self.sentence.absent()
+            if self.smoother:
+                self.smoother.reset()
         pred_conf = 0.0
 
-        if hands and model is not None:
-            hand = hands[0]
-            x, y, wbox, hbox = hand['bbox']
+        if detection is not None and get_model() is not None:
+            x, y, wbox, hbox = detection['bbox']
+            x1, y1 = detection['origin']
+            pts = detection['pts'].tolist()
             cx = x + wbox // 2
             cy = y + hbox // 2
             hand_in_box = (box_x1 < cx < box_x2 and box_y1 < cy < box_y2)
 
-            # process crop and landmarks via hd2
-            y1 = max(0, y - self.offset)
-            y2 = min(frame.shape[0], y + hbox + self.offset)
-            x1 = max(0, x - self.offset)
-            x2 = min(frame.shape[1], x + wbox + self.offset)
-
-            if y2 > y1 and x2 > x1:
-                image = frame[y1:y2, x1:x2]
-                if image.size > 0:
-                    handz, _ = self.hd2.findHands(image, draw=False, flipType=True)
-                    if handz:
-                        pts = handz[0]['lmList']
-                        if len(pts) >= 21:
-                            # create white 400x400 and draw skeleton & numbers
-                            white = 255 * np.ones((400, 400, 3), np.uint8)
-                            os_x = ((400 - wbox) // 2) - 15
-                            os_y = ((400 - hbox) // 2) - 15
-
-                            # Draw finger lines (thumb, index, middle, ring, pinky)
-                            try:
-                                for t in range(0, 4):
-                                    cv2.line(white,
-                                             (pts[t][0] + os_x, pts[t][1] + os_y),
-                                             (pts[t + 1][0] + os_x, pts[t + 1][1] + os_y),
-                                             (0, 255, 0), 3)
-                                for t in range(5, 8):
-                                    cv2.line(white,
-                                             (pts[t][0] + os_x, pts[t][1] + os_y),
-                                             (pts[t + 1][0] + os_x, pts[t + 1][1] + os_y),
-                                             (0, 255, 0), 3)
-                                for t in range(9, 12):
-                                    cv2.line(white,
-                                             (pts[t][0] + os_x, pts[t][1] + os_y),
-                                             (pts[t + 1][0] + os_x, pts[t + 1][1] + os_y),
-                                             (0, 255, 0), 3)
-                                for t in range(13, 16):
-                                    cv2.line(white,
-                                             (pts[t][0] + os_x, pts[t][1] + os_y),
-                                             (pts[t + 1][0] + os_x, pts[t + 1][1] + os_y),
-                                             (0, 255, 0), 3)
-                                for t in range(17, 20):
-                                    cv2.line(white,
-                                             (pts[t][0] + os_x, pts[t][1] + os_y),
-                                             (pts[t + 1][0] + os_x, pts[t + 1][1] + os_y),
-                                             (0, 255, 0), 3)
-
-                                # Palm connections
-                                cv2.line(white, (pts[5][0] + os_x, pts[5][1] + os_y),
-                                         (pts[9][0] + os_x, pts[9][1] + os_y), (0, 255, 0), 3)
-                                cv2.line(white, (pts[9][0] + os_x, pts[9][1] + os_y),
-                                         (pts[13][0] + os_x, pts[13][1] + os_y), (0, 255, 0), 3)
-                                cv2.line(white, (pts[13][0] + os_x, pts[13][1] + os_y),
-                                         (pts[17][0] + os_x, pts[17][1] + os_y), (0, 255, 0), 3)
-                                cv2.line(white, (pts[0][0] + os_x, pts[0][1] + os_y),
-                                         (pts[5][0] + os_x, pts[5][1] + os_y), (0, 255, 0), 3)
-                                cv2.line(white, (pts[0][0] + os_x, pts[0][1] + os_y),
-                                         (pts[17][0] + os_x, pts[17][1] + os_y), (0, 255, 0), 3)
-                            except Exception:
-                                pass
-
-                            # Draw landmark dots
-                            for i in range(21):
-                                try:
-                                    cv2.circle(white, (pts[i][0] + os_x, pts[i][1] + os_y), 4, (0, 0, 255), -1)
-                                except Exception:
-                                    pass
-
-                            # paste into 400x400 canvas for visualization
-                            skeleton_viz = white
-
-                            # For model input use 400x400
-                            model_input = white
-                            try:
-                                ch1 = self.predict(model_input, pts)
-                                pred_label = ch1
-
-                                # Draw predicted label text on camera feed
-                                cv2.putText(frame, f"Predicted: {pred_label}", (30, 80),
-                                            cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2, cv2.LINE_AA)
-
-                            except Exception as pred_e:
-                                print("Prediction error:", pred_e)
-                                traceback.print_exc()
-                                pass
+            # Landmarks in camera coordinates for the recording sidecar (unsmoothed)
+            landmarks = [[p[0] + x1, p[1] + y1] + list(p[2:3]) for p in pts[:21]]
+
+            # Smooth in camera coordinates, since the crop origin itself jitters with the bbox
+            if self.smoother:
+                origin = np.array([x1, y1, 0], dtype=np.float32)
+                smoothed = self.smoother(np.asarray(landmarks, dtype=np.float32), captured)
+                pts = np.rint(smoothed - origin).astype(np.int32).tolist()
+
+            # Held pose: reuse the cached skeleton and symbol instead of drawing and predicting again
+            entry = self.prediction_cache.lookup(pts)
+            if entry:
+                white, cached = entry
+            else:
+                # create white 400x400 and draw skeleton & numbers
+                white = render_skeleton(pts, wbox, hbox)
+                cached = None
+            skeleton_viz = white
+
+            # For model input use 400x400
+            model_input = white
+            try:
+                ch1 = self.predict(model_input, pts, cached)
+                pred_label = ch1
+
+                # Draw predicted label text on camera feed
+                cv2.putText(frame, f"Predicted: {pred_label}", (30, 80),
+                            cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2, cv2.LINE_AA)
+
+            except Exception as pred_e:
+                print("Prediction error:", pred_e)
+                traceback.print_exc()
+                pass
+
+            self.trail_points.append((landmarks[8][0], landmarks[8][1]))
+        else:
+            self.trail_points.clear()
+
+        if len(self.trail_points) > 1:
+            cv2.polylines(frame, [np.array(self.trail_points, dtype=np.int32)], False, (255, 120, 0), 2)
+
+        sign = self.sequence.push(landmarks)
+        if sign:
+            self.add_sequence_sign(*sign)
+
+        if captured:
+            self.latencies.append(time.monotonic() - captured)
+            cv2.putText(frame, f"Latency: {self.latencies[-1] * 1000:.0f} ms", (30, 40),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 160, 255), 2, cv2.LINE_AA)
 
         # Update GUI widgets
         self.display_image(frame, self.video_label)
-        self.display_image(skeleton_viz, self.skeleton_label)
+        # The blank panel only needs drawing once
+        if skeleton_viz is not BLANK_SKELETON or not self.skeleton_blank:
+            self.display_image(skeleton_viz, self.skeleton_label)
+        self.skeleton_blank = skeleton_viz is BLANK_SKELETON
+
+        if self.recorder:
+            text = self.text_edit.toPlainText().strip()
+            self.recorder.add_frame(self.compose_lesson_frame(frame, skeleton_viz, text), landmarks, text)
+
+    def add_sequence_sign(self, label, confidence):
+        """Commit a moving letter or a whole word from the sequence model"""
+        if len(label) == 1:
+            self.sentence.commit(label)
+        else:
+            prefix = "" if self.sentence.text.endswith(" ") else " "
+            self.sentence.commit(prefix + label + " ")
+        self.char_label.setText(f"{label} ({confidence:.0%})")
+        self.text_edit.setPlainText(self.sentence.text)
+        self.translate_text()
+
+    # -------------------------
+    # Idle mode
+    # -------------------------
+    ACTIVE_INTERVAL_MS = 30
+    IDLE_INTERVAL_MS = 250
+    IDLE_AFTER_FRAMES = 100
+    IDLE_DETECT_EVERY = 8
+    MOTION_THRESHOLD = 3.0  # mean grey-level change of the downscaled detection box
+
+    def update_idle(self, hand):
+        if hand:
+            self.no_hand_frames = 0
+            if self.idle:
+                self.set_idle(False)
+            return
+        self.no_hand_frames += 1
+        # Recordings need a steady frame rate, so never idle while recording
+        if not self.idle and not self.recorder and self.no_hand_frames >= self.IDLE_AFTER_FRAMES:
+            self.set_idle(True)
+
+    def set_idle(self, idle):
+        if idle == self.idle:
+            return
+        self.account_mode()
+        self.idle = idle
+        self.idle_ticks = 0
+        self.motion_reference = None
+        self.no_hand_frames = 0
+        self.timer.setInterval(self.IDLE_INTERVAL_MS if idle else self.ACTIVE_INTERVAL_MS)
+        self.cap.set_rate(1000.0 / self.IDLE_INTERVAL_MS if idle else None)
+
+    def motion_in_box(self, frame, box_x1, box_y1, box_x2, box_y2):
+        """Cheap change detector: mean absolute difference of a 32x32 greyscale copy of the box"""
+        crop = frame[max(0, box_y1):box_y2, max(0, box_x1):box_x2]
+        if crop.size == 0:
+            return True
+        small = cv2.cvtColor(cv2.resize(crop, (32, 32), interpolation=cv2.INTER_AREA), cv2.COLOR_BGR2GRAY)
+        reference, self.motion_reference = self.motion_reference, small
+        if reference is None:
+            return False
+        return float(cv2.absdiff(small, reference).mean()) > self.MOTION_THRESHOLD
+
+    def account_mode(self):
+        """Add CPU and wall time since the last mode change to the current mode"""
+        cpu, wall = time.process_time(), time.monotonic()
+        usage = self.mode_usage[self.idle]
+        usage[0] += cpu - self.mode_started[0]
+        usage[1] += wall - self.mode_started[1]
+        self.mode_started = (cpu, wall)
+
+    def cpu_summary(self):
+        self.account_mode()
+        parts = []
+        for idle, label in ((False, "active"), (True, "idle")):
+            cpu, wall = self.mode_usage[idle]
+            if wall > 0:
+                parts.append(f"{label} {100.0 * cpu / wall:.0f}% of a core over {wall:.0f}s")
+        return "CPU use: " + ", ".join(parts)
+
+    # -------------------------
+    # Recording control
+    # -------------------------
+    LESSON_FRAME_SIZE = (1040, 560)
+
+    def compose_lesson_frame(self, frame, skeleton_viz, text):
+        """Camera feed and skeleton side by side with the sentence underneath"""
+        canvas = np.full((self.LESSON_FRAME_SIZE[1], self.LESSON_FRAME_SIZE[0], 3), 30, np.uint8)
+        canvas[0:480, 0:640] = cv2.resize(frame, (640, 480))
+        canvas[40:440, 640:1040] = skeleton_viz
+        cv2.putText(canvas, text[-50:] or " ", (20, 530), cv2.FONT_HERSHEY_SIMPLEX, 1.1,
+                    (255, 255, 255), 2, cv2.LINE_AA)
+        return canvas
+
+    def start_recording(self, path):
+        if self.recorder:
+            self.stop_recording()
+        self.set_idle(False)
+        try:
+            self.recorder = LessonRecorder(path, self.LESSON_FRAME_SIZE,
+                                           fps=1000.0 / self.timer.interval())
+            self.setWindowTitle("● REC - Sign Language to Text Conversion with Translation")
+            self.control.send("recording", path=path)
+        except Exception as e:
+            print("Error starting recording:", e)
+            self.recorder = None
+            self.control.send("error", message=str(e))
+
+    def stop_recording(self):
+        if not self.recorder:
+            return
+        recorder, self.recorder = self.recorder, None
+        self.setWindowTitle("Sign Language to Text Conversion with Translation")
+        try:
+            self.control.send("saved", **recorder.close())
+        except Exception as e:
+            print("Error saving recording:", e)
+            self.control.send("error", message=str(e))
+
+    def handle_command(self, message):
+        cmd = message.get("cmd")
+        if cmd == "record":
+            self.start_recording(message["path"])
+        elif cmd == "stop":
+            self.stop_recording()
+        elif cmd == "quit":
+            self.close()
 
     def display_image(self, img, widget_label):
         if img is None:
@@ -998,6 +3048,17 @@ class SignLanguageApp(QWidget):
         widget_label.setPixmap(QPixmap.fromImage(scaled))
 
     def closeEvent(self, event):
+        self.stop_recording()
+        if self.latencies:
+            print(f"Glass-to-prediction latency: p50 {percentile(self.latencies, 50) * 1000:.0f} ms, "
+                  f"p95 {percentile(self.latencies, 95) * 1000:.0f} ms, {self.cap.skipped} stale frames skipped")
+            print(self.prediction_cache.summary())
+        print(self.cpu_summary())
+        if self.sequence.enabled:
+            print(self.sequence.summary())
+        if self.detection_pool:
+            self.detection_pool.close()
+            self.detection_pool = None
         try:
             if self.cap:
                 self.cap.release()
@@ -1011,7 +3072,114 @@ class SignLanguageApp(QWidget):
 # Run app
 # -------------------------
 if __name__ == "__main__":
-    app = QApplication(sys.argv)
-    win = SignLanguageApp()
+    parser = argparse.ArgumentParser(description="Sign language to text")
+    parser.add_argument("--control", action="store_true",
+                        help="recording is driven by the parent application over stdin/stdout")
+    parser.add_argument("--camera", default="0",
+                        help="camera index, video file, image folder or glob pattern")
+    parser.add_argument("--cache-tolerance", type=float, default=0.04,
+                        help="landmark movement, as a fraction of hand size, treated as the same pose; 0 disables the cache")
+    parser.add_argument("--cache-report", metavar="FILE",
+                        help="replay a _landmarks.jsonl recording through the prediction cache and exit")
+    parser.add_argument("--commit-policy", choices=SentenceState.POLICIES, default="next",
+                        help="commit letters with the \"next\" gesture or by holding them (dwell)")
+    parser.add_argument("--dwell-frames", type=int, default=8,
+                        help="frames a letter must be held to commit it with --commit-policy dwell")
+    parser.add_argument("--benchmark-commit", metavar="FILE",
+                        help="replay a _landmarks.jsonl recording through each commit policy and exit")
+    parser.add_argument("--expected", metavar="TEXT",
+                        help="reference text for --benchmark-commit")
+    parser.add_argument("--smooth-cutoff", type=float, default=1.0,
+                        help="One-Euro minimum cutoff in Hz for landmark smoothing, 0 to disable")
+    parser.add_argument("--smooth-beta", type=float, default=0.02,
+                        help="One-Euro speed coefficient; higher follows fast movement more closely")
+    parser.add_argument("--benchmark-smoothing", metavar="FILE",
+                        help="replay a _landmarks.jsonl recording with several smoothing settings and exit")
+    parser.add_argument("--sequence-model", default=SEQUENCE_MODEL_PATH,
+                        help="Keras model for moving letters and word signs (skipped if missing)")
+    parser.add_argument("--sequence-stride", type=int, default=5,
+                        help="run the sequence model every this many frames")
+    parser.add_argument("--train-sequence", metavar="DIR",
+                        help="train the sequence model from per-sign folders of _landmarks.jsonl recordings")
+    parser.add_argument("--detect-widths", type=int, nargs="+", metavar="WIDTH",
+                        help="find the hand on frames downscaled to these widths, smallest first")
+    parser.add_argument("--benchmark-detection", metavar="VIDEO",
+                        help="compare detection widths on a recorded video and exit")
+    parser.add_argument("--detect-workers", type=int, default=0,
+                        help="run hand detection in this many worker processes")
+    parser.add_argument("--process-video", metavar="PATH",
+                        help="detect landmarks in a recorded video and exit")
+    parser.add_argument("--serve", nargs="+", metavar="SOURCE",
+                        help="headless recognition of camera indices or video files")
+    parser.add_argument("--batch-size", type=int, default=8,
+                        help="most frames classified per model call in --serve mode")
+    parser.add_argument("--report-interval", type=float, default=5.0,
+                        help="seconds between FPS reports in --serve mode")
+    parser.add_argument("--duration", type=float, default=None,
+                        help="stop --serve mode after this many seconds")
+    parser.add_argument("--api", action="store_true",
+                        help="serve the WebSocket recognition API")
+    parser.add_argument("--host", default="127.0.0.1",
+                        help="address the API binds to; use 0.0.0.0 to accept other machines")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--rate-limit", type=float, default=30.0,
+                        help="messages per second allowed per API connection")
+    parser.add_argument("--load-test", metavar="URL",
+                        help="measure API round-trip latency, e.g. ws://host:8765")
+    parser.add_argument("--connections", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32])
+    parser.add_argument("--messages", type=int, default=200,
+                        help="messages per connection in --load-test")
+    parser.add_argument("--send-rate", type=float, default=25.0,
+                        help="messages per second per connection in --load-test, 0 for as fast as possible")
+    parser.add_argument("--landmarks", metavar="FILE",
+                        help="_landmarks.jsonl recording to replay in --load-test")
+    args, qt_args = parser.parse_known_args()
+
+    if args.process_video:
+        process_video_file(args.process_video, args.detect_workers, widths=args.detect_widths)
+        sys.exit(0)
+
+    if args.benchmark_smoothing:
+        benchmark_smoothing(args.benchmark_smoothing)
+        sys.exit(0)
+
+    if args.train_sequence:
+        train_sequence_model(args.train_sequence, args.sequence_model)
+        sys.exit(0)
+
+    if args.benchmark_commit:
+        benchmark_commit_policies(args.benchmark_commit, args.expected)
+        sys.exit(0)
+
+    if args.benchmark_detection:
+        benchmark_detection(args.benchmark_detection)
+        sys.exit(0)
+
+    if args.cache_report:
+        cache_report(args.cache_report)
+        sys.exit(0)
+
+    if args.load_test:
+        run_load_test(args.load_test, args.connections, args.messages, args.send_rate, args.landmarks)
+        sys.exit(0)
+
+    if args.api:
+        RecognitionService(args.host, args.port, batch_size=args.batch_size,
+                           rate_limit=args.rate_limit, policy=args.commit_policy).run()
+        sys.exit(0)
+
+    if args.serve:
+        sources = [int(source) if source.isdigit() else source for source in args.serve]
+        RecognitionServer(sources, batch_size=args.batch_size, report_interval=args.report_interval,
+                          detect_workers=args.detect_workers, policy=args.commit_policy).run(args.duration)
+        sys.exit(0)
+
+    app = QApplication(sys.argv[:1] + qt_args)
+    win = SignLanguageApp(control=ControlChannel() if args.control else None,
+                          detect_workers=args.detect_workers, camera=args.camera,
+                          cache_tolerance=args.cache_tolerance, detect_widths=args.detect_widths,
+                          commit_policy=args.commit_policy, dwell_frames=args.dwell_frames,
+                          sequence_model=args.sequence_model, sequence_stride=args.sequence_stride,
+                          smooth_cutoff=args.smooth_cutoff, smooth_beta=args.smooth_beta)
     win.show()
     sys.exit(app.exec_())
@@ -7,7 +7,9 @@ import threading
 import time
 from datetime import datetime
 import os
-import glob
+import io
+import json
+import bisect
 import subprocess
 import sys
 import pyaudio
@@ -15,16 +17,89 @@ import wave
 import sounddevice as sd
 import soundfile as sf
 import sqlite3
+import errno
 import hashlib
+import hmac
+import secrets
 import re
 import shutil
-import pyautogui
-import pygetwindow as gw
+import queue
+import zipfile
+import argparse
+from collections import deque
+import concurrent.futures
+from concurrent.futures import Future, CancelledError, ThreadPoolExecutor
+
+try:
+    from watchdog.observers import Observer
+except ImportError:
+    Observer = None
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# Screen capture, only used when the ASL application cannot record the lesson itself
+try:
+    import mss
+except ImportError:
+    mss = None
+
+try:
+    import pyautogui
+    import pygetwindow as gw
+except ImportError:
+    pyautogui = None
+    gw = None
+
+VIDEO_EXTENSIONS = ('.avi', '.mp4', '.mov', '.mkv', '.wmv', '.flv', '.webm')
+
+# Content-addressed storage for imported videos; library files are hardlinks into it
+BLOB_ROOT = "blobs"
+
+# os.link failures that mean "hardlinks not possible here", so fall back to copying
+LINK_UNSUPPORTED_ERRNOS = {errno.EXDEV, errno.EPERM, errno.EMLINK,
+                           getattr(errno, "ENOTSUP", errno.EOPNOTSUPP), errno.EOPNOTSUPP}
+
+# Per-user file holding the session token of the last successful login
+if os.name == "nt":
+    CONFIG_DIR = os.path.join(os.environ.get("APPDATA") or os.path.expanduser("~"), "ASL Learner")
+else:
+    CONFIG_DIR = os.path.join(os.environ.get("XDG_CONFIG_HOME") or os.path.expanduser("~/.config"), "asl_learner")
+SESSION_FILE = os.path.join(CONFIG_DIR, "session")
+
+# Folders shown in the library: (folder, type, source, filename prefix replacements for the title)
+LIBRARY_FOLDERS = [
+    ("recordings_demonstrations", "demonstration", "Demonstration",
+     [("recording_", ""), ("asl_lesson_", "ASL Lesson ")]),
+    ("recordings_practice", "practice", "Practice Session", [("recording_", "")]),
+    ("saved_videos", "saved", "Saved Video", [("saved_video_", "")]),
+    ("asl_learner_frame", "asl_frame", "ASL Learner Frame", [("asl_frame_", "ASL Frame: ")]),
+]
+
+
+def title_from_filename(filename, replacements=()):
+    """Derive a display title from a video filename"""
+    title = os.path.splitext(os.path.basename(filename))[0]
+    for old, new in replacements:
+        title = title.replace(old, new)
+    return title.replace('_', ' ').title()
 
 
 class DatabaseManager:
+    # Password hashing work factors; kdf_n / pbkdf2_iterations can be tuned with --bench-kdf
+    DEFAULT_KDF_N = 2 ** 14
+    KDF_R = 8
+    KDF_P = 1
+    DEFAULT_PBKDF2_ITERATIONS = 600000
+    SESSION_LIFETIME = 12 * 3600  # seconds a saved session signs the user back in without the password
+
     def __init__(self, db_name="asl_users.db"):
         self.db_name = db_name
+        self.fts_enabled = False
+        self.kdf_n = self.DEFAULT_KDF_N
+        self.pbkdf2_iterations = self.DEFAULT_PBKDF2_ITERATIONS
         self.init_database()
 
     def init_database(self):
@@ -66,31 +141,245 @@ class DatabaseManager:
             )
         ''')
 
-        # Create default admin accounts if they don't exist
+        # Create filesystem library index tables
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS library_files (
+                file_path TEXT PRIMARY KEY,
+                folder TEXT NOT NULL,
+                title TEXT NOT NULL,
+                type TEXT NOT NULL,
+                source TEXT NOT NULL,
+                file_size INTEGER NOT NULL,
+                mtime REAL NOT NULL,
+                upload_date TEXT
+            )
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS library_folders (
+                folder TEXT PRIMARY KEY,
+                mtime_ns INTEGER NOT NULL,
+                scanned_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+
+        # Create video metadata cache table (one probe per file version)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS video_metadata (
+                file_path TEXT PRIMARY KEY,
+                file_size INTEGER NOT NULL,
+                mtime REAL NOT NULL,
+                fps REAL DEFAULT 0,
+                frame_count INTEGER DEFAULT 0,
+                duration REAL DEFAULT 0,
+                width INTEGER DEFAULT 0,
+                height INTEGER DEFAULT 0,
+                codec TEXT,
+                probed_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+
+        # Create seek index tables (keyframe positions and scrubbing previews per video version)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS video_keyframes (
+                file_path TEXT PRIMARY KEY,
+                file_size INTEGER NOT NULL,
+                mtime REAL NOT NULL,
+                keyframes TEXT NOT NULL
+            )
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS video_previews (
+                file_path TEXT NOT NULL,
+                frame_number INTEGER NOT NULL,
+                image BLOB NOT NULL,
+                PRIMARY KEY (file_path, frame_number)
+            )
+        ''')
+
+        # Create the content-addressed blob store tables (one row per blob, one per linked file)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS blobs (
+                hash TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                refcount INTEGER NOT NULL DEFAULT 0,
+                created_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS blob_refs (
+                file_path TEXT PRIMARY KEY,
+                hash TEXT NOT NULL REFERENCES blobs(hash)
+            )
+        ''')
+
+        # Create the persistent transcoding job queue
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS transcode_jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                source_path TEXT UNIQUE NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending'
+                    CHECK (status IN ('pending', 'running', 'done', 'failed')),
+                attempts INTEGER DEFAULT 0,
+                rendition_path TEXT,
+                preview_path TEXT,
+                error TEXT,
+                created_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_date TIMESTAMP
+            )
+        ''')
+
+        # Create the login session and settings tables
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS sessions (
+                token_hash TEXT PRIMARY KEY,
+                username TEXT NOT NULL,
+                user_type TEXT NOT NULL,
+                expires REAL NOT NULL
+            )
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS app_settings (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            )
+        ''')
+        cursor.execute("SELECT key, value FROM app_settings WHERE key IN ('kdf_n', 'pbkdf2_iterations')")
+        for key, value in cursor.fetchall():
+            setattr(self, key, int(value))
+
+        # Create the full-text search index over lessons and library files
+        self.fts_enabled = self.init_search_index(cursor)
+
+        # Create default admin accounts if they don't exist (hashing only when they are missing)
         default_users = [
-            ('teacher', self.hash_password('teach123'), 'teacher@asl.edu', 'Default Teacher', 'teacher'),
-            ('student', self.hash_password('learn123'), 'student@asl.edu', 'Default Student', 'student')
+            ('teacher', 'teach123', 'teacher@asl.edu', 'Default Teacher', 'teacher'),
+            ('student', 'learn123', 'student@asl.edu', 'Default Student', 'student')
         ]
 
-        for username, password_hash, email, full_name, user_type in default_users:
+        for username, password, email, full_name, user_type in default_users:
+            cursor.execute('SELECT 1 FROM users WHERE username = ?', (username,))
+            if cursor.fetchone():
+                continue
             try:
                 cursor.execute('''
                     INSERT OR IGNORE INTO users (username, password_hash, email, full_name, user_type)
                     VALUES (?, ?, ?, ?, ?)
-                ''', (username, password_hash, email, full_name, user_type))
+                ''', (username, self.hash_password(password), email, full_name, user_type))
             except sqlite3.IntegrityError:
                 pass  # User already exists
 
         conn.commit()
         conn.close()
 
-    def hash_password(self, password):
-        """Hash a password for storing"""
-        return hashlib.sha256(password.encode()).hexdigest()
+    def init_search_index(self, cursor):
+        """Create the FTS5 lesson search index and the triggers that keep it in sync.
+
+        Uploaded lessons are indexed under rowid = id and library files under
+        rowid = -library_files.rowid. Returns False if SQLite lacks FTS5.
+        """
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'lesson_search'")
+        is_new = cursor.fetchone() is None
+        try:
+            cursor.execute('''
+                CREATE VIRTUAL TABLE IF NOT EXISTS lesson_search USING fts5(
+                    title, description, category, uploaded_by,
+                    tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3'
+                )
+            ''')
+        except sqlite3.OperationalError as e:
+            print(f"Full-text search unavailable, using simple filtering: {e}")
+            return False
+
+        cursor.executescript('''
+            CREATE TRIGGER IF NOT EXISTS uploaded_lessons_search_insert AFTER INSERT ON uploaded_lessons BEGIN
+                INSERT INTO lesson_search (rowid, title, description, category, uploaded_by)
+                VALUES (new.id, new.title, new.description, new.category, new.uploaded_by);
+            END;
+            CREATE TRIGGER IF NOT EXISTS uploaded_lessons_search_delete AFTER DELETE ON uploaded_lessons BEGIN
+                DELETE FROM lesson_search WHERE rowid = old.id;
+            END;
+            CREATE TRIGGER IF NOT EXISTS uploaded_lessons_search_update
+            AFTER UPDATE OF title, description, category, uploaded_by ON uploaded_lessons BEGIN
+                DELETE FROM lesson_search WHERE rowid = old.id;
+                INSERT INTO lesson_search (rowid, title, description, category, uploaded_by)
+                VALUES (new.id, new.title, new.description, new.category, new.uploaded_by);
+            END;
+            CREATE TRIGGER IF NOT EXISTS library_files_search_insert AFTER INSERT ON library_files BEGIN
+                INSERT INTO lesson_search (rowid, title, description, category, uploaded_by)
+                VALUES (-new.rowid, new.title, '', 'General', 'System');
+            END;
+            CREATE TRIGGER IF NOT EXISTS library_files_search_delete AFTER DELETE ON library_files BEGIN
+                DELETE FROM lesson_search WHERE rowid = -old.rowid;
+            END;
+            CREATE TRIGGER IF NOT EXISTS library_files_search_update AFTER UPDATE OF title ON library_files BEGIN
+                DELETE FROM lesson_search WHERE rowid = -old.rowid;
+                INSERT INTO lesson_search (rowid, title, description, category, uploaded_by)
+                VALUES (-new.rowid, new.title, '', 'General', 'System');
+            END;
+        ''')
+
+        if is_new:
+            # Backfill rows that existed before the index was created
+            cursor.execute('''
+                INSERT INTO lesson_search (rowid, title, description, category, uploaded_by)
+                SELECT id, title, description, category, uploaded_by FROM uploaded_lessons
+            ''')
+            cursor.execute('''
+                INSERT INTO lesson_search (rowid, title, description, category, uploaded_by)
+                SELECT -rowid, title, '', 'General', 'System' FROM library_files
+            ''')
+        return True
+
+    def hash_password(self, password, kdf_n=None, pbkdf2_iterations=None):
+        """Hash a password for storing.
+
+        Uses salted scrypt ("scrypt$n$r$p$salt$hash") where hashlib provides it and
+        PBKDF2-SHA256 ("pbkdf2_sha256$iterations$salt$hash") otherwise.
+        """
+        salt = os.urandom(16)
+        if hasattr(hashlib, 'scrypt'):
+            n = kdf_n or self.kdf_n
+            key = self.scrypt(password, salt, n, self.KDF_R, self.KDF_P)
+            return f"scrypt${n}${self.KDF_R}${self.KDF_P}${salt.hex()}${key.hex()}"
+        iterations = pbkdf2_iterations or self.pbkdf2_iterations
+        key = hashlib.pbkdf2_hmac('sha256', password.encode(), salt, iterations)
+        return f"pbkdf2_sha256${iterations}${salt.hex()}${key.hex()}"
+
+    @staticmethod
+    def scrypt(password, salt, n, r, p):
+        # scrypt needs about 128 * r * n bytes; raise OpenSSL's 32 MB default for large n
+        return hashlib.scrypt(password.encode(), salt=salt, n=n, r=r, p=p, dklen=32,
+                              maxmem=256 * r * (n + p) + (1 << 20))
 
     def verify_password(self, stored_hash, provided_password):
         """Verify a stored password against one provided by user"""
-        return stored_hash == self.hash_password(provided_password)
+        try:
+            if stored_hash.startswith('scrypt$'):
+                _, n, r, p, salt, key = stored_hash.split('$')
+                computed = self.scrypt(provided_password, bytes.fromhex(salt), int(n), int(r), int(p))
+                return hmac.compare_digest(computed.hex(), key)
+            if stored_hash.startswith('pbkdf2_sha256$'):
+                _, iterations, salt, key = stored_hash.split('$')
+                computed = hashlib.pbkdf2_hmac('sha256', provided_password.encode(), bytes.fromhex(salt),
+                                               int(iterations))
+                return hmac.compare_digest(computed.hex(), key)
+        except ValueError:
+            return False
+        # Legacy unsalted SHA-256
+        return hmac.compare_digest(stored_hash, hashlib.sha256(provided_password.encode()).hexdigest())
+
+    def needs_rehash(self, stored_hash):
+        """True for legacy hashes and hashes made with other work factors than the current ones"""
+        if hasattr(hashlib, 'scrypt'):
+            return not stored_hash.startswith(f"scrypt${self.kdf_n}${self.KDF_R}${self.KDF_P}$")
+        return not stored_hash.startswith(f"pbkdf2_sha256${self.pbkdf2_iterations}$")
+
+    def set_setting(self, key, value):
+        conn = sqlite3.connect(self.db_name)
+        cursor = conn.cursor()
+        cursor.execute('INSERT OR REPLACE INTO app_settings (key, value) VALUES (?, ?)', (key, str(value)))
+        conn.commit()
+        conn.close()
 
     def create_user(self, username, password, email, full_name, user_type):
         """Create a new user in the database"""
@@ -120,25 +409,83 @@ class DatabaseManager:
             raise ValueError(f"Error creating user: {str(e)}")
 
     def authenticate_user(self, username, password, user_type):
-        """Authenticate a user"""
+        """Authenticate a user, upgrading a legacy or outdated password hash on success"""
         conn = sqlite3.connect(self.db_name)
         cursor = conn.cursor()
 
+        try:
+            cursor.execute('''
+                SELECT username, password_hash, user_type FROM users 
+                WHERE username = ? AND user_type = ?
+            ''', (username, user_type))
+
+            result = cursor.fetchone()
+            if not result:
+                return False
+            stored_username, stored_hash, stored_type = result
+            if not self.verify_password(stored_hash, password):
+                return False
+
+            # Update last login timestamp (and the hash) on the same connection
+            if self.needs_rehash(stored_hash):
+                cursor.execute('''
+                    UPDATE users SET password_hash = ?, last_login = CURRENT_TIMESTAMP WHERE username = ?
+                ''', (self.hash_password(password), username))
+            else:
+                cursor.execute('UPDATE users SET last_login = CURRENT_TIMESTAMP WHERE username = ?', (username,))
+            conn.commit()
+            return True
+        finally:
+            conn.close()
+
+    # Session methods
+    def create_session(self, username, user_type):
+        """Start a session after a full password check and return its token.
+
+        Only a hash of the token is stored; nothing in the session is derived
+        from the password.
+        """
+        token = secrets.token_urlsafe(32)
+        conn = sqlite3.connect(self.db_name)
+        cursor = conn.cursor()
+        cursor.execute('DELETE FROM sessions WHERE username = ? OR expires < ?', (username, time.time()))
         cursor.execute('''
-            SELECT username, password_hash, user_type FROM users 
-            WHERE username = ? AND user_type = ?
-        ''', (username, user_type))
+            INSERT INTO sessions (token_hash, username, user_type, expires) VALUES (?, ?, ?, ?)
+        ''', (hashlib.sha256(token.encode()).hexdigest(), username, user_type, time.time() + self.SESSION_LIFETIME))
+        conn.commit()
+        conn.close()
+        return token
 
-        result = cursor.fetchone()
+    def resume_session(self, token):
+        """Return (username, user_type) for a live session token, else None; updates last_login"""
+        conn = sqlite3.connect(self.db_name)
+        cursor = conn.cursor()
+        try:
+            cursor.execute('''
+                SELECT s.username, s.user_type FROM sessions s JOIN users u ON u.username = s.username
+                WHERE s.token_hash = ? AND u.user_type = s.user_type AND s.expires > ?
+            ''', (hashlib.sha256(token.encode()).hexdigest(), time.time()))
+            result = cursor.fetchone()
+            if not result:
+                return None
+            cursor.execute('UPDATE users SET last_login = CURRENT_TIMESTAMP WHERE username = ?', (result[0],))
+            conn.commit()
+            return result
+        finally:
+            conn.close()
+
+    def end_session(self, token):
+        conn = sqlite3.connect(self.db_name)
+        cursor = conn.cursor()
+        cursor.execute('DELETE FROM sessions WHERE token_hash = ?', (hashlib.sha256(token.encode()).hexdigest(),))
+        conn.commit()
         conn.close()
 
-        if result:
-            stored_username, stored_hash, stored_type = result
-            if self.verify_password(stored_hash, password):
-                # Update last login timestamp
-                self.update_last_login(username)
-                return True
-        return False
+    def login(self, username, password, user_type):
+        """Return a new session token if the credentials are valid, else None"""
+        if self.authenticate_user(username, password, user_type):
+            return self.create_session(username, user_type)
+        return None
 
     def update_last_login(self, username):
         """Update the last login timestamp for a user"""
@@ -251,6 +598,26 @@ class DatabaseManager:
             conn.close()
             raise ValueError(f"Error adding lesson: {str(e)}")
 
+    def add_uploaded_lessons_batch(self, lessons):
+        """Insert many lessons in one transaction. Each lesson is a tuple in add_uploaded_lesson's
+        argument order: (filename, original_name, file_path, file_size, file_type, title, description,
+        category, uploaded_by, duration, thumbnail_path)."""
+        conn = sqlite3.connect(self.db_name)
+        cursor = conn.cursor()
+        try:
+            cursor.executemany('''
+                INSERT INTO uploaded_lessons
+                (filename, original_name, file_path, file_size, file_type, title, description, category, uploaded_by, duration, thumbnail_path)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', lessons)
+            conn.commit()
+            return cursor.rowcount
+        except Exception as e:
+            conn.rollback()
+            raise ValueError(f"Error adding lessons: {str(e)}")
+        finally:
+            conn.close()
+
     def get_uploaded_lessons(self, category=None, uploaded_by=None):
         """Get uploaded lessons with optional filtering"""
         conn = sqlite3.connect(self.db_name)
@@ -309,6 +676,18 @@ class DatabaseManager:
         conn.commit()
         conn.close()
 
+    def increment_views_batch(self, view_counts):
+        """Apply several deferred view increments ({lesson_id: count}) in one transaction"""
+        if not view_counts:
+            return
+        conn = sqlite3.connect(self.db_name)
+        cursor = conn.cursor()
+        cursor.executemany('''
+            UPDATE uploaded_lessons SET views = views + ? WHERE id = ?
+        ''', [(count, lesson_id) for lesson_id, count in view_counts.items()])
+        conn.commit()
+        conn.close()
+
     def delete_uploaded_lesson(self, lesson_id):
         """Delete an uploaded lesson"""
         conn = sqlite3.connect(self.db_name)
@@ -318,34 +697,1497 @@ class DatabaseManager:
         cursor.execute('SELECT file_path, thumbnail_path FROM uploaded_lessons WHERE id = ?', (lesson_id,))
         result = cursor.fetchone()
 
-        if result:
-            file_path, thumbnail_path = result
-            # Delete the database record
-            cursor.execute('DELETE FROM uploaded_lessons WHERE id = ?', (lesson_id,))
-            conn.commit()
-            conn.close()
+        if result:
+            file_path, thumbnail_path = result
+            # Delete the database record
+            cursor.execute('DELETE FROM uploaded_lessons WHERE id = ?', (lesson_id,))
+            conn.commit()
+            conn.close()
+
+            # Drop the file's blob reference; the blob itself goes once nothing links to it
+            unreferenced = self.release_blob_ref(file_path)
+
+            # Delete the actual files
+            try:
+                if os.path.exists(file_path):
+                    os.remove(file_path)
+                if thumbnail_path and os.path.exists(thumbnail_path):
+                    os.remove(thumbnail_path)
+                if unreferenced and os.path.exists(blob_path(unreferenced)):
+                    os.remove(blob_path(unreferenced))
+            except Exception as e:
+                print(f"Error deleting files: {e}")
+
+            return True
+        conn.close()
+        return False
+
+    def get_lesson_categories(self):
+        """Get all unique categories from uploaded lessons"""
+        conn = sqlite3.connect(self.db_name)
+        cursor = conn.cursor()
+        cursor.execute('SELECT DISTINCT category FROM uploaded_lessons ORDER BY category')
+        categories = [row[0] for row in cursor.fetchall()]
+        conn.close()
+        return categories
+
+    # Library index methods
+    def get_library_files(self):
+        """Get all indexed filesystem videos, newest first"""
+        conn = sqlite3.connect(self.db_name)
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT file_path, title, type, source, file_size, mtime, upload_date
+            FROM library_files ORDER BY mtime DESC
+        ''')
+        videos = []
+        for row in cursor.fetchall():
+            videos.append({
+                'file_path': row[0],
+                'title': row[1],
+                'type': row[2],
+                'source': row[3],
+                'uploaded_by': 'System',
+                'file_size': row[4],
+                'mtime': row[5],
+                'upload_date': row[6]
+            })
+        conn.close()
+        return videos
+
+    def get_library_folder_mtime(self, folder):
+        """Get the directory mtime stored at the last scan of a folder, or None"""
+        conn = sqlite3.connect(self.db_name)
+        cursor = conn.cursor()
+        cursor.execute('SELECT mtime_ns FROM library_folders WHERE folder = ?', (folder,))
+        result = cursor.fetchone()
+        conn.close()
+        return result[0] if result else None
+
+    def get_library_folder_files(self, folder):
+        """Get {file_path: (size, mtime)} for the indexed files of a folder"""
+        conn = sqlite3.connect(self.db_name)
+        cursor = conn.cursor()
+        cursor.execute('SELECT file_path, file_size, mtime FROM library_files WHERE folder = ?', (folder,))
+        files = {row[0]: (row[1], row[2]) for row in cursor.fetchall()}
+        conn.close()
+        return files
+
+    def update_library_folder(self, folder, mtime_ns, upserts, removed_paths):
+        """Apply one folder rescan (changed rows and removed paths) in a single transaction"""
+        conn = sqlite3.connect(self.db_name)
+        cursor = conn.cursor()
+        try:
+            cursor.executemany('DELETE FROM library_files WHERE file_path = ?',
+                               [(path,) for path in removed_paths])
+            # Upsert (not REPLACE) so rowids stay stable for the search index
+            cursor.executemany('''
+                INSERT INTO library_files
+                (file_path, folder, title, type, source, file_size, mtime, upload_date)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(file_path) DO UPDATE SET
+                    title = excluded.title, type = excluded.type, source = excluded.source,
+                    file_size = excluded.file_size, mtime = excluded.mtime, upload_date = excluded.upload_date
+            ''', upserts)
+            cursor.execute('''
+                INSERT OR REPLACE INTO library_folders (folder, mtime_ns, scanned_date)
+                VALUES (?, ?, CURRENT_TIMESTAMP)
+            ''', (folder, mtime_ns))
+            conn.commit()
+        finally:
+            conn.close()
+
+    # Lesson search methods
+    SEARCH_ORDER = {
+        "Newest": "upload_date DESC",
+        "Oldest": "upload_date ASC",
+        "Title A-Z": "title COLLATE NOCASE ASC",
+        "Title Z-A": "title COLLATE NOCASE DESC",
+        "Most Views": "views DESC, upload_date DESC",
+        "Relevance": "rank ASC, upload_date DESC",
+    }
+
+    @staticmethod
+    def build_search_query(search_term):
+        """Turn free text into an FTS5 prefix query, e.g. 'hel wor' -> '"hel"* "wor"*'"""
+        tokens = re.findall(r'\w+', search_term.lower())
+        return " ".join(f'"{token}"*' for token in tokens)
+
+    def search_lessons(self, search_term="", category="All", sort_by="Newest"):
+        """Search uploaded lessons and library files, filtered and sorted in SQL.
+
+        Returns the matching file paths in display order, or None if full-text
+        search is unavailable.
+        """
+        if not self.fts_enabled:
+            return None
+
+        match = self.build_search_query(search_term)
+        if match:
+            source = '''
+                SELECT u.file_path, u.title, u.category, u.upload_date, u.views, s.rank
+                FROM lesson_search s JOIN uploaded_lessons u ON u.id = s.rowid
+                WHERE lesson_search MATCH :match
+                UNION ALL
+                SELECT l.file_path, l.title, 'General', l.upload_date, 0, s.rank
+                FROM lesson_search s JOIN library_files l ON l.rowid = -s.rowid
+                WHERE lesson_search MATCH :match
+            '''
+        else:
+            source = '''
+                SELECT file_path, title, category, upload_date, views, 0 AS rank FROM uploaded_lessons
+                UNION ALL
+                SELECT file_path, title, 'General', upload_date, 0, 0 FROM library_files
+            '''
+
+        query = f'''
+            SELECT file_path FROM ({source})
+            WHERE :category = 'All' OR category = :category
+            ORDER BY {self.SEARCH_ORDER.get(sort_by, self.SEARCH_ORDER["Newest"])}
+        '''
+
+        conn = sqlite3.connect(self.db_name)
+        cursor = conn.cursor()
+        try:
+            cursor.execute(query, {'match': match, 'category': category})
+            return [row[0] for row in cursor.fetchall()]
+        finally:
+            conn.close()
+
+    # Seek index methods
+    def get_seek_index(self, file_path, file_size, mtime):
+        """Get cached keyframes and preview JPEGs for a video, or None if missing or stale"""
+        conn = sqlite3.connect(self.db_name)
+        cursor = conn.cursor()
+        cursor.execute('SELECT file_size, mtime, keyframes FROM video_keyframes WHERE file_path = ?',
+                       (file_path,))
+        result = cursor.fetchone()
+        if not result or (result[0], result[1]) != (file_size, mtime):
+            conn.close()
+            return None
+        cursor.execute('SELECT frame_number, image FROM video_previews WHERE file_path = ? ORDER BY frame_number',
+                       (file_path,))
+        previews = [(row[0], row[1]) for row in cursor.fetchall()]
+        conn.close()
+        return json.loads(result[2]), previews
+
+    def save_seek_index(self, file_path, file_size, mtime, keyframes, previews):
+        """Replace the cached keyframes and previews for a video"""
+        conn = sqlite3.connect(self.db_name)
+        cursor = conn.cursor()
+        try:
+            cursor.execute('DELETE FROM video_previews WHERE file_path = ?', (file_path,))
+            cursor.execute('''
+                INSERT OR REPLACE INTO video_keyframes (file_path, file_size, mtime, keyframes)
+                VALUES (?, ?, ?, ?)
+            ''', (file_path, file_size, mtime, json.dumps(keyframes)))
+            cursor.executemany('''
+                INSERT INTO video_previews (file_path, frame_number, image) VALUES (?, ?, ?)
+            ''', [(file_path, frame_number, sqlite3.Binary(image)) for frame_number, image in previews])
+            conn.commit()
+        finally:
+            conn.close()
+
+    # Video metadata cache methods
+    def get_all_video_metadata(self):
+        """Get every cached video metadata entry keyed by file path"""
+        conn = sqlite3.connect(self.db_name)
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT file_path, file_size, mtime, fps, frame_count, duration, width, height, codec
+            FROM video_metadata
+        ''')
+        metadata = {}
+        for row in cursor.fetchall():
+            metadata[row[0]] = {
+                'file_path': row[0],
+                'file_size': row[1],
+                'mtime': row[2],
+                'fps': row[3],
+                'frame_count': row[4],
+                'duration': row[5],
+                'width': row[6],
+                'height': row[7],
+                'codec': row[8]
+            }
+        conn.close()
+        return metadata
+
+    def save_video_metadata(self, metadata):
+        """Insert or replace the cached metadata for a video file"""
+        conn = sqlite3.connect(self.db_name)
+        cursor = conn.cursor()
+        cursor.execute('''
+            INSERT OR REPLACE INTO video_metadata
+            (file_path, file_size, mtime, fps, frame_count, duration, width, height, codec)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (metadata['file_path'], metadata['file_size'], metadata['mtime'], metadata['fps'],
+              metadata['frame_count'], metadata['duration'], metadata['width'], metadata['height'],
+              metadata['codec']))
+        conn.commit()
+        conn.close()
+
+    def delete_video_metadata(self, file_path):
+        """Remove the cached metadata for a video file"""
+        conn = sqlite3.connect(self.db_name)
+        cursor = conn.cursor()
+        cursor.execute('DELETE FROM video_metadata WHERE file_path = ?', (file_path,))
+        conn.commit()
+        conn.close()
+
+    # Blob store methods
+    def get_blob(self, digest):
+        """Get (size, refcount) for a stored blob, or None"""
+        conn = sqlite3.connect(self.db_name)
+        cursor = conn.cursor()
+        cursor.execute('SELECT size, refcount FROM blobs WHERE hash = ?', (digest,))
+        result = cursor.fetchone()
+        conn.close()
+        return result
+
+    def add_blob_ref(self, file_path, digest, size):
+        """Record that file_path holds the content of blob digest and bump its reference count"""
+        conn = sqlite3.connect(self.db_name)
+        cursor = conn.cursor()
+        try:
+            cursor.execute('SELECT hash FROM blob_refs WHERE file_path = ?', (file_path,))
+            previous = cursor.fetchone()
+            if previous and previous[0] == digest:
+                return
+            if previous:
+                cursor.execute('UPDATE blobs SET refcount = refcount - 1 WHERE hash = ?', (previous[0],))
+            cursor.execute('INSERT OR IGNORE INTO blobs (hash, size) VALUES (?, ?)', (digest, size))
+            cursor.execute('UPDATE blobs SET refcount = refcount + 1 WHERE hash = ?', (digest,))
+            cursor.execute('INSERT OR REPLACE INTO blob_refs (file_path, hash) VALUES (?, ?)', (file_path, digest))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def release_blob_ref(self, file_path):
+        """Drop the reference held by file_path. Returns the blob hash if it is now unreferenced."""
+        conn = sqlite3.connect(self.db_name)
+        cursor = conn.cursor()
+        try:
+            cursor.execute('SELECT hash FROM blob_refs WHERE file_path = ?', (file_path,))
+            result = cursor.fetchone()
+            if not result:
+                return None
+            digest = result[0]
+            cursor.execute('DELETE FROM blob_refs WHERE file_path = ?', (file_path,))
+            cursor.execute('UPDATE blobs SET refcount = refcount - 1 WHERE hash = ?', (digest,))
+            cursor.execute('DELETE FROM blobs WHERE hash = ? AND refcount <= 0', (digest,))
+            freed = cursor.rowcount > 0
+            conn.commit()
+            return digest if freed else None
+        finally:
+            conn.close()
+
+    # Transcode job queue methods
+    def add_transcode_job(self, source_path):
+        """Queue a video for transcoding; an existing job for the file is reset to pending"""
+        conn = sqlite3.connect(self.db_name)
+        cursor = conn.cursor()
+        cursor.execute('''
+            INSERT INTO transcode_jobs (source_path, status, updated_date)
+            VALUES (?, 'pending', CURRENT_TIMESTAMP)
+            ON CONFLICT(source_path) DO UPDATE SET
+                status = 'pending', attempts = 0, error = NULL, updated_date = CURRENT_TIMESTAMP
+        ''', (source_path,))
+        conn.commit()
+        conn.close()
+
+    def claim_transcode_job(self):
+        """Atomically mark the oldest pending job as running and return (id, source_path, attempts)"""
+        conn = sqlite3.connect(self.db_name, isolation_level=None)
+        cursor = conn.cursor()
+        try:
+            # BEGIN IMMEDIATE takes the write lock so two workers never claim the same job
+            cursor.execute('BEGIN IMMEDIATE')
+            cursor.execute('''
+                SELECT id, source_path, attempts FROM transcode_jobs
+                WHERE status = 'pending' ORDER BY id LIMIT 1
+            ''')
+            job = cursor.fetchone()
+            if job:
+                cursor.execute('''
+                    UPDATE transcode_jobs SET status = 'running', attempts = attempts + 1,
+                    updated_date = CURRENT_TIMESTAMP WHERE id = ?
+                ''', (job[0],))
+            cursor.execute('COMMIT')
+            return (job[0], job[1], job[2] + 1) if job else None
+        except Exception:
+            cursor.execute('ROLLBACK')
+            raise
+        finally:
+            conn.close()
+
+    def complete_transcode_job(self, job_id, rendition_path, preview_path):
+        conn = sqlite3.connect(self.db_name)
+        cursor = conn.cursor()
+        cursor.execute('''
+            UPDATE transcode_jobs SET status = 'done', rendition_path = ?, preview_path = ?, error = NULL,
+            updated_date = CURRENT_TIMESTAMP WHERE id = ?
+        ''', (rendition_path, preview_path, job_id))
+        conn.commit()
+        conn.close()
+
+    def fail_transcode_job(self, job_id, error, retry):
+        """Record a failed attempt; the job goes back to pending when retry is True"""
+        conn = sqlite3.connect(self.db_name)
+        cursor = conn.cursor()
+        cursor.execute('''
+            UPDATE transcode_jobs SET status = ?, error = ?, updated_date = CURRENT_TIMESTAMP WHERE id = ?
+        ''', ('pending' if retry else 'failed', error, job_id))
+        conn.commit()
+        conn.close()
+
+    def reset_running_transcode_jobs(self):
+        """Requeue jobs that were interrupted by a shutdown or crash"""
+        conn = sqlite3.connect(self.db_name)
+        cursor = conn.cursor()
+        cursor.execute("UPDATE transcode_jobs SET status = 'pending' WHERE status = 'running'")
+        conn.commit()
+        conn.close()
+
+    def get_completed_transcodes(self):
+        """Get {source_path: (rendition_path, preview_path)} for finished jobs"""
+        conn = sqlite3.connect(self.db_name)
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT source_path, rendition_path, preview_path FROM transcode_jobs WHERE status = 'done'
+        ''')
+        renditions = {row[0]: (row[1], row[2]) for row in cursor.fetchall()}
+        conn.close()
+        return renditions
+
+
+def blob_path(digest, root=BLOB_ROOT):
+    return os.path.join(root, digest[:2], digest)
+
+
+def unique_path(folder, stem, ext):
+    """Return folder/stem+ext, adding a numeric suffix if that name is taken"""
+    path = os.path.join(folder, f"{stem}{ext}")
+    counter = 2
+    while os.path.exists(path):
+        path = os.path.join(folder, f"{stem}_{counter}{ext}")
+        counter += 1
+    return path
+
+
+class BlobStore:
+    """Content-addressed store for imported videos.
+
+    Each distinct file content is kept once under root/<aa>/<sha256>; the
+    files shown in library folders are hardlinks to it (copies where the
+    filesystem cannot link), and blob_refs counts them so a blob is deleted
+    only when its last file goes.
+
+    Sources on another filesystem are copied in large chunks while hashing,
+    with progress and cancellation through the Task. The partial file and a
+    checkpoint (offset and SHA-256 of the prefix) are kept in root/tmp, so a
+    cancelled or interrupted import of the same source resumes from the last
+    checkpoint; the finished copy is read back and verified against the hash
+    of the source stream. Sources on the same filesystem are only hashed: a
+    known blob needs no copy at all and a new one is reflinked where the
+    filesystem supports it.
+    """
+
+    chunk_size = 8 << 20
+    checkpoint_interval = 64 << 20
+    stale_age = 7 * 24 * 3600  # partial copies older than this are discarded
+    FICLONE = 0x40049409  # Linux ioctl: share extents between two files
+
+    def __init__(self, db, root=BLOB_ROOT):
+        self.db = db
+        self.root = root
+        self.temp_dir = os.path.join(root, "tmp")
+        os.makedirs(self.temp_dir, exist_ok=True)
+        self.remove_stale_partials()
+
+    def store(self, source_path, task=None):
+        """Add a file's content to the store; returns (digest, size)"""
+        if os.stat(source_path).st_dev == os.stat(self.root).st_dev:
+            digest = self.hash_file(source_path, task, "Checking").hexdigest()
+            if not os.path.exists(blob_path(digest, self.root)):
+                temp_path = self.temp_path()
+                if not self.clone_file(source_path, temp_path):
+                    # No reflink: fall back to the chunked copy for progress, cancel and resume
+                    temp_path, digest = self.copy_and_hash(source_path, task)
+                self.commit_blob(temp_path, digest)
+        else:
+            temp_path, digest = self.copy_and_hash(source_path, task)
+            self.commit_blob(temp_path, digest)
+        return digest, os.path.getsize(blob_path(digest, self.root))
+
+    def link(self, digest, size, dest_path):
+        """Expose a stored blob at dest_path and count the reference"""
+        os.makedirs(os.path.dirname(dest_path) or ".", exist_ok=True)
+        source = blob_path(digest, self.root)
+        try:
+            os.link(source, dest_path)
+        except OSError as e:
+            # Copy only when the filesystem cannot hardlink; FileExistsError and the rest are real errors
+            if e.errno not in LINK_UNSUPPORTED_ERRNOS:
+                raise
+            # 'xb' claims the name like os.link does, so an existing file is never overwritten
+            with open(source, 'rb') as src, open(dest_path, 'xb') as dst:
+                shutil.copyfileobj(src, dst, self.chunk_size)
+        self.db.add_blob_ref(dest_path, digest, size)
+        return dest_path
+
+    def link_new(self, digest, size, folder, stem, ext):
+        """Link a stored blob into folder under a name no other file has; returns the path.
+
+        unique_path only checks the name, so the link itself claims it: if another
+        import takes the same name in between, the link fails and the next name is tried.
+        """
+        while True:
+            try:
+                return self.link(digest, size, unique_path(folder, stem, ext))
+            except FileExistsError:
+                continue
+
+    def release(self, file_path):
+        """Remove a linked file and free its blob once unreferenced"""
+        digest = self.db.release_blob_ref(file_path)
+        if os.path.exists(file_path):
+            os.remove(file_path)
+        if digest and os.path.exists(blob_path(digest, self.root)):
+            os.remove(blob_path(digest, self.root))
+
+    def temp_path(self):
+        return os.path.join(self.temp_dir, f"{os.getpid()}_{threading.get_ident()}_{time.time_ns()}.part")
+
+    def partial_path(self, source_path):
+        """Stable temp name per source, so an interrupted copy can be found again"""
+        key = hashlib.sha1(os.path.abspath(source_path).encode("utf-8")).hexdigest()
+        return os.path.join(self.temp_dir, f"import_{key}.part")
+
+    def remove_stale_partials(self):
+        cutoff = time.time() - self.stale_age
+        try:
+            with os.scandir(self.temp_dir) as entries:
+                for entry in entries:
+                    if entry.stat().st_mtime < cutoff:
+                        os.remove(entry.path)
+        except OSError as e:
+            print(f"Error cleaning blob temp folder: {e}")
+
+    def hash_file(self, path, task=None, phase="Hashing", limit=None):
+        """SHA-256 of a file (or of its first limit bytes), reporting (phase, done, total) progress"""
+        digest = hashlib.sha256()
+        total = os.path.getsize(path) if limit is None else limit
+        done = 0
+        buffer = bytearray(self.chunk_size)
+        view = memoryview(buffer)
+        with open(path, 'rb', buffering=0) as f:
+            while done < total:
+                if task:
+                    task.check_cancelled()
+                n = f.readinto(view[:min(self.chunk_size, total - done)])
+                if not n:
+                    break
+                digest.update(view[:n])
+                done += n
+                if task:
+                    task.report_progress(phase, done, total)
+        return digest
+
+    def load_checkpoint(self, source_path, partial_path, signature):
+        """Return (offset, digest) to resume from, or (0, fresh digest) when there is nothing valid"""
+        try:
+            with open(partial_path + ".json") as f:
+                state = json.load(f)
+            offset = state['offset']
+            if (state['size'], state['mtime']) != signature or os.path.getsize(partial_path) < offset:
+                raise ValueError("source changed")
+            # Drop anything written after the checkpoint and check the prefix is intact
+            with open(partial_path, 'r+b') as f:
+                f.truncate(offset)
+            digest = self.hash_file(partial_path, phase="Resuming", limit=offset)
+            if digest.hexdigest() != state['prefix_sha256']:
+                raise ValueError("partial copy is corrupt")
+            return offset, digest
+        except (OSError, ValueError, KeyError):
+            return 0, hashlib.sha256()
+
+    def save_checkpoint(self, partial_path, signature, offset, digest):
+        state = {'size': signature[0], 'mtime': signature[1], 'offset': offset,
+                 'prefix_sha256': digest.hexdigest()}
+        with open(partial_path + ".json.tmp", 'w') as f:
+            json.dump(state, f)
+        os.replace(partial_path + ".json.tmp", partial_path + ".json")
+
+    def copy_and_hash(self, source_path, task=None):
+        """Chunked, resumable copy into a temp file; returns (temp_path, digest) once verified"""
+        st = os.stat(source_path)
+        signature = (st.st_size, st.st_mtime)
+        total = st.st_size
+        partial_path = self.partial_path(source_path)
+        offset, digest = self.load_checkpoint(source_path, partial_path, signature)
+
+        buffer = bytearray(self.chunk_size)
+        view = memoryview(buffer)
+        done = offset
+        next_checkpoint = done + self.checkpoint_interval
+        with open(source_path, 'rb', buffering=0) as src, open(partial_path, 'r+b' if offset else 'wb') as dst:
+            src.seek(offset)
+            dst.seek(offset)
+            while True:
+                if task:
+                    # Cancelling keeps the partial file and checkpoint for the next attempt
+                    task.check_cancelled()
+                n = src.readinto(view)
+                if not n:
+                    break
+                digest.update(view[:n])
+                dst.write(view[:n])
+                done += n
+                if done >= next_checkpoint:
+                    dst.flush()
+                    os.fsync(dst.fileno())
+                    self.save_checkpoint(partial_path, signature, done, digest)
+                    next_checkpoint = done + self.checkpoint_interval
+                if task:
+                    task.report_progress("Copying", done, total)
+            dst.flush()
+            os.fsync(dst.fileno())
+
+        # Read the copy back and compare with the hash of what was read from the source
+        if self.hash_file(partial_path, task, "Verifying").hexdigest() != digest.hexdigest():
+            self.discard_partial(partial_path)
+            raise IOError(f"Checksum mismatch while copying {source_path}")
+        if os.path.exists(partial_path + ".json"):
+            os.remove(partial_path + ".json")
+        return partial_path, digest.hexdigest()
+
+    def store_stream(self, stream, task=None):
+        """Add the content of an open binary stream (e.g. a zip member); returns (digest, size)"""
+        temp_path = self.temp_path()
+        digest = hashlib.sha256()
+        try:
+            with open(temp_path, 'wb') as dst:
+                for chunk in iter(lambda: stream.read(self.chunk_size), b''):
+                    if task:
+                        task.check_cancelled()
+                    digest.update(chunk)
+                    dst.write(chunk)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        self.commit_blob(temp_path, digest.hexdigest())
+        return digest.hexdigest(), os.path.getsize(blob_path(digest.hexdigest(), self.root))
+
+    def discard_partial(self, partial_path):
+        for path in (partial_path, partial_path + ".json"):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def clone_file(self, source_path, dest_path):
+        """Reflink source to dest where supported; returns False (leaving no dest) otherwise"""
+        if fcntl is None:
+            return False
+        try:
+            with open(source_path, 'rb') as src, open(dest_path, 'wb') as dst:
+                fcntl.ioctl(dst.fileno(), self.FICLONE, src.fileno())
+            return True
+        except OSError:
+            if os.path.exists(dest_path):
+                os.remove(dest_path)
+            return False
+
+    def commit_blob(self, temp_path, digest):
+        """Move a finished temp file into place, or drop it if the content is already stored"""
+        final_path = blob_path(digest, self.root)
+        if os.path.exists(final_path):
+            os.remove(temp_path)
+            return
+        os.makedirs(os.path.dirname(final_path), exist_ok=True)
+        os.replace(temp_path, final_path)
+
+
+class ImportFileTask:
+    """Per-file view of a bulk import's Task.
+
+    Shares the import's cancellation and turns the blob store's
+    (phase, done, total) byte progress into the import's
+    (files done, files total, detail) progress.
+    """
+
+    def __init__(self, task, importer, name):
+        self.task = task
+        self.importer = importer
+        self.name = name
+
+    @property
+    def cancelled(self):
+        return self.task.cancelled
+
+    def check_cancelled(self):
+        self.task.check_cancelled()
+
+    def report_progress(self, phase, done, total):
+        percent = done * 100 // total if total else 100
+        self.task.report_progress(self.importer.files_done, self.importer.files_total,
+                                  f"{phase} {self.name}: {percent}%")
+
+
+class BulkImporter:
+    """Imports every video in a folder or zip archive as uploaded lessons.
+
+    Files are stored in the blob store and probed in parallel on a private
+    thread pool; all rows are inserted afterwards in one executemany
+    transaction. Titles are derived from file names like the upload dialog
+    does. run() returns a report with throughput figures.
+    """
+
+    def __init__(self, db, blobs, metadata, workers=4, uploads_dir="uploaded_lessons"):
+        self.db = db
+        self.blobs = blobs
+        self.metadata = metadata
+        self.workers = workers
+        self.uploads_dir = uploads_dir
+        self.files_done = 0
+        self.files_total = 0
+
+    @staticmethod
+    def find_videos(source):
+        """List importable entries: file paths for a folder, member names for a zip"""
+        if zipfile.is_zipfile(source):
+            with zipfile.ZipFile(source) as archive:
+                return [info.filename for info in archive.infolist()
+                        if not info.is_dir() and info.filename.lower().endswith(VIDEO_EXTENSIONS)]
+        videos = []
+        for folder, _, files in os.walk(source):
+            videos.extend(os.path.join(folder, name) for name in sorted(files)
+                          if name.lower().endswith(VIDEO_EXTENSIONS))
+        return videos
+
+    def run(self, task, source, uploaded_by, category="General"):
+        entries = self.find_videos(source)
+        archive = source if zipfile.is_zipfile(source) else None
+        os.makedirs(self.uploads_dir, exist_ok=True)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.files_done, self.files_total = 0, len(entries)
+
+        start = time.perf_counter()
+        rows, failures = [], []
+        total_bytes = 0
+        cancelled = False
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="asl-import") as pool:
+            futures = {pool.submit(self.import_one, entry, archive, timestamp, uploaded_by, category, task): entry
+                       for entry in entries}
+            for future in concurrent.futures.as_completed(futures):
+                try:
+                    row = future.result()
+                    rows.append(row)
+                    total_bytes += row[3]
+                except TaskCancelled:
+                    cancelled = True
+                except Exception as e:
+                    failures.append((futures[future], str(e)))
+                self.files_done += 1
+                if task and not cancelled:
+                    task.report_progress(self.files_done, self.files_total)
+
+        try:
+            if cancelled or (task and task.cancelled):
+                raise TaskCancelled()
+            if rows:
+                self.db.add_uploaded_lessons_batch(rows)
+        except BaseException:
+            # Nothing was inserted; unlink the stored files so no unreferenced copies stay behind
+            for row in rows:
+                self.blobs.release(row[2])
+            raise
+        elapsed = max(time.perf_counter() - start, 1e-6)
+        return {
+            'imported': len(rows),
+            'failed': failures,
+            'bytes': total_bytes,
+            'seconds': elapsed,
+            'files_per_sec': len(rows) / elapsed,
+            'mb_per_sec': total_bytes / (1 << 20) / elapsed,
+        }
+
+    def import_one(self, entry, archive, timestamp, uploaded_by, category, task):
+        """Store, link and probe one video (runs on an import worker); returns its lesson row"""
+        original_name = os.path.basename(entry)
+        file_task = None
+        if task:
+            task.check_cancelled()
+            file_task = ImportFileTask(task, self, original_name)
+        if archive:
+            with zipfile.ZipFile(archive) as zf, zf.open(entry) as stream:
+                digest, size = self.blobs.store_stream(stream, file_task)
+        else:
+            digest, size = self.blobs.store(entry, file_task)
+
+        file_ext = os.path.splitext(original_name)[1]
+        new_filepath = self.blobs.link_new(digest, size, self.uploads_dir, f"lesson_{timestamp}_{digest[:8]}", file_ext)
+
+        metadata = self.metadata.lookup(new_filepath)
+        duration = int(metadata['duration']) if metadata else 0
+        return (os.path.basename(new_filepath), original_name, new_filepath, size, file_ext[1:].upper(),
+                title_from_filename(original_name, [('-', ' ')]), "", category, uploaded_by, duration, None)
+
+    @staticmethod
+    def format_report(report):
+        text = (f"Imported {report['imported']} videos ({report['bytes'] / (1 << 20):.1f} MB) "
+                f"in {report['seconds']:.1f}s: {report['files_per_sec']:.1f} files/sec, "
+                f"{report['mb_per_sec']:.1f} MB/sec")
+        if report['failed']:
+            text += f"\n{len(report['failed'])} failed:\n" + "\n".join(
+                f"  {os.path.basename(entry)}: {error}" for entry, error in report['failed'][:10])
+        return text
+
+
+def load_session_token():
+    try:
+        with open(SESSION_FILE) as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+
+def save_session_token(token):
+    """Write the session token to the per-user config directory, readable only by the current user"""
+    try:
+        os.makedirs(CONFIG_DIR, mode=0o700, exist_ok=True)
+        fd = os.open(SESSION_FILE, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w') as f:
+            f.write(token)
+        os.chmod(SESSION_FILE, 0o600)
+    except OSError as e:
+        print(f"Error saving session: {e}")
+
+
+def clear_session_token():
+    try:
+        os.remove(SESSION_FILE)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        print(f"Error clearing session: {e}")
+
+
+def benchmark_kdf(target_ms=250.0, apply=False, rounds=3):
+    """Time password hashing at increasing work factors and pick the largest within target_ms"""
+    db = DatabaseManager()
+    if hasattr(hashlib, 'scrypt'):
+        setting, candidates = 'kdf_n', [2 ** exp for exp in range(12, 21)]
+        label, hash_kwargs = "scrypt n", lambda value: {'kdf_n': value}
+    else:
+        setting, candidates = 'pbkdf2_iterations', [100000 * 2 ** i for i in range(0, 7)]
+        label, hash_kwargs = "pbkdf2 iterations", lambda value: {'pbkdf2_iterations': value}
+
+    chosen = candidates[0]
+    print(f"{label:>18}  login time (target {target_ms:.0f} ms)")
+    for value in candidates:
+        start = time.perf_counter()
+        for _ in range(rounds):
+            db.hash_password("benchmark-password", **hash_kwargs(value))
+        elapsed_ms = (time.perf_counter() - start) * 1000 / rounds
+        print(f"{value:>18}  {elapsed_ms:8.1f} ms")
+        if elapsed_ms > target_ms:
+            break
+        chosen = value
+
+    print(f"Recommended {setting} = {chosen} (current {getattr(db, setting)})")
+    if apply:
+        db.set_setting(setting, chosen)
+        print("Saved; existing passwords are rehashed at their next login.")
+    return chosen
+
+
+def probe_video(file_path, cap=None):
+    """Read fps, frame count, duration, resolution and codec from a video file.
+
+    An already opened capture can be passed in to avoid opening the file twice;
+    it is left open for the caller. Returns None if the file cannot be decoded.
+    """
+    own_cap = cap is None
+    if own_cap:
+        cap = cv2.VideoCapture(file_path)
+    try:
+        if not cap.isOpened():
+            return None
+        fps = cap.get(cv2.CAP_PROP_FPS) or 0.0
+        frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT) or 0)
+        fourcc = int(cap.get(cv2.CAP_PROP_FOURCC) or 0)
+        codec = "".join(chr((fourcc >> (8 * i)) & 0xFF) for i in range(4)).strip("\x00 ")
+        return {
+            'fps': fps,
+            'frame_count': frame_count,
+            'duration': frame_count / fps if fps > 0 else 0,
+            'width': int(cap.get(cv2.CAP_PROP_FRAME_WIDTH) or 0),
+            'height': int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT) or 0),
+            'codec': codec
+        }
+    finally:
+        if own_cap:
+            cap.release()
+
+
+class TaskCancelled(Exception):
+    """Raised inside a task when it notices it has been cancelled"""
+
+
+class Task:
+    """Handle for work submitted to a TaskExecutor"""
+
+    def __init__(self, executor, on_done=None, on_error=None, on_progress=None):
+        self.executor = executor
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_progress = on_progress
+        self.future = None
+        self.cancel_event = threading.Event()
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    def cancel(self):
+        """Request cancellation; queued work is dropped, running work should poll check_cancelled()"""
+        self.cancel_event.set()
+        if self.future:
+            self.future.cancel()
+
+    def check_cancelled(self):
+        if self.cancel_event.is_set():
+            raise TaskCancelled()
+
+    def report_progress(self, *args):
+        """Send progress to on_progress on the Tk thread; safe to call from the worker"""
+        if self.on_progress and not self.cancelled:
+            self.executor.call_soon(self.on_progress, *args)
+
+    def done(self):
+        return self.future is not None and self.future.done()
+
+
+class DaemonThreadPool:
+    """Minimal thread pool whose workers are daemon threads.
+
+    ThreadPoolExecutor joins its workers at interpreter exit, so a task stuck
+    in a long wait (e.g. on the ASL process) would keep the app from exiting.
+    """
+
+    def __init__(self, max_workers, thread_name_prefix="worker"):
+        self.work = queue.Queue()
+        self.threads = []
+        for i in range(max_workers):
+            thread = threading.Thread(target=self._worker, name=f"{thread_name_prefix}_{i}", daemon=True)
+            thread.start()
+            self.threads.append(thread)
+
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+        self.work.put((future, fn, args, kwargs))
+        return future
+
+    def _worker(self):
+        while True:
+            item = self.work.get()
+            if item is None:
+                return
+            future, fn, args, kwargs = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                result = fn(*args, **kwargs)
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+
+    def shutdown(self, cancel_futures=True):
+        """Stop the workers once their current task ends; does not wait for them"""
+        if cancel_futures:
+            while True:
+                try:
+                    item = self.work.get_nowait()
+                except queue.Empty:
+                    break
+                if item is not None:
+                    item[0].cancel()
+        for _ in self.threads:
+            self.work.put(None)
+
+
+class TaskExecutor:
+    """Thread pool whose results are delivered on the Tk thread.
+
+    Workers never touch Tk widgets: completions, errors, progress reports and
+    call_soon() callbacks are put on a queue that poll() drains from a
+    root.after loop.
+    """
+
+    def __init__(self, root, max_workers=4, poll_interval=30):
+        self.root = root
+        self.pool = DaemonThreadPool(max_workers=max_workers, thread_name_prefix="asl-worker")
+        self.results = queue.Queue()
+        self.poll_interval = poll_interval
+        self.running = True
+        self.root.after(self.poll_interval, self.poll)
+
+    def submit(self, fn, *args, on_done=None, on_error=None, on_progress=None, with_task=False, **kwargs):
+        """Run fn(*args, **kwargs) on a worker thread and return its Task.
+
+        With with_task=True the Task is passed as the first argument so the
+        function can report progress and check for cancellation.
+        """
+        task = Task(self, on_done, on_error, on_progress)
+        if with_task:
+            args = (task,) + args
+        task.future = self.pool.submit(fn, *args, **kwargs)
+        task.future.add_done_callback(lambda future: self.results.put(('done', task, None)))
+        return task
+
+    def call_soon(self, fn, *args):
+        """Schedule fn(*args) on the Tk thread; safe to call from any thread"""
+        self.results.put(('call', fn, args))
+
+    def poll(self):
+        if not self.running:
+            return
+        while True:
+            try:
+                kind, target, args = self.results.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                if kind == 'call':
+                    target(*args)
+                else:
+                    self._finish(target)
+            except Exception as e:
+                print(f"Error in background task callback: {e}")
+        try:
+            self.root.after(self.poll_interval, self.poll)
+        except tk.TclError:
+            # The root window was destroyed
+            self.running = False
+
+    def _finish(self, task):
+        if task.cancelled:
+            return
+        try:
+            result = task.future.result()
+        except (CancelledError, TaskCancelled):
+            return
+        except Exception as e:
+            if task.on_error:
+                task.on_error(e)
+            else:
+                print(f"Background task failed: {e}")
+            return
+        if task.on_done:
+            task.on_done(result)
+
+    def shutdown(self):
+        self.running = False
+        self.pool.shutdown(cancel_futures=True)
+
+
+class VideoMetadataIndex:
+    """Persistent cache of probed video metadata.
+
+    Each file is probed once; entries are keyed by absolute path and are
+    invalidated when the file's size or modification time changes. Files that
+    are not cached yet can be probed on the TaskExecutor, with callbacks
+    delivered on the Tk thread.
+    """
+
+    def __init__(self, db, executor=None):
+        self.db = db
+        self.executor = executor
+        self.lock = threading.Lock()
+        try:
+            self.entries = db.get_all_video_metadata()
+        except Exception as e:
+            print(f"Error loading video metadata cache: {e}")
+            self.entries = {}
+        self.callbacks = {}
+
+    @staticmethod
+    def key(file_path):
+        return os.path.normcase(os.path.abspath(file_path))
+
+    @staticmethod
+    def file_signature(file_path):
+        """Return (size, mtime) for a file, or None if it is missing"""
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            return None
+        return st.st_size, st.st_mtime
+
+    def get(self, file_path):
+        """Return cached metadata if it is still valid, without probing"""
+        signature = self.file_signature(file_path)
+        if signature is None:
+            return None
+        with self.lock:
+            entry = self.entries.get(self.key(file_path))
+        if entry and (entry['file_size'], entry['mtime']) == signature:
+            return entry
+        return None
+
+    def lookup(self, file_path, cap=None):
+        """Return metadata for a file, probing synchronously on a cache miss"""
+        entry = self.get(file_path)
+        if entry:
+            return entry
+        return self._probe_and_store(file_path, cap)
+
+    def request(self, file_path, callback=None):
+        """Return cached metadata, or start a background probe and return None.
+
+        The callback receives the metadata (or None on failure) on the Tk
+        thread. Without an executor the probe runs synchronously.
+        """
+        entry = self.get(file_path)
+        if entry or self.executor is None:
+            entry = entry or self.lookup(file_path)
+            if not entry and callback:
+                callback(None)
+            return entry
+
+        key = self.key(file_path)
+        with self.lock:
+            first_request = key not in self.callbacks
+            callbacks = self.callbacks.setdefault(key, [])
+            if callback:
+                callbacks.append(callback)
+        if first_request:
+            self.executor.submit(self.lookup, file_path,
+                                 on_done=lambda result: self._deliver(key, result),
+                                 on_error=lambda e: self._deliver(key, None))
+        return None
+
+    def _deliver(self, key, entry):
+        with self.lock:
+            callbacks = self.callbacks.pop(key, [])
+        for callback in callbacks:
+            try:
+                callback(entry)
+            except Exception as e:
+                print(f"Error in metadata callback for {key}: {e}")
+
+    def _probe_and_store(self, file_path, cap=None):
+        signature = self.file_signature(file_path)
+        if signature is None:
+            return None
+        try:
+            probed = probe_video(file_path, cap)
+        except Exception as e:
+            print(f"Error probing video {file_path}: {e}")
+            probed = None
+        if probed is None:
+            return None
+        return self.save(file_path, probed, signature)
+
+    def save(self, file_path, probed, signature=None):
+        """Record already probed metadata for file_path, e.g. a copy probed from its source"""
+        if signature is None:
+            signature = self.file_signature(file_path)
+            if signature is None:
+                return None
+        entry = dict(probed, file_path=self.key(file_path), file_size=signature[0], mtime=signature[1])
+        with self.lock:
+            self.entries[entry['file_path']] = entry
+        try:
+            self.db.save_video_metadata(entry)
+        except Exception as e:
+            print(f"Error saving video metadata for {file_path}: {e}")
+        return entry
+
+
+class Transcoder:
+    """Background transcoding of recordings and uploads into lighter renditions.
+
+    For each queued source a size-capped H.264/MP4 playback rendition and a
+    short low-resolution preview (used for gallery hover) are written to
+    output_dir. ffmpeg (software libx264) is used when it is on the PATH,
+    with OpenCV's VideoWriter as the fallback. Jobs live in the
+    transcode_jobs table, so queued and interrupted work resumes on the next
+    start; a small fixed pool of worker threads claims them one at a time.
+    """
+
+    max_size = (1280, 720)
+    max_bitrate = "2M"
+    preview_size = (320, 180)
+    preview_fps = 10
+    preview_seconds = 6
+    max_attempts = 3
+
+    def __init__(self, db, executor, output_dir="renditions", workers=1):
+        self.db = db
+        self.executor = executor
+        self.output_dir = output_dir
+        self.workers = workers
+        self.ffmpeg = shutil.which("ffmpeg")
+        self.on_complete = None  # called on the Tk thread with (source_path, rendition_path, preview_path)
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.stop_event = threading.Event()
+        self.threads = []
+        self.processes = set()
+        try:
+            self.renditions = {self.key(source): paths
+                               for source, paths in db.get_completed_transcodes().items()}
+        except Exception as e:
+            print(f"Error loading transcoded renditions: {e}")
+            self.renditions = {}
+
+    key = staticmethod(VideoMetadataIndex.key)
+
+    def start(self):
+        os.makedirs(self.output_dir, exist_ok=True)
+        self.db.reset_running_transcode_jobs()
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._worker_loop, name=f"transcoder-{i}", daemon=True)
+            thread.start()
+            self.threads.append(thread)
+
+    def stop(self):
+        """Stop the workers; a job cut short stays running in the queue and is redone on the next start"""
+        self.stop_event.set()
+        self.wakeup.set()
+        with self.lock:
+            processes = list(self.processes)
+        for process in processes:
+            process.terminate()
+
+    def enqueue(self, source_path):
+        """Queue a video for transcoding (safe to call from any thread)"""
+        key = self.key(source_path)
+        with self.lock:
+            self.renditions.pop(key, None)
+        self.db.add_transcode_job(key)
+        self.wakeup.set()
+
+    def rendition_for(self, source_path):
+        """Return the playback rendition for a source if it has been transcoded and still exists"""
+        with self.lock:
+            paths = self.renditions.get(self.key(source_path))
+        if paths and os.path.exists(paths[0]):
+            return paths[0]
+        return None
+
+    def preview_for(self, source_path):
+        with self.lock:
+            paths = self.renditions.get(self.key(source_path))
+        if paths and paths[1] and os.path.exists(paths[1]):
+            return paths[1]
+        return None
 
-            # Delete the actual files
+    def _worker_loop(self):
+        while not self.stop_event.is_set():
+            self.wakeup.clear()
             try:
-                if os.path.exists(file_path):
-                    os.remove(file_path)
-                if thumbnail_path and os.path.exists(thumbnail_path):
-                    os.remove(thumbnail_path)
+                job = self.db.claim_transcode_job()
             except Exception as e:
-                print(f"Error deleting files: {e}")
-
-            return True
-        conn.close()
-        return False
+                print(f"Error reading transcode queue: {e}")
+                job = None
+            if not job:
+                self.wakeup.wait(60)
+                continue
 
-    def get_lesson_categories(self):
-        """Get all unique categories from uploaded lessons"""
-        conn = sqlite3.connect(self.db_name)
-        cursor = conn.cursor()
-        cursor.execute('SELECT DISTINCT category FROM uploaded_lessons ORDER BY category')
-        categories = [row[0] for row in cursor.fetchall()]
-        conn.close()
-        return categories
+            job_id, source_path, attempts = job
+            try:
+                rendition_path, preview_path = self.transcode(source_path)
+            except Exception as e:
+                if self.stop_event.is_set():
+                    return
+                print(f"Error transcoding {source_path}: {e}")
+                self.db.fail_transcode_job(job_id, str(e), retry=attempts < self.max_attempts)
+                continue
+            if self.stop_event.is_set():
+                return
+            self.db.complete_transcode_job(job_id, rendition_path, preview_path)
+            with self.lock:
+                self.renditions[self.key(source_path)] = (rendition_path, preview_path)
+            if self.on_complete:
+                self.executor.call_soon(self.on_complete, source_path, rendition_path, preview_path)
+
+    def transcode(self, source_path):
+        """Write the playback and preview renditions for one source; returns their paths"""
+        if not os.path.exists(source_path):
+            raise FileNotFoundError(source_path)
+        stem = os.path.splitext(os.path.basename(source_path))[0]
+        digest = hashlib.sha1(source_path.encode("utf-8")).hexdigest()[:8]
+        rendition_path = os.path.join(self.output_dir, f"{stem}_{digest}.mp4")
+        preview_path = os.path.join(self.output_dir, f"{stem}_{digest}_preview.mp4")
+
+        for dest, preview in ((rendition_path, False), (preview_path, True)):
+            # Encode to a temporary name so a half-written file is never picked up
+            temp_path = dest + ".part"
+            try:
+                if self.ffmpeg:
+                    try:
+                        self._transcode_ffmpeg(source_path, temp_path, preview)
+                    except (subprocess.CalledProcessError, OSError) as e:
+                        if self.stop_event.is_set():
+                            raise
+                        print(f"ffmpeg failed for {source_path}, falling back to OpenCV: {e}")
+                        self._transcode_opencv(source_path, temp_path, preview)
+                else:
+                    self._transcode_opencv(source_path, temp_path, preview)
+                os.replace(temp_path, dest)
+            finally:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+        return rendition_path, preview_path
+
+    def _transcode_ffmpeg(self, source_path, dest, preview):
+        if preview:
+            width, height = self.preview_size
+            args = ["-t", str(self.preview_seconds), "-an",
+                    "-vf", f"fps={self.preview_fps},scale={width}:{height}:force_original_aspect_ratio=decrease,"
+                           f"pad={width}:{height}:(ow-iw)/2:(oh-ih)/2",
+                    "-c:v", "libx264", "-preset", "veryfast", "-crf", "30"]
+        else:
+            width, height = self.max_size
+            # Downscale only, keeping the aspect ratio and even dimensions
+            scale = f"trunc(min(1\\,min({width}/iw\\,{height}/ih))*iw/2)*2:-2"
+            args = ["-map", "0:v:0", "-map", "0:a?",
+                    "-vf", f"scale={scale}",
+                    "-c:v", "libx264", "-preset", "veryfast", "-crf", "23",
+                    "-maxrate", self.max_bitrate, "-bufsize", "4M",
+                    "-c:a", "aac", "-b:a", "96k"]
+        command = ([self.ffmpeg, "-y", "-v", "error", "-i", source_path] + args +
+                   ["-pix_fmt", "yuv420p", "-movflags", "+faststart", "-f", "mp4", dest])
+        process = subprocess.Popen(command, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                                   stderr=subprocess.PIPE)
+        with self.lock:
+            self.processes.add(process)
+        try:
+            _, stderr = process.communicate()
+        finally:
+            with self.lock:
+                self.processes.discard(process)
+        if process.returncode != 0:
+            raise subprocess.CalledProcessError(process.returncode, command,
+                                                stderr=stderr.decode("utf-8", "replace"))
+
+    def _transcode_opencv(self, source_path, dest, preview):
+        cap = cv2.VideoCapture(source_path)
+        if not cap.isOpened():
+            raise RuntimeError(f"Cannot open {source_path}")
+        writer = None
+        try:
+            fps = cap.get(cv2.CAP_PROP_FPS) or 20.0
+            src_w = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+            src_h = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+            if preview:
+                size = self.preview_size
+                out_fps = min(fps, self.preview_fps)
+                step = fps / out_fps
+                max_frames = int(self.preview_seconds * fps)
+            else:
+                scale = min(1.0, self.max_size[0] / src_w, self.max_size[1] / src_h)
+                size = (int(src_w * scale) // 2 * 2, int(src_h * scale) // 2 * 2)
+                out_fps, step, max_frames = fps, 1.0, None
+
+            # H.264 when the OpenCV build has an encoder for it, MPEG-4 Part 2 otherwise
+            for codec in ("avc1", "mp4v"):
+                writer = cv2.VideoWriter(dest, cv2.VideoWriter_fourcc(*codec), out_fps, size)
+                if writer.isOpened():
+                    break
+                writer.release()
+                writer = None
+            if writer is None:
+                raise RuntimeError("No MP4 encoder available in OpenCV")
+
+            index = 0
+            next_frame = 0.0
+            while max_frames is None or index < max_frames:
+                if self.stop_event.is_set():
+                    raise RuntimeError("Transcoding stopped")
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                if index >= next_frame:
+                    next_frame += step
+                    if preview:
+                        frame = letterbox(frame, size)
+                    elif (frame.shape[1], frame.shape[0]) != size:
+                        frame = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+                    writer.write(frame)
+                index += 1
+        finally:
+            cap.release()
+            if writer is not None:
+                writer.release()
+
+
+def letterbox(frame, size):
+    """Scale a BGR frame to fit size (width, height), padding the rest with black"""
+    width, height = size
+    scale = min(width / frame.shape[1], height / frame.shape[0])
+    new_w, new_h = max(1, int(frame.shape[1] * scale)), max(1, int(frame.shape[0] * scale))
+    canvas = np.zeros((height, width, 3), np.uint8)
+    x, y = (width - new_w) // 2, (height - new_h) // 2
+    canvas[y:y + new_h, x:x + new_w] = cv2.resize(frame, (new_w, new_h), interpolation=cv2.INTER_AREA)
+    return canvas
+
+
+class LibraryIndexer:
+    """Incremental index of the video folders shown in the library.
+
+    A single background thread scans the folders with os.scandir and stores
+    the results in the library_files table. A folder is only rescanned when
+    its directory mtime changes, it is marked dirty (e.g. after a recording
+    finishes) or a full rescan is requested. Changes are detected with a
+    watchdog observer when available and by polling directory mtimes
+    otherwise. Scan completion callbacks run on the Tk thread through the
+    TaskExecutor.
+    """
+
+    def __init__(self, db, executor, folders=LIBRARY_FOLDERS, poll_interval=5.0):
+        self.db = db
+        self.executor = executor
+        self.folders = folders
+        self.poll_interval = poll_interval
+        self.lock = threading.Lock()
+        self.dirty = set()
+        self.force_full = False
+        self.callbacks = []
+        self.on_change = lambda: None  # called on the Tk thread for unsolicited changes
+        self.wake = threading.Event()
+        self.running = False
+        self.thread = None
+        self.observer = None
+
+    def start(self):
+        """Start the watcher thread (and a watchdog observer if installed)"""
+        if self.running:
+            return
+        self.running = True
+        if Observer is not None:
+            try:
+                self.observer = Observer()
+                for folder, _, _, _ in self.folders:
+                    os.makedirs(folder, exist_ok=True)
+                    self.observer.schedule(_FolderEventHandler(self, folder), folder, recursive=False)
+                self.observer.daemon = True
+                self.observer.start()
+            except Exception as e:
+                print(f"File watcher unavailable, falling back to polling: {e}")
+                self.observer = None
+        self.thread = threading.Thread(target=self._watch_loop, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.running = False
+        self.wake.set()
+        if self.observer:
+            try:
+                self.observer.stop()
+            except Exception:
+                pass
+            self.observer = None
+
+    def request_scan(self, callback=None, full=False, folders=None):
+        """Queue a rescan on the background thread.
+
+        The callback receives True if any folder changed. With full=True every
+        folder is rescanned regardless of its directory mtime; folders marks
+        specific folders dirty (used after writing into them).
+        """
+        with self.lock:
+            if callback:
+                self.callbacks.append(callback)
+            if full:
+                self.force_full = True
+            if folders:
+                self.dirty.update(folders)
+        if not self.running:
+            self.start()
+        self.wake.set()
+
+    def mark_dirty(self, folder):
+        with self.lock:
+            self.dirty.add(folder)
+        self.wake.set()
+
+    def _watch_loop(self):
+        # First pass validates every folder against the stored index
+        first_pass = True
+        while self.running:
+            if not first_pass:
+                self.wake.wait(self.poll_interval)
+                self.wake.clear()
+            if not self.running:
+                break
+            with self.lock:
+                force = self.force_full or first_pass
+                dirty = set(self.dirty)
+                callbacks = self.callbacks
+                self.force_full = False
+                self.dirty.clear()
+                self.callbacks = []
+            first_pass = False
+
+            changed = False
+            for folder_config in self.folders:
+                try:
+                    changed |= self._scan_folder(folder_config, force or folder_config[0] in dirty)
+                except Exception as e:
+                    print(f"Error indexing folder {folder_config[0]}: {e}")
+            for callback in callbacks:
+                self.executor.call_soon(callback, changed)
+            if changed and not callbacks:
+                self.executor.call_soon(self.on_change)
+
+    def _scan_folder(self, folder_config, force):
+        """Rescan one folder if needed; returns True if the index changed"""
+        folder, video_type, source, replacements = folder_config
+        try:
+            mtime_ns = os.stat(folder).st_mtime_ns
+        except OSError:
+            mtime_ns = 0
+
+        # Unchanged folders cost one single-row query; file signatures are only read to rescan
+        if not force and self.db.get_library_folder_mtime(folder) == mtime_ns:
+            return False
+        stored_files = self.db.get_library_folder_files(folder)
+
+        upserts = []
+        seen = set()
+        if mtime_ns:
+            with os.scandir(folder) as entries:
+                for entry in entries:
+                    if not entry.name.lower().endswith(VIDEO_EXTENSIONS) or not entry.is_file():
+                        continue
+                    st = entry.stat()
+                    file_path = os.path.join(folder, entry.name)
+                    seen.add(file_path)
+                    if stored_files.get(file_path) == (st.st_size, st.st_mtime):
+                        continue
+                    upserts.append((file_path, folder, title_from_filename(entry.name, replacements),
+                                    video_type, source, st.st_size, st.st_mtime,
+                                    datetime.fromtimestamp(st.st_mtime).strftime("%Y-%m-%d")))
+
+        removed = [path for path in stored_files if path not in seen]
+        self.db.update_library_folder(folder, mtime_ns, upserts, removed)
+        return bool(upserts or removed)
+
+
+class _FolderEventHandler:
+    """Minimal watchdog event handler that marks a library folder dirty"""
+
+    def __init__(self, indexer, folder):
+        self.indexer = indexer
+        self.folder = folder
+
+    def dispatch(self, event):
+        self.indexer.mark_dirty(self.folder)
 
 
 class LoginPage:
@@ -358,6 +2200,8 @@ class LoginPage:
 
         # Initialize database
         self.db = DatabaseManager()
+        # Password hashing runs on a worker so the window stays responsive
+        self.executor = TaskExecutor(self.root, max_workers=1)
 
         # Center the window
         self.center_window(self.root)
@@ -365,6 +2209,12 @@ class LoginPage:
         # Create login UI
         self.create_login_ui()
 
+        # A saved, still valid session signs in without redoing the password hash
+        self.session_token = load_session_token()
+        if self.session_token:
+            self.executor.submit(self.check_session, self.session_token, on_done=self.offer_session,
+                                 on_error=lambda e: print(f"Error checking saved session: {e}"))
+
     def center_window(self, window):
         """Center the window on screen"""
         window.update_idletasks()
@@ -432,6 +2282,11 @@ class LoginPage:
                               width=15, height=1, relief="flat", bd=0,
                               activebackground="#2980b9", cursor="hand2")
         login_btn.pack(pady=10)
+        self.login_btn = login_btn
+
+        # Continue with the saved session (shown once it has been checked)
+        self.session_frame = tk.Frame(main_frame, bg="#f0f8ff")
+        self.session_frame.pack()
 
         # Registration button
         register_btn = tk.Button(main_frame, text="Create New Account", command=self.show_registration,
@@ -495,17 +2350,68 @@ class LoginPage:
             messagebox.showerror("Error", "Please enter both username and password")
             return
 
-        # Authenticate using database
-        if self.db.authenticate_user(username, password, user_type):
-            user_info = self.db.get_user_info(username)
+        if str(self.login_btn['state']) == 'disabled':
+            return  # A login is already being checked
+        self.login_btn.config(state='disabled', text="Logging in...")
+
+        def logged_in(result):
+            token, user_info = result
+            if not token:
+                self.login_btn.config(state='normal', text="Login")
+                messagebox.showerror("Error", "Invalid username, password, or user type")
+                return
+            save_session_token(token)
             if user_info:
-                self.root.destroy()  # Close login window
-                # Launch the main application with the appropriate access level
-                main_root = tk.Tk()
-                app = ASLLearner(main_root, user_type, username, user_info['full_name'])
-                main_root.mainloop()
-        else:
-            messagebox.showerror("Error", "Invalid username, password, or user type")
+                self.open_app(user_type, username, user_info)
+
+        def failed(e):
+            self.login_btn.config(state='normal', text="Login")
+            messagebox.showerror("Error", f"Login failed: {str(e)}")
+
+        # Authenticate using database on a worker
+        self.executor.submit(self.check_login, username, password, user_type,
+                             on_done=logged_in, on_error=failed)
+
+    def check_login(self, username, password, user_type):
+        """Verify the credentials and load the user (runs on a worker thread)"""
+        token = self.db.login(username, password, user_type)
+        return token, (self.db.get_user_info(username) if token else None)
+
+    def check_session(self, token):
+        """Look up the saved session and its user (runs on a worker thread)"""
+        session = self.db.resume_session(token)
+        if not session:
+            return None
+        username, user_type = session
+        return username, user_type, self.db.get_user_info(username)
+
+    def offer_session(self, session):
+        if not session or not session[2]:
+            clear_session_token()
+            return
+        username, user_type, user_info = session
+        tk.Button(self.session_frame, text=f"Continue as {user_info['full_name']}",
+                  command=lambda: self.open_app(user_type, username, user_info),
+                  bg="#8e44ad", fg="white", font=("Arial", 10, "bold"), relief="flat", bd=0,
+                  activebackground="#71368a", cursor="hand2").pack(side='left', pady=5, ipadx=10)
+        tk.Button(self.session_frame, text="Not you?", command=self.forget_session,
+                  bg="#f0f8ff", fg="#7f8c8d", font=("Arial", 9), relief="flat", bd=0,
+                  cursor="hand2").pack(side='left', padx=10)
+
+    def forget_session(self):
+        self.executor.submit(self.db.end_session, self.session_token,
+                             on_error=lambda e: print(f"Error ending session: {e}"))
+        clear_session_token()
+        for widget in self.session_frame.winfo_children():
+            widget.destroy()
+
+    def open_app(self, user_type, username, user_info):
+        self.executor.shutdown()
+        self.root.destroy()  # Close login window
+        # Launch the main application with the appropriate access level
+        main_root = tk.Tk()
+        app = ASLLearner(main_root, user_type, username, user_info['full_name'])
+        main_root.mainloop()
 
 
 class RegistrationPanel:
@@ -643,17 +2549,21 @@ class RegistrationPanel:
             messagebox.showerror("Error", "Username can only contain letters, numbers, and underscores")
             return
 
-        # Create user in database
-        try:
-            self.login_app.db.create_user(username, password, email, full_name, user_type)
+        # Create user in database (the password hash is computed on a worker)
+        def created(result):
             messagebox.showinfo("Success", f"Account created successfully!\n\n"
                                            f"Username: {username}\n"
                                            f"Account Type: {user_type.capitalize()}\n\n"
                                            f"You can now login with your new account.")
-            self.window.destroy()
-        except ValueError as e:
+            if self.window.winfo_exists():
+                self.window.destroy()
+
+        def failed(e):
             messagebox.showerror("Error", str(e))
 
+        self.login_app.executor.submit(self.login_app.db.create_user, username, password, email, full_name,
+                                       user_type, on_done=created, on_error=failed)
+
     def is_valid_email(self, email):
         """Basic email validation"""
         pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
@@ -776,12 +2686,17 @@ class AdminToolsPanel:
 
 
 class UploadLessonDialog:
-    def __init__(self, parent, db, username):
+    def __init__(self, parent, db, username, metadata=None, executor=None, blobs=None):
         self.parent = parent
         self.db = db
         self.username = username
+        self.executor = executor or TaskExecutor(parent)
+        self.metadata = metadata or VideoMetadataIndex(db, self.executor)
+        self.blobs = blobs or BlobStore(db)
+        self.on_saved = None  # called with (destination folder, new file path) after a successful save
         self.file_path = None
         self.thumbnail_path = None
+        self.copy_task = None
         self.create_dialog()
 
     def create_dialog(self):
@@ -792,6 +2707,7 @@ class UploadLessonDialog:
         self.dialog.resizable(False, False)
         self.dialog.transient(self.parent)
         self.dialog.grab_set()
+        self.dialog.protocol("WM_DELETE_WINDOW", self.close)
 
         # Center the dialog
         self.dialog.update_idletasks()
@@ -885,35 +2801,48 @@ class UploadLessonDialog:
         asl_frame = tk.Frame(form_frame, bg="#f0f8ff")
         asl_frame.pack(fill='x', pady=15)
 
-        asl_save_btn = tk.Button(asl_frame, text="💾 Save in ASL Learner Frame",
-                                command=self.save_in_asl_learner_frame,
-                                bg="#9b59b6", fg="white", font=("Arial", 11, "bold"),
-                                relief="flat", cursor="hand2", width=25, height=1,
-                                activebackground="#8e44ad")
-        asl_save_btn.pack(pady=5)
+        self.asl_save_btn = tk.Button(asl_frame, text="💾 Save in ASL Learner Frame",
+                                      command=self.save_in_asl_learner_frame,
+                                      bg="#9b59b6", fg="white", font=("Arial", 11, "bold"),
+                                      relief="flat", cursor="hand2", width=25, height=1,
+                                      activebackground="#8e44ad")
+        self.asl_save_btn.pack(pady=5)
 
         asl_info_label = tk.Label(asl_frame,
                                  text="Save video directly to ASL Learner frame for quick access",
                                  font=("Arial", 8), bg="#f0f8ff", fg="#7f8c8d")
         asl_info_label.pack()
 
+        # Copy progress (shown while a save or upload is running)
+        self.progress_frame = tk.Frame(main_frame, bg="#f0f8ff")
+        self.progress_label = tk.Label(self.progress_frame, text="", font=("Arial", 9),
+                                       bg="#f0f8ff", fg="#2c3e50", anchor='w')
+        self.progress_label.pack(fill='x')
+        progress_row = tk.Frame(self.progress_frame, bg="#f0f8ff")
+        progress_row.pack(fill='x')
+        self.progress_bar = ttk.Progressbar(progress_row, mode='determinate', maximum=100)
+        self.progress_bar.pack(side='left', fill='x', expand=True, pady=2)
+        tk.Button(progress_row, text="Stop", command=self.cancel_copy, bg="#e74c3c", fg="white",
+                  font=("Arial", 9, "bold"), relief="flat", cursor="hand2").pack(side='right', padx=(5, 0))
+
         # Buttons frame
         btn_frame = tk.Frame(main_frame, bg="#f0f8ff")
         btn_frame.pack(fill='x', pady=20)
+        self.btn_frame = btn_frame
 
         # Save button - saves video to folder without database entry
-        save_btn = tk.Button(btn_frame, text="Save Video Only", command=self.save_video_only,
-                             bg="#f39c12", fg="white", font=("Arial", 10, "bold"),
-                             relief="flat", cursor="hand2", width=15)
-        save_btn.pack(side='left', padx=5)
+        self.save_btn = tk.Button(btn_frame, text="Save Video Only", command=self.save_video_only,
+                                  bg="#f39c12", fg="white", font=("Arial", 10, "bold"),
+                                  relief="flat", cursor="hand2", width=15)
+        self.save_btn.pack(side='left', padx=5)
 
         # Upload button - saves to folder AND database
-        upload_btn = tk.Button(btn_frame, text="Upload Lesson", command=self.upload_lesson,
-                               bg="#27ae60", fg="white", font=("Arial", 11, "bold"),
-                               relief="flat", cursor="hand2", width=15)
-        upload_btn.pack(side='left', padx=5)
+        self.upload_btn = tk.Button(btn_frame, text="Upload Lesson", command=self.upload_lesson,
+                                    bg="#27ae60", fg="white", font=("Arial", 11, "bold"),
+                                    relief="flat", cursor="hand2", width=15)
+        self.upload_btn.pack(side='left', padx=5)
 
-        cancel_btn = tk.Button(btn_frame, text="Cancel", command=self.dialog.destroy,
+        cancel_btn = tk.Button(btn_frame, text="Cancel", command=self.close,
                                bg="#95a5a6", fg="white", font=("Arial", 11, "bold"),
                                relief="flat", cursor="hand2", width=10)
         cancel_btn.pack(side='right', padx=5)
@@ -931,9 +2860,7 @@ class UploadLessonDialog:
 
             # Auto-generate title from filename if title is empty
             if not self.title_entry.get():
-                title = os.path.splitext(os.path.basename(filename))[0]
-                title = title.replace('_', ' ').replace('-', ' ').title()
-                self.title_entry.insert(0, title)
+                self.title_entry.insert(0, title_from_filename(filename, [('-', ' ')]))
 
     def browse_thumbnail(self):
         """Browse for thumbnail image"""
@@ -946,43 +2873,91 @@ class UploadLessonDialog:
             self.thumbnail_path = filename
             self.thumb_label.config(text=os.path.basename(filename))
 
+    def set_busy(self, busy):
+        """Disable the save/upload buttons and show the progress bar while a background copy is running"""
+        state = 'disabled' if busy else 'normal'
+        for button in (self.asl_save_btn, self.save_btn, self.upload_btn):
+            button.config(state=state)
+        if busy:
+            self.progress_bar['value'] = 0
+            self.progress_label.config(text="Starting...")
+            self.progress_frame.pack(fill='x', before=self.btn_frame)
+        else:
+            self.progress_frame.pack_forget()
+
+    def show_progress(self, phase, done, total):
+        if not self.dialog.winfo_exists():
+            return
+        percent = done * 100 / total if total else 100
+        self.progress_bar['value'] = percent
+        self.progress_label.config(text=f"{phase}... {done / (1 << 20):.0f} of {total / (1 << 20):.0f} MB "
+                                        f"({percent:.0f}%)")
+
+    def cancel_copy(self):
+        """Stop the running copy; a later save of the same file resumes from the last checkpoint"""
+        if self.copy_task and not self.copy_task.done():
+            self.copy_task.cancel()
+        self.copy_task = None
+        if self.dialog.winfo_exists():
+            self.set_busy(False)
+
+    def close(self):
+        self.cancel_copy()
+        self.dialog.destroy()
+
+    def safe_title(self):
+        return "".join(c for c in self.title_entry.get().strip() if c.isalnum() or c in (' ', '-', '_')).rstrip()
+
+    def run_in_background(self, fn, on_done, error_message, *args):
+        """Run a file operation on the executor and report the outcome on the Tk thread.
+
+        fn receives the Task first, for progress reports and cancellation.
+        """
+        self.set_busy(True)
+
+        def done(result):
+            if self.dialog.winfo_exists():
+                self.set_busy(False)
+            on_done(result)
+
+        def failed(e):
+            if self.dialog.winfo_exists():
+                self.set_busy(False)
+            messagebox.showerror("Error", f"{error_message}: {str(e)}")
+
+        self.copy_task = self.executor.submit(fn, *args, with_task=True, on_done=done, on_error=failed,
+                                              on_progress=self.show_progress)
+        return self.copy_task
+
     def save_in_asl_learner_frame(self):
         """Save video specifically in ASL Learner frame directory"""
         if not self.file_path:
             messagebox.showerror("Error", "Please select a video file first")
             return
 
-        try:
-            # Create asl_learner_frame directory if it doesn't exist
-            asl_frame_dir = "asl_learner_frame"
-            os.makedirs(asl_frame_dir, exist_ok=True)
-
-            # Generate unique filename
-            original_name = os.path.basename(self.file_path)
-            file_ext = os.path.splitext(original_name)[1]
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-
-            # Use title if available, otherwise use original name
-            if self.title_entry.get().strip():
-                safe_title = "".join(
-                    c for c in self.title_entry.get().strip() if c.isalnum() or c in (' ', '-', '_')).rstrip()
-                new_filename = f"asl_frame_{safe_title}_{timestamp}{file_ext}"
-            else:
-                new_filename = f"asl_frame_video_{timestamp}{file_ext}"
+        # Create asl_learner_frame directory if it doesn't exist
+        asl_frame_dir = "asl_learner_frame"
 
-            new_filepath = os.path.join(asl_frame_dir, new_filename)
+        # Generate unique filename
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
 
-            # Copy file to asl_learner_frame directory
-            shutil.copy2(self.file_path, new_filepath)
+        # Use title if available, otherwise use original name
+        if self.title_entry.get().strip():
+            new_stem = f"asl_frame_{self.safe_title()}_{timestamp}"
+        else:
+            new_stem = f"asl_frame_video_{timestamp}"
 
+        def saved(new_filepath):
             messagebox.showinfo("Success",
                                 f"Video saved in ASL Learner Frame!\n\n"
                                 f"Saved to: {asl_frame_dir}\n"
-                                f"Filename: {new_filename}\n\n"
+                                f"Filename: {os.path.basename(new_filepath)}\n\n"
                                 f"The video is now available in the ASL Learner frame for quick access.")
+            if self.on_saved:
+                self.on_saved(asl_frame_dir, new_filepath)
 
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to save video in ASL Learner frame: {str(e)}")
+        self.run_in_background(self.copy_video, saved, "Failed to save video in ASL Learner frame",
+                               self.file_path, asl_frame_dir, new_stem)
 
     def save_video_only(self):
         """Save video to folder without database entry"""
@@ -990,37 +2965,37 @@ class UploadLessonDialog:
             messagebox.showerror("Error", "Please select a video file")
             return
 
-        try:
-            # Create saved_videos directory if it doesn't exist
-            saved_videos_dir = "saved_videos"
-            os.makedirs(saved_videos_dir, exist_ok=True)
-
-            # Generate unique filename
-            original_name = os.path.basename(self.file_path)
-            file_ext = os.path.splitext(original_name)[1]
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-
-            # Use title if available, otherwise use original name
-            if self.title_entry.get().strip():
-                safe_title = "".join(
-                    c for c in self.title_entry.get().strip() if c.isalnum() or c in (' ', '-', '_')).rstrip()
-                new_filename = f"{safe_title}_{timestamp}{file_ext}"
-            else:
-                new_filename = f"saved_video_{timestamp}{file_ext}"
+        # Create saved_videos directory if it doesn't exist
+        saved_videos_dir = "saved_videos"
 
-            new_filepath = os.path.join(saved_videos_dir, new_filename)
+        # Generate unique filename
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
 
-            # Copy file to saved_videos directory
-            shutil.copy2(self.file_path, new_filepath)
+        # Use title if available, otherwise use original name
+        if self.title_entry.get().strip():
+            new_stem = f"{self.safe_title()}_{timestamp}"
+        else:
+            new_stem = f"saved_video_{timestamp}"
 
+        def saved(new_filepath):
             messagebox.showinfo("Success",
-                                f"Video saved successfully!\n\nSaved to: {saved_videos_dir}\nFilename: {new_filename}")
+                                f"Video saved successfully!\n\nSaved to: {saved_videos_dir}\n"
+                                f"Filename: {os.path.basename(new_filepath)}")
+            if self.on_saved:
+                self.on_saved(saved_videos_dir, new_filepath)
 
-            # Optionally keep the dialog open for further actions
-            # self.dialog.destroy()
+        self.run_in_background(self.copy_video, saved, "Failed to save video",
+                               self.file_path, saved_videos_dir, new_stem)
 
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to save video: {str(e)}")
+    def copy_video(self, task, source_path, folder, stem):
+        """Store a video in the blob store and link it into a library folder (runs on a worker thread).
+
+        The file is named stem_<hash prefix><ext>, so identical names only occur for identical content.
+        """
+        os.makedirs(folder, exist_ok=True)
+        digest, size = self.blobs.store(source_path, task)
+        file_ext = os.path.splitext(source_path)[1]
+        return self.blobs.link_new(digest, size, folder, f"{stem}_{digest[:8]}", file_ext)
 
     def upload_lesson(self):
         """Upload the lesson to the system (save to folder AND database)"""
@@ -1032,75 +3007,103 @@ class UploadLessonDialog:
             messagebox.showerror("Error", "Please enter a lesson title")
             return
 
-        try:
-            # Create uploads directory if it doesn't exist
-            uploads_dir = "uploaded_lessons"
-            os.makedirs(uploads_dir, exist_ok=True)
-            thumbnails_dir = os.path.join(uploads_dir, "thumbnails")
-            os.makedirs(thumbnails_dir, exist_ok=True)
-
-            # Generate unique filename
-            original_name = os.path.basename(self.file_path)
-            file_ext = os.path.splitext(original_name)[1]
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            new_filename = f"lesson_{timestamp}{file_ext}"
-            new_filepath = os.path.join(uploads_dir, new_filename)
-
-            # Copy file to uploads directory
-            shutil.copy2(self.file_path, new_filepath)
-            file_size = os.path.getsize(new_filepath)
-
-            # Process thumbnail if provided
-            final_thumbnail_path = None
-            if self.thumbnail_path:
-                thumb_ext = os.path.splitext(self.thumbnail_path)[1]
-                thumb_filename = f"thumb_{timestamp}{thumb_ext}"
-                final_thumbnail_path = os.path.join(thumbnails_dir, thumb_filename)
-                shutil.copy2(self.thumbnail_path, final_thumbnail_path)
-
-            # Get video duration
-            duration = self.get_video_duration(new_filepath)
-
-            # Add to database
-            self.db.add_uploaded_lesson(
-                filename=new_filename,
-                original_name=original_name,
-                file_path=new_filepath,
-                file_size=file_size,
-                file_type=file_ext[1:].upper(),
-                title=self.title_entry.get().strip(),
-                description=self.desc_text.get("1.0", "end-1c").strip(),
-                category=self.category_var.get(),
-                uploaded_by=self.username,
-                duration=duration,
-                thumbnail_path=final_thumbnail_path
-            )
+        # Read the form on the Tk thread; the copy, probe and insert run in the background
+        lesson = {
+            'source_path': self.file_path,
+            'thumbnail_source': self.thumbnail_path,
+            'title': self.title_entry.get().strip(),
+            'description': self.desc_text.get("1.0", "end-1c").strip(),
+            'category': self.category_var.get(),
+        }
 
+        def uploaded(new_filepath):
             messagebox.showinfo("Success", "Lesson uploaded successfully!")
+            if self.on_saved:
+                self.on_saved("uploaded_lessons", new_filepath)
             self.dialog.destroy()
 
+        self.run_in_background(self.store_lesson, uploaded, "Failed to upload lesson", lesson)
+
+    def store_lesson(self, task, lesson):
+        """Copy the lesson files, probe the video and add the database row (runs on a worker thread)"""
+        # Create uploads directory if it doesn't exist
+        uploads_dir = "uploaded_lessons"
+        os.makedirs(uploads_dir, exist_ok=True)
+        thumbnails_dir = os.path.join(uploads_dir, "thumbnails")
+        os.makedirs(thumbnails_dir, exist_ok=True)
+
+        # Store the video once and link it into the uploads directory under a unique name
+        original_name = os.path.basename(lesson['source_path'])
+        file_ext = os.path.splitext(original_name)[1]
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        # Probe the source on its own thread while the copy runs
+        prober = ThreadPoolExecutor(max_workers=1, thread_name_prefix="asl-probe")
+        probe = prober.submit(probe_video, lesson['source_path'])
+        prober.shutdown(wait=False)
+        new_filepath = self.copy_video(task, lesson['source_path'], uploads_dir, f"lesson_{timestamp}")
+        new_filename = os.path.basename(new_filepath)
+        file_size = os.path.getsize(new_filepath)
+
+        # Process thumbnail if provided
+        final_thumbnail_path = None
+        if lesson['thumbnail_source']:
+            thumb_ext = os.path.splitext(lesson['thumbnail_source'])[1]
+            final_thumbnail_path = unique_path(thumbnails_dir, f"thumb_{timestamp}", thumb_ext)
+            shutil.copy2(lesson['thumbnail_source'], final_thumbnail_path)
+
+        # Join the probe and keep its metadata under the copy's path
+        try:
+            probed = probe.result()
+            metadata = self.metadata.save(new_filepath, probed) if probed else None
         except Exception as e:
-            messagebox.showerror("Error", f"Failed to upload lesson: {str(e)}")
+            print(f"Error probing video {lesson['source_path']}: {e}")
+            metadata = None
+        duration = int(metadata['duration']) if metadata else 0
+
+        # Add to database
+        self.db.add_uploaded_lesson(
+            filename=new_filename,
+            original_name=original_name,
+            file_path=new_filepath,
+            file_size=file_size,
+            file_type=file_ext[1:].upper(),
+            title=lesson['title'],
+            description=lesson['description'],
+            category=lesson['category'],
+            uploaded_by=self.username,
+            duration=duration,
+            thumbnail_path=final_thumbnail_path
+        )
+        return new_filepath
 
     def get_video_duration(self, filepath):
         """Get duration of video file in seconds"""
         try:
-            cap = cv2.VideoCapture(filepath)
-            fps = cap.get(cv2.CAP_PROP_FPS)
-            frame_count = cap.get(cv2.CAP_PROP_FRAME_COUNT)
-            duration = frame_count / fps if fps > 0 else 0
-            cap.release()
-            return int(duration)
+            metadata = self.metadata.lookup(filepath)
+            return int(metadata['duration']) if metadata else 0
         except:
             return 0
 
 
 class VideoItem:
-    def __init__(self, parent, video_data, on_select_callback, db=None):
+    def __init__(self, parent, video_data, on_select_callback, db=None, metadata=None, executor=None,
+                 preview_path=None):
         self.parent = parent
         self.video_data = video_data
         self.on_select_callback = on_select_callback
         self.db = db
+        self.metadata = metadata
+        self.executor = executor
+        self.preview_path = preview_path  # low-res transcoded clip played on hover
+        self.preview_frames = None
+        self.preview_delay = 100
+        self.preview_image = None
+        self.preview_task = None
+        self.preview_after_id = None
+        self.hovering = False
+        self.thumb_label = None
+        self.duration_label = None
+        self.views_label = None
         self.frame = None
         self.thumbnail = None
         self.create_widget()
@@ -1115,53 +3118,24 @@ class VideoItem:
         thumb_frame.pack_propagate(False)
         thumb_frame.pack(side='left', padx=5, pady=5)
 
-        try:
-            # Get thumbnail path
-            thumb_path = None
-            if 'thumbnail_path' in self.video_data and self.video_data['thumbnail_path'] and os.path.exists(
-                    self.video_data['thumbnail_path']):
-                thumb_path = self.video_data['thumbnail_path']
-            elif 'file_path' in self.video_data and os.path.exists(self.video_data['file_path']):
-                thumb_path = self.video_data['file_path']
-
-            if thumb_path and os.path.exists(thumb_path):
-                if thumb_path.lower().endswith(('.png', '.jpg', '.jpeg', '.bmp', '.gif')):
-                    # It's an image thumbnail
-                    img = Image.open(thumb_path)
-                else:
-                    # It's a video - get first frame
-                    cap = cv2.VideoCapture(thumb_path)
-                    ret, frame = cap.read()
-                    if ret:
-                        frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                        img = Image.fromarray(frame)
-                    else:
-                        img = Image.new('RGB', (320, 180), color='#2c3e50')
-                    cap.release()
-
-                img = img.resize((320, 180), Image.Resampling.LANCZOS)
-                self.thumbnail = ImageTk.PhotoImage(image=img)
-
-                thumb_label = tk.Label(thumb_frame, image=self.thumbnail, cursor="hand2", bg="black")
-                thumb_label.pack(fill='both', expand=True)
-                thumb_label.bind("<Button-1>", lambda e: self.on_select_callback(self.video_data['file_path']))
-
-            else:
-                # Create default thumbnail
-                img = Image.new('RGB', (320, 180), color='#2c3e50')
-                self.thumbnail = ImageTk.PhotoImage(image=img)
-                thumb_label = tk.Label(thumb_frame, image=self.thumbnail, cursor="hand2", bg="black")
-                thumb_label.pack(fill='both', expand=True)
-                thumb_label.bind("<Button-1>", lambda e: self.on_select_callback(self.video_data['file_path']))
-
-        except Exception as e:
-            print(f"Error creating thumbnail for {self.video_data.get('file_path', 'unknown')}: {e}")
-            # Create default thumbnail on error
-            img = Image.new('RGB', (320, 180), color='#2c3e50')
-            self.thumbnail = ImageTk.PhotoImage(image=img)
-            thumb_label = tk.Label(thumb_frame, image=self.thumbnail, cursor="hand2", bg="black")
-            thumb_label.pack(fill='both', expand=True)
-            thumb_label.bind("<Button-1>", lambda e: self.on_select_callback(self.video_data['file_path']))
+        # Placeholder until the thumbnail is decoded; decoding runs on the executor when available
+        img = Image.new('RGB', (320, 180), color='#2c3e50')
+        self.thumbnail = ImageTk.PhotoImage(image=img)
+        self.thumb_label = tk.Label(thumb_frame, image=self.thumbnail, cursor="hand2", bg="black")
+        self.thumb_label.pack(fill='both', expand=True)
+        self.thumb_label.bind("<Button-1>", lambda e: self.on_select_callback(self.video_data['file_path']))
+        self.thumb_label.bind("<Enter>", self.start_preview)
+        self.thumb_label.bind("<Leave>", self.stop_preview)
+
+        if self.executor:
+            self.executor.submit(self.load_thumbnail_image, self.video_data, on_done=self.set_thumbnail,
+                                 on_error=lambda e: print(f"Error creating thumbnail for "
+                                                          f"{self.video_data.get('file_path', 'unknown')}: {e}"))
+        else:
+            try:
+                self.set_thumbnail(self.load_thumbnail_image(self.video_data))
+            except Exception as e:
+                print(f"Error creating thumbnail for {self.video_data.get('file_path', 'unknown')}: {e}")
 
         # Video info
         info_frame = tk.Frame(self.frame, bg="white")
@@ -1208,34 +3182,29 @@ class VideoItem:
         # Views (for uploaded lessons)
         if 'views' in self.video_data:
             views_text = f"{self.video_data['views']} views"
-            views_label = tk.Label(meta_frame, text=views_text,
-                                   font=("Arial", 9),
-                                   bg="white", fg="#7f8c8d")
-            views_label.pack(side='left', padx=(0, 10))
+            self.views_label = tk.Label(meta_frame, text=views_text,
+                                        font=("Arial", 9),
+                                        bg="white", fg="#7f8c8d")
+            self.views_label.pack(side='left', padx=(0, 10))
 
         # Duration
         duration = self.video_data.get('duration', 0)
         if duration:
-            duration_text = f"{duration // 60}:{duration % 60:02d}"
+            duration_text = self.format_duration(duration)
         else:
-            # Try to get duration from file
+            # Use the metadata index; unprobed files are filled in asynchronously
+            duration_text = "N/A"
             try:
-                if 'file_path' in self.video_data and os.path.exists(self.video_data['file_path']):
-                    cap = cv2.VideoCapture(self.video_data['file_path'])
-                    fps = cap.get(cv2.CAP_PROP_FPS)
-                    frame_count = cap.get(cv2.CAP_PROP_FRAME_COUNT)
-                    duration = int(frame_count / fps) if fps > 0 else 0
-                    duration_text = f"{duration // 60}:{duration % 60:02d}"
-                    cap.release()
-                else:
-                    duration_text = "N/A"
-            except:
+                if self.metadata and 'file_path' in self.video_data:
+                    metadata = self.metadata.request(self.video_data['file_path'], self.set_duration)
+                    duration_text = self.format_duration(int(metadata['duration'])) if metadata else "..."
+            except Exception:
                 duration_text = "N/A"
 
-        duration_label = tk.Label(meta_frame, text=duration_text,
-                                  font=("Arial", 9),
-                                  bg="white", fg="#7f8c8d")
-        duration_label.pack(side='left', padx=(0, 10))
+        self.duration_label = tk.Label(meta_frame, text=duration_text,
+                                       font=("Arial", 9),
+                                       bg="white", fg="#7f8c8d")
+        self.duration_label.pack(side='left', padx=(0, 10))
 
         # File size
         file_size = self.video_data.get('file_size', 0)
@@ -1305,6 +3274,715 @@ class VideoItem:
                 else:
                     child.bind("<Button-1>", lambda e, path=self.video_data['file_path']: self.on_select_callback(path))
 
+    @staticmethod
+    def load_thumbnail_image(video_data):
+        """Decode and scale the thumbnail for a video (safe to run on a worker thread)"""
+        # Get thumbnail path
+        thumb_path = None
+        if video_data.get('thumbnail_path') and os.path.exists(video_data['thumbnail_path']):
+            thumb_path = video_data['thumbnail_path']
+        elif 'file_path' in video_data and os.path.exists(video_data['file_path']):
+            thumb_path = video_data['file_path']
+
+        if not thumb_path:
+            return None
+
+        if thumb_path.lower().endswith(('.png', '.jpg', '.jpeg', '.bmp', '.gif')):
+            # It's an image thumbnail
+            img = Image.open(thumb_path)
+        else:
+            # It's a video - get first frame
+            cap = cv2.VideoCapture(thumb_path)
+            ret, frame = cap.read()
+            cap.release()
+            if not ret:
+                return None
+            img = Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+
+        return img.resize((320, 180), Image.Resampling.LANCZOS)
+
+    def set_thumbnail(self, img):
+        """Show a decoded thumbnail; PhotoImage must be created on the Tk thread"""
+        if img is None or not self.thumb_label.winfo_exists():
+            return
+        self.thumbnail = ImageTk.PhotoImage(image=img)
+        self.thumb_label.config(image=self.thumbnail)
+
+    @staticmethod
+    def load_preview_frames(preview_path):
+        """Decode the hover preview clip into PIL images (safe to run on a worker thread)"""
+        cap = cv2.VideoCapture(preview_path)
+        fps = cap.get(cv2.CAP_PROP_FPS) or 10
+        frames = []
+        while True:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            frames.append(Image.fromarray(cv2.cvtColor(letterbox(frame, (320, 180)), cv2.COLOR_BGR2RGB)))
+        cap.release()
+        return frames, int(1000 / fps)
+
+    def start_preview(self, event=None):
+        """Play the preview rendition in the thumbnail while the pointer is over it"""
+        self.hovering = True
+        if not self.preview_path or not self.executor:
+            return
+        if self.preview_frames:
+            self.show_preview_frame(0)
+        elif not self.preview_task:
+            self.preview_task = self.executor.submit(
+                self.load_preview_frames, self.preview_path, on_done=self.set_preview_frames,
+                on_error=lambda e: print(f"Error loading preview {self.preview_path}: {e}"))
+
+    def set_preview_frames(self, result):
+        self.preview_frames, self.preview_delay = result
+        if self.hovering and self.preview_frames:
+            self.show_preview_frame(0)
+
+    def show_preview_frame(self, index):
+        if not self.hovering or not self.thumb_label.winfo_exists():
+            return
+        self.preview_image = ImageTk.PhotoImage(image=self.preview_frames[index])
+        self.thumb_label.config(image=self.preview_image)
+        self.preview_after_id = self.thumb_label.after(
+            self.preview_delay, self.show_preview_frame, (index + 1) % len(self.preview_frames))
+
+    def stop_preview(self, event=None):
+        self.hovering = False
+        if self.preview_after_id:
+            self.thumb_label.after_cancel(self.preview_after_id)
+            self.preview_after_id = None
+        if self.thumb_label.winfo_exists():
+            self.thumb_label.config(image=self.thumbnail)
+
+    def set_preview_path(self, preview_path):
+        self.preview_path = preview_path
+        self.preview_frames = None
+        self.preview_task = None
+
+    @staticmethod
+    def format_duration(seconds):
+        return f"{seconds // 60}:{seconds % 60:02d}"
+
+    def update_views(self):
+        """Refresh the views label from video_data without rebuilding the item"""
+        if self.views_label and self.views_label.winfo_exists():
+            self.views_label.config(text=f"{self.video_data['views']} views")
+
+    def set_duration(self, metadata):
+        """Update the duration label once background probing finishes"""
+        if not self.duration_label or not self.duration_label.winfo_exists():
+            return
+        if metadata:
+            self.duration_label.config(text=self.format_duration(int(metadata['duration'])))
+        else:
+            self.duration_label.config(text="N/A")
+
+
+class SeekIndex:
+    """Keyframe positions and small preview images for one video.
+
+    Built once per file version and cached in SQLite. Keyframes are read from
+    the container without decoding (OpenCV raw packet mode, or ffprobe when
+    OpenCV cannot report key packets); previews are decoded at keyframes
+    roughly every preview_interval seconds and stored as JPEG bytes.
+    """
+
+    preview_interval = 2.0
+    preview_size = (160, 90)
+
+    def __init__(self, keyframes, previews):
+        self.keyframes = sorted(keyframes)
+        self.preview_frames = [frame_number for frame_number, _ in previews]
+        self.preview_images = [image for _, image in previews]
+
+    def keyframe_before(self, frame_number):
+        """Nearest keyframe at or before frame_number (0 if unknown)"""
+        i = bisect.bisect_right(self.keyframes, frame_number)
+        return self.keyframes[i - 1] if i else 0
+
+    def preview_near(self, frame_number):
+        """JPEG bytes of the closest preview at or before frame_number, or None"""
+        i = bisect.bisect_right(self.preview_frames, frame_number)
+        return self.preview_images[i - 1] if i else None
+
+    @classmethod
+    def load_or_build(cls, task, db, metadata, file_path):
+        """Return the cached index for a video, building and storing it on a miss (worker thread)"""
+        entry = metadata.lookup(file_path)
+        if not entry:
+            return None
+        cached = db.get_seek_index(entry['file_path'], entry['file_size'], entry['mtime'])
+        if cached:
+            return cls(*cached)
+
+        fps = entry['fps'] or 20
+        keyframes = cls.read_keyframes(file_path, fps, task)
+        previews = cls.build_previews(file_path, fps, entry['frame_count'], keyframes, task)
+        db.save_seek_index(entry['file_path'], entry['file_size'], entry['mtime'], keyframes, previews)
+        return cls(keyframes, previews)
+
+    @staticmethod
+    def read_keyframes(file_path, fps, task=None):
+        """List the frame numbers of key frames without decoding the video"""
+        has_key_frame = getattr(cv2, 'CAP_PROP_LRF_HAS_KEY_FRAME', None)
+        if has_key_frame is not None:
+            cap = cv2.VideoCapture(file_path, cv2.CAP_FFMPEG)
+            try:
+                # Raw mode: grab() returns encoded packets, so nothing is decoded
+                if cap.isOpened() and cap.set(cv2.CAP_PROP_FORMAT, -1):
+                    keyframes = []
+                    frame_number = 0
+                    while cap.grab():
+                        if cap.get(has_key_frame):
+                            keyframes.append(frame_number)
+                        frame_number += 1
+                        if task and frame_number % 500 == 0:
+                            task.check_cancelled()
+                    if keyframes:
+                        return keyframes
+            finally:
+                cap.release()
+
+        ffprobe = shutil.which("ffprobe")
+        if ffprobe:
+            try:
+                output = subprocess.run(
+                    [ffprobe, "-v", "error", "-select_streams", "v:0", "-skip_frame", "nokey",
+                     "-show_entries", "frame=pts_time,pkt_pts_time", "-of", "csv=p=0", file_path],
+                    capture_output=True, text=True, timeout=300).stdout
+                keyframes = set()
+                for line in output.splitlines():
+                    for value in line.split(','):
+                        try:
+                            keyframes.add(int(round(float(value) * fps)))
+                            break
+                        except ValueError:
+                            continue
+                return sorted(keyframes)
+            except Exception as e:
+                print(f"ffprobe keyframe scan failed for {file_path}: {e}")
+        return []
+
+    @classmethod
+    def build_previews(cls, file_path, fps, frame_count, keyframes, task=None):
+        """Decode small JPEG previews, preferring keyframes since they seek cheaply"""
+        step = max(1, int(fps * cls.preview_interval))
+        candidates = keyframes or range(0, max(frame_count, 1), step)
+        previews = []
+        last = None
+        cap = cv2.VideoCapture(file_path)
+        try:
+            for frame_number in candidates:
+                if last is not None and frame_number - last < step:
+                    continue
+                if task:
+                    task.check_cancelled()
+                cap.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                small = cv2.resize(frame, cls.preview_size, interpolation=cv2.INTER_AREA)
+                ok, buffer = cv2.imencode('.jpg', small, [cv2.IMWRITE_JPEG_QUALITY, 70])
+                if ok:
+                    previews.append((frame_number, buffer.tobytes()))
+                last = frame_number
+        finally:
+            cap.release()
+        return previews
+
+
+class PlaybackClock:
+    """Media clock for the player.
+
+    Runs on the wall clock by default; when an audio position source is
+    attached (a callable returning seconds or None) the audio is the master.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.base_pts = 0.0
+        self.base_time = None  # None while paused
+        self.audio_source = None
+
+    @property
+    def running(self):
+        return self.base_time is not None
+
+    def start(self):
+        with self.lock:
+            if self.base_time is None:
+                self.base_time = time.perf_counter()
+
+    def pause(self):
+        with self.lock:
+            self.base_pts = self._wall_time()
+            self.base_time = None
+
+    def seek(self, pts):
+        with self.lock:
+            self.base_pts = pts
+            if self.base_time is not None:
+                self.base_time = time.perf_counter()
+
+    def time(self):
+        if self.audio_source and self.running:
+            audio_time = self.audio_source()
+            if audio_time is not None:
+                with self.lock:
+                    # Keep the wall clock anchored so it continues smoothly when the audio ends
+                    if self.base_time is not None:
+                        self.base_pts = audio_time
+                        self.base_time = time.perf_counter()
+                return audio_time
+        with self.lock:
+            return self._wall_time()
+
+    def _wall_time(self):
+        if self.base_time is None:
+            return self.base_pts
+        return self.base_pts + time.perf_counter() - self.base_time
+
+
+class AudioStreamEngine:
+    """Streams a lesson's audio file through a sounddevice.OutputStream.
+
+    The stream callback reads one block at a time from a soundfile.SoundFile
+    and applies the current gain per block, so volume changes, seeks and
+    pause/resume take effect immediately without loading the whole file.
+    position() reports the time of the sample currently reaching the speaker
+    and serves as the player's master clock.
+    """
+
+    def __init__(self, audio_path, gain=1.0, blocksize=1024):
+        self.file = sf.SoundFile(audio_path)
+        self.samplerate = self.file.samplerate
+        self.gain = gain
+        self.lock = threading.Lock()
+        self.read_position = 0  # next frame to read from the file
+        self.block_start = 0  # file frame at the start of the last block sent
+        self.block_dac_time = 0.0  # stream time when that block reaches the DAC
+        self.pending_seek = None
+        self.eof = False
+        self.stream = sd.OutputStream(samplerate=self.samplerate, channels=self.file.channels,
+                                      dtype='float32', blocksize=blocksize, callback=self._callback)
+
+    @property
+    def duration(self):
+        return self.file.frames / self.samplerate
+
+    def start(self):
+        if not self.stream.active and not self.eof:
+            # After CallbackStop at the end of the file the stream is inactive but not stopped
+            if not self.stream.stopped:
+                self.stream.stop()
+            self.stream.start()
+
+    def pause(self):
+        if not self.stream.stopped:
+            self.stream.stop()
+
+    def seek(self, seconds):
+        frame = min(max(0, int(seconds * self.samplerate)), self.file.frames)
+        with self.lock:
+            if self.stream.active:
+                # Applied by the callback before its next read; report the new position meanwhile
+                self.pending_seek = frame
+                self.read_position = self.block_start = frame
+                self.block_dac_time = 0.0
+            else:
+                self._apply_seek(frame)
+
+    def position(self):
+        """Seconds of audio heard so far, or None when not playing"""
+        if not self.stream.active or self.eof:
+            return None
+        with self.lock:
+            block_start, dac_time, read_position = self.block_start, self.block_dac_time, self.read_position
+        if dac_time:
+            elapsed = max(0.0, self.stream.time - dac_time)
+            frames = min(block_start + elapsed * self.samplerate, read_position)
+        else:
+            # Backend does not report DAC times; subtract the output latency instead
+            frames = max(0.0, read_position - self.stream.latency * self.samplerate)
+        return frames / self.samplerate
+
+    def close(self):
+        try:
+            self.stream.close()
+        finally:
+            self.file.close()
+
+    def _apply_seek(self, frame):
+        self.file.seek(frame)
+        self.read_position = frame
+        self.block_start = frame
+        self.block_dac_time = 0.0
+        self.eof = frame >= self.file.frames
+
+    def _callback(self, outdata, frames, time_info, status):
+        with self.lock:
+            if self.pending_seek is not None:
+                self._apply_seek(self.pending_seek)
+                self.pending_seek = None
+            data = self.file.read(frames, dtype='float32', always_2d=True)
+            count = len(data)
+            self.block_start = self.read_position
+            self.block_dac_time = time_info.outputBufferDacTime
+            self.read_position += count
+
+        # Amplify safely with the gain in effect for this block
+        np.multiply(data, self.gain, out=data)
+        np.clip(data, -1.0, 1.0, out=outdata[:count])
+        if count < frames:
+            outdata[count:] = 0
+            self.eof = True
+            raise sd.CallbackStop()
+
+
+class VideoPlayerEngine:
+    """Decoder thread plus a bounded ring of display-ready frames.
+
+    The decoder reads, converts and scales frames ahead of the clock; the Tk
+    thread only takes the frame that is due from next_frame() and blits it.
+    Frames that fall behind the clock are dropped (before conversion when the
+    decoder is late, or at display time when several are due at once).
+    """
+
+    def __init__(self, file_path, fps, buffer_size=12):
+        self.file_path = file_path
+        self.fps = fps or 20
+        self.frame_duration = 1.0 / self.fps
+        self.buffer_size = buffer_size
+        self.clock = PlaybackClock()
+        self.frames = deque()
+        self.cond = threading.Condition()
+        self.target_size = (0, 0)
+        self.seek_target = None
+        self.seek_index = None
+        self.eof = False
+        self.running = True
+        self.error = None
+
+        # Statistics
+        self.frames_displayed = 0
+        self.frames_dropped = 0
+        self.drift_ms = 0.0
+        self.max_drift_ms = 0.0
+
+        self.thread = threading.Thread(target=self._decode_loop, daemon=True)
+        self.thread.start()
+
+    def set_target_size(self, width, height):
+        self.target_size = (width, height)
+
+    def set_seek_index(self, seek_index):
+        self.seek_index = seek_index
+
+    def play(self):
+        self.clock.start()
+        with self.cond:
+            self.cond.notify_all()
+
+    def pause(self):
+        self.clock.pause()
+
+    def seek(self, frame_number):
+        with self.cond:
+            self.seek_target = max(0, int(frame_number))
+            self.frames.clear()
+            self.eof = False
+            self.clock.seek(self.seek_target / self.fps)
+            self.cond.notify_all()
+
+    def close(self):
+        with self.cond:
+            self.running = False
+            self.cond.notify_all()
+
+    def position(self):
+        return self.clock.time()
+
+    def next_frame(self):
+        """Return (frame, seconds until the next frame, finished) for the Tk thread.
+
+        frame is a (frame_index, pts, image) tuple or None when nothing new
+        is due yet.
+        """
+        now = self.clock.time()
+        due = None
+        with self.cond:
+            while self.frames and self.frames[0][1] <= now + self.frame_duration / 2:
+                if due is not None:
+                    self.frames_dropped += 1
+                due = self.frames.popleft()
+            self.cond.notify_all()
+            next_pts = self.frames[0][1] if self.frames else None
+            finished = self.eof and not self.frames and due is None
+
+        if due is not None:
+            self.frames_displayed += 1
+            drift = (now - due[1]) * 1000.0
+            self.drift_ms = drift if self.frames_displayed == 1 else 0.9 * self.drift_ms + 0.1 * drift
+            self.max_drift_ms = max(self.max_drift_ms, abs(drift))
+
+        delay = (next_pts - self.clock.time()) if next_pts is not None else self.frame_duration
+        return due, max(0.0, delay), finished
+
+    def peek_frame(self):
+        """Return the next buffered frame without consuming it (used while paused)"""
+        with self.cond:
+            return self.frames[0] if self.frames else None
+
+    def stats_text(self):
+        return (f"Dropped frames: {self.frames_dropped} | "
+                f"A/V drift: {self.drift_ms:+.0f} ms (max {self.max_drift_ms:.0f} ms)")
+
+    def _decode_loop(self):
+        cap = cv2.VideoCapture(self.file_path)
+        if not cap.isOpened():
+            self.error = "Cannot open video file!"
+            with self.cond:
+                self.eof = True
+            return
+
+        next_index = 0
+        try:
+            while True:
+                with self.cond:
+                    while self.running and self.seek_target is None and (
+                            len(self.frames) >= self.buffer_size or self.eof):
+                        self.cond.wait(0.1)
+                    if not self.running:
+                        break
+                    target, self.seek_target = self.seek_target, None
+
+                if target is not None and not self._seek(cap, target):
+                    # Superseded by a newer seek while decoding forward
+                    continue
+                if target is not None:
+                    next_index = target
+
+                pts = next_index / self.fps
+
+                # Skip conversion for frames that are already late
+                if self.clock.running and pts < self.clock.time() - self.frame_duration:
+                    ok = cap.grab()
+                    with self.cond:
+                        if not ok:
+                            self.eof = True
+                        elif self.seek_target is None:
+                            self.frames_dropped += 1
+                    next_index += 1
+                    continue
+
+                ret, frame = cap.read()
+                if not ret:
+                    with self.cond:
+                        self.eof = True
+                    continue
+
+                image = self._prepare(frame)
+                with self.cond:
+                    # Discard the frame if a seek arrived while it was decoding
+                    if self.seek_target is None:
+                        self.frames.append((next_index, pts, image))
+                next_index += 1
+        finally:
+            cap.release()
+
+    def _seek(self, cap, target):
+        """Jump to the keyframe before target, then decode forward to it precisely"""
+        seek_index = self.seek_index
+        if seek_index is None or not seek_index.keyframes:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, target)
+            return True
+        keyframe = seek_index.keyframe_before(target)
+        cap.set(cv2.CAP_PROP_POS_FRAMES, keyframe)
+        for _ in range(target - keyframe):
+            if self.seek_target is not None:
+                return False
+            if not cap.grab():
+                break
+        return True
+
+    def _prepare(self, frame):
+        """Convert and scale a decoded frame to fit the player (decoder thread)"""
+        frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+
+        # Resize frame to fit the container while maintaining aspect ratio
+        container_width, container_height = self.target_size
+        if container_width > 1 and container_height > 1:
+            h, w, _ = frame.shape
+            ratio = min(container_width / w, container_height / h)
+            new_w, new_h = int(w * ratio), int(h * ratio)
+            frame = cv2.resize(frame, (new_w, new_h), interpolation=cv2.INTER_AREA)
+
+        return Image.fromarray(frame)
+
+
+class MssCaptureBackend:
+    """Fast screen grabber using mss (X11 shared memory / GDI BitBlt / CoreGraphics)"""
+
+    name = "mss"
+
+    def __init__(self):
+        self.sct = mss.mss()
+
+    def grab(self, region):
+        """region is (left, top, width, height); returns a BGR frame"""
+        left, top, width, height = region
+        shot = self.sct.grab({"left": left, "top": top, "width": width, "height": height})
+        return cv2.cvtColor(np.asarray(shot), cv2.COLOR_BGRA2BGR)
+
+    def close(self):
+        self.sct.close()
+
+
+class PyAutoGuiCaptureBackend:
+    """Fallback screen grabber through pyautogui (PIL ImageGrab)"""
+
+    name = "pyautogui"
+
+    def grab(self, region):
+        screenshot = pyautogui.screenshot(region=region)
+        return cv2.cvtColor(np.asarray(screenshot), cv2.COLOR_RGB2BGR)
+
+    def close(self):
+        pass
+
+
+def create_capture_backend():
+    """Return the fastest available capture backend"""
+    if mss is not None:
+        try:
+            return MssCaptureBackend()
+        except Exception as e:
+            print(f"Error initializing mss capture, falling back to pyautogui: {e}")
+    return PyAutoGuiCaptureBackend()
+
+
+class ScreenRecorder:
+    """Records a screen region at an exact frame rate.
+
+    A capture thread grabs frames on a fixed schedule and hands them to an
+    encoder thread through a bounded queue, so slow encoding never delays
+    the next grab. Each frame is tagged with the number of output slots it
+    covers, based on its capture timestamp: when capture falls behind the
+    last frame is duplicated, and when the encoder cannot keep up frames are
+    dropped and their slots given to the next one. The written file
+    therefore always runs at the declared fps and matches wall-clock time.
+    """
+
+    def __init__(self, filename, region, fps=20.0, backend_factory=create_capture_backend, queue_size=8):
+        self.filename = filename
+        self.region = tuple(int(v) for v in region)
+        self.fps = fps
+        self.backend_factory = backend_factory
+        self.frames = queue.Queue(maxsize=queue_size)
+        self.stop_event = threading.Event()
+        self.backend_name = None
+        self.error = None
+        self.stats = {"captured": 0, "written": 0, "duplicated": 0, "dropped": 0,
+                      "capture_time": 0.0, "encode_time": 0.0, "duration": 0.0}
+
+        fourcc = cv2.VideoWriter_fourcc(*'XVID')
+        self.writer = cv2.VideoWriter(filename, fourcc, fps, self.region[2:])
+        if not self.writer.isOpened():
+            raise RuntimeError(f"Could not open video writer for {filename}")
+
+        self.capture_thread = threading.Thread(target=self._capture_loop, daemon=True)
+        self.encoder_thread = threading.Thread(target=self._encode_loop, daemon=True)
+
+    def start(self):
+        self.encoder_thread.start()
+        self.capture_thread.start()
+
+    def stop(self, timeout=5.0):
+        """Stop recording, flush queued frames and close the file. Returns the stats."""
+        self.stop_event.set()
+        self.capture_thread.join(timeout)
+        self.encoder_thread.join(timeout)
+        self.writer.release()
+        return self.stats
+
+    def summary(self):
+        stats = self.stats
+        captured = max(1, stats["captured"])
+        written = max(1, stats["written"])
+        duration = max(1e-6, stats["duration"])
+        return (f"{self.backend_name}: {stats['written']} frames in {stats['duration']:.1f}s "
+                f"({stats['written'] / duration:.1f} fps out, {stats['captured'] / duration:.1f} fps captured), "
+                f"{stats['duplicated']} duplicated, {stats['dropped']} dropped, "
+                f"grab {stats['capture_time'] / captured * 1000:.1f} ms, "
+                f"encode {stats['encode_time'] / written * 1000:.1f} ms")
+
+    def _capture_loop(self):
+        try:
+            backend = self.backend_factory()
+        except Exception as e:
+            self.error = e
+            print(f"Screen recording error: {e}")
+            self.frames.put(None)
+            return
+        self.backend_name = backend.name
+        interval = 1.0 / self.fps
+        start = time.perf_counter()
+        slots_written = 0  # output slots already handed to the encoder
+        carried = 0  # slots of dropped frames, given to the next queued frame
+        frame = None
+        try:
+            while not self.stop_event.is_set():
+                grab_start = time.perf_counter()
+                frame = backend.grab(self.region)
+                now = time.perf_counter()
+                self.stats["captured"] += 1
+                self.stats["capture_time"] += now - grab_start
+
+                # The frame covers every slot up to and including its timestamp
+                slot = int((grab_start - start) * self.fps)
+                slots = slot + 1 - slots_written
+                if slots > 0:
+                    try:
+                        self.frames.put_nowait((frame, slots + carried))
+                        carried = 0
+                    except queue.Full:
+                        self.stats["dropped"] += 1
+                        carried += slots
+                    slots_written += slots
+
+                # Wait for the next slot
+                next_time = start + slots_written * interval
+                self.stop_event.wait(max(0.0, next_time - time.perf_counter()))
+        except Exception as e:
+            self.error = e
+            print(f"Screen recording error: {e}")
+        finally:
+            backend.close()
+            self.stats["duration"] = time.perf_counter() - start
+            # Hold the last frame until the moment recording stopped
+            slots = int(self.stats["duration"] * self.fps) - slots_written + carried
+            if frame is not None and slots > 0:
+                self.frames.put((frame, slots))
+            self.frames.put(None)
+
+    def _encode_loop(self):
+        width, height = self.region[2:]
+        while True:
+            item = self.frames.get()
+            if item is None:
+                break
+            frame, slots = item
+            encode_start = time.perf_counter()
+            if frame.shape[1] != width or frame.shape[0] != height:
+                # Region clipped at the screen edge
+                frame = cv2.resize(frame, (width, height))
+            for _ in range(slots):
+                self.writer.write(frame)
+            self.stats["written"] += slots
+            self.stats["duplicated"] += slots - 1
+            self.stats["encode_time"] += time.perf_counter() - encode_start
+
 
 class ASLLearner:
     def __init__(self, root, user_type, username, full_name="User"):
@@ -1318,6 +3996,17 @@ class ASLLearner:
 
         # Initialize database
         self.db = DatabaseManager()
+        # Background work runs on the executor; the Tk thread only updates widgets
+        self.executor = TaskExecutor(self.root)
+        self.metadata = VideoMetadataIndex(self.db, self.executor)
+        self.library = LibraryIndexer(self.db, self.executor)
+        self.library.on_change = self.refresh_gallery
+        # Recordings and uploads are transcoded in the background into playback and hover renditions
+        self.transcoder = Transcoder(self.db, self.executor)
+        self.transcoder.on_complete = self.on_transcode_complete
+        self.blobs = BlobStore(self.db)
+        self.gallery_task = None
+        self.search_task = None
 
         # Set application icon (if available)
         try:
@@ -1332,7 +4021,13 @@ class ASLLearner:
         self.current_frame = 0
         self.fps = 20
         self.total_frames = 0
-        self.cap = None
+        self.player = None
+        self.audio = None
+        self.frame_after_id = None
+        self.seek_index_task = None
+        self.scrubbing = False
+        self.pending_seek = None
+        self.seek_after_id = None
         self.playing = False
         self.paused = False
         self.volume = 2.0  # Default amplified volume
@@ -1342,16 +4037,32 @@ class ASLLearner:
         self.thumbnails = []
         self.current_video_index = -1
         self.all_videos = []
-
-        # Screen recording variables
-        self.screen_recording = False
-        self.screen_out = None
-        self.recording_thread = None
+        self.video_index = {}  # file_path -> video data
+        self.video_items = {}  # file_path -> displayed VideoItem
+        self.page_size = 200  # widgets built per "Show more" page
+        self.displayed_videos = []  # current result list, shown page by page
+        self.shown_count = 0
+        self.show_more_btn = None
+        self.search_debounce_ms = 200
+        self.filter_after_id = None
+
+        # Deferred view counts ({lesson_id: count}), flushed periodically and on exit
+        self.pending_views = {}
+        self.view_flush_interval = 30000
+
+        # Lesson recording through the ASL application
+        self.asl_process = None
+        self.lesson_path = None
+        self.lesson_saved = None
+        self.lesson_recording = False
+        # Screen recording of the ASL window, the fallback when it cannot record directly
+        self.screen_recorder = None
 
         # Create folders
         for folder in ["recordings_demonstrations", "recordings_practice", "uploaded_lessons",
-                       "uploaded_lessons/thumbnails", "saved_videos", "asl_learner_frame"]:
+                       "uploaded_lessons/thumbnails", "saved_videos", "asl_learner_frame", "renditions"]:
             os.makedirs(folder, exist_ok=True)
+        self.transcoder.start()
 
         # Header
         self.header = tk.Frame(root, bg="#2c3e50", height=60)
@@ -1415,11 +4126,57 @@ class ASLLearner:
             # Add ASL button for student
             self.add_student_asl_button()
 
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+
         self.load_all_videos()
+        self.root.after(self.view_flush_interval, self.periodic_view_flush)
+
+    def flush_view_counts(self, wait=False, on_saved=None):
+        """Write deferred view counts to the database (in the background unless wait=True)"""
+        if not self.pending_views:
+            return
+        pending, self.pending_views = self.pending_views, {}
+
+        def failed(e):
+            print(f"Error saving view counts: {e}")
+            for lesson_id, count in pending.items():
+                self.pending_views[lesson_id] = self.pending_views.get(lesson_id, 0) + count
+
+        if wait:
+            try:
+                self.db.increment_views_batch(pending)
+            except Exception as e:
+                failed(e)
+        else:
+            self.executor.submit(self.db.increment_views_batch, pending, on_done=on_saved, on_error=failed)
+
+    def periodic_view_flush(self):
+        self.flush_view_counts()
+        self.root.after(self.view_flush_interval, self.periodic_view_flush)
+
+    def shutdown(self):
+        """Persist pending state and stop background work before the window closes"""
+        self.flush_view_counts(wait=True)
+        # Ask a running ASL application to finalize its recording, then make sure it exits
+        if self.asl_process and self.asl_process.poll() is None:
+            self.send_asl_command("stop")
+            try:
+                self.asl_process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.asl_process.terminate()
+        self.library.stop()
+        self.transcoder.stop()
+        self.close_player()
+        self.executor.shutdown()
+
+    def on_close(self):
+        self.shutdown()
+        self.root.destroy()
 
     def logout(self):
         """Log out and return to login screen"""
         if messagebox.askyesno("Logout", "Are you sure you want to logout?"):
+            self.shutdown()
             self.root.destroy()
             login_root = tk.Tk()
             login_app = LoginPage(login_root)
@@ -1502,7 +4259,7 @@ class ASLLearner:
         instructions.pack(side='bottom', pady=20)
 
     def record_asl_lesson(self):
-        """Record the ASL application window/frame and save when closed"""
+        """Record a lesson straight from the ASL application and save when it is closed"""
         if self.user_type != "teacher":
             messagebox.showerror("Access Denied", "Only teachers can record lessons.")
             return
@@ -1511,115 +4268,137 @@ class ASLLearner:
             messagebox.showerror("Error", "asl.py not found!")
             return
 
-        # Start ASL application
-        self.asl_process = subprocess.Popen([sys.executable, "asl.py", "--fullscreen"])
-
-        # Wait a moment for the window to appear
-        time.sleep(2)
+        if self.asl_process and self.asl_process.poll() is None:
+            messagebox.showinfo("Recording", "The ASL application is already running.")
+            return
 
-        # Start screen recording
-        self.start_screen_recording()
+        # The recognizer writes its own output; recording is controlled over its stdin/stdout
+        timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        self.lesson_path = os.path.abspath(f"recordings_demonstrations/asl_lesson_{timestamp}.avi")
+        self.lesson_saved = None
+        self.lesson_recording = False
+        self.asl_process = subprocess.Popen([sys.executable, "asl.py", "--fullscreen", "--control"],
+                                            stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                            text=True, bufsize=1)
 
         # Show recording indicator
         self.rec_indicator.pack()
 
-        # Monitor the ASL process
-        threading.Thread(target=self.monitor_asl_process, daemon=True).start()
+        # Read events on a worker; they and the exit are handled on the Tk thread
+        self.executor.submit(self.read_asl_events, self.asl_process, with_task=True,
+                             on_progress=self.on_asl_event, on_done=self.on_asl_process_exit,
+                             on_error=self.on_asl_process_error)
+
+        # Fall back to screen recording if the application never starts recording itself
+        self.root.after(10000, self.check_lesson_recording)
+
+    def check_lesson_recording(self):
+        if self.asl_process and self.asl_process.poll() is None and not self.lesson_recording:
+            print("ASL application did not start recording, recording its window instead")
+            self.start_screen_recording()
+
+    def read_asl_events(self, task, process):
+        """Forward JSON events from the ASL application until it exits (runs on a worker thread)"""
+        for line in process.stdout:
+            try:
+                message = json.loads(line)
+            except ValueError:
+                # Regular output from the application
+                continue
+            if isinstance(message, dict) and "event" in message:
+                task.report_progress(message)
+        return process.wait()
+
+    def send_asl_command(self, cmd, **fields):
+        if not self.asl_process or self.asl_process.poll() is not None:
+            return
+        fields["cmd"] = cmd
+        try:
+            self.asl_process.stdin.write(json.dumps(fields) + "\n")
+            self.asl_process.stdin.flush()
+        except (OSError, ValueError) as e:
+            print(f"Error sending command to ASL application: {e}")
+
+    def on_asl_event(self, message):
+        event = message["event"]
+        if event == "ready":
+            self.send_asl_command("record", path=self.lesson_path)
+        elif event == "recording":
+            self.lesson_recording = True
+        elif event == "saved":
+            self.lesson_saved = message
+            self.executor.submit(self.transcoder.enqueue, message['path'],
+                                 on_error=lambda e: print(f"Error queueing transcode: {e}"))
+            print(f"Lesson recording saved: {message.get('frames')} frames, "
+                  f"{message.get('duration')}s, {message.get('dropped')} dropped")
+        elif event == "error":
+            if not self.lesson_recording and not self.screen_recorder:
+                print(f"ASL application could not record ({message.get('message')}), recording its window instead")
+                self.start_screen_recording()
+            else:
+                messagebox.showerror("Recording Error", f"Failed to record lesson: {message.get('message')}")
 
     def start_screen_recording(self):
-        """Start recording the screen"""
+        """Record the ASL application window to the lesson path"""
+        if self.screen_recorder or not self.asl_process or self.asl_process.poll() is not None:
+            return
+        if mss is None and pyautogui is None:
+            messagebox.showerror("Recording Error", "Screen recording needs mss or pyautogui.")
+            return
         try:
             # Find ASL window
             asl_window = None
-            for window in gw.getWindowsWithTitle(''):
-                if 'asl' in window.title.lower() or 'sign' in window.title.lower():
-                    asl_window = window
-                    break
+            if gw is not None:
+                for window in gw.getWindowsWithTitle(''):
+                    if 'asl' in window.title.lower() or 'sign' in window.title.lower():
+                        asl_window = window
+                        break
 
             if asl_window:
                 # Record specific window
-                screen_size = (asl_window.width, asl_window.height)
-                screen_pos = (asl_window.left, asl_window.top)
-            else:
+                region = (asl_window.left, asl_window.top, asl_window.width, asl_window.height)
+            elif pyautogui is not None:
                 # Record full screen as fallback
-                screen_size = (pyautogui.size().width, pyautogui.size().height)
-                screen_pos = (0, 0)
-
-            # Generate filename
-            timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-            filename = f"recordings_demonstrations/asl_lesson_{timestamp}.avi"
-
-            # Define the codec and create VideoWriter object
-            fourcc = cv2.VideoWriter_fourcc(*'XVID')
-            self.screen_out = cv2.VideoWriter(filename, fourcc, 20.0, screen_size)
-
-            self.screen_recording = True
-
-            # Start recording in a separate thread
-            self.recording_thread = threading.Thread(target=self.record_screen,
-                                                     args=(screen_pos, screen_size),
-                                                     daemon=True)
-            self.recording_thread.start()
+                region = (0, 0, pyautogui.size().width, pyautogui.size().height)
+            else:
+                monitor = mss.mss().monitors[1]
+                region = (monitor["left"], monitor["top"], monitor["width"], monitor["height"])
 
+            # Capture and encode on their own threads at an exact 20 FPS
+            self.screen_recorder = ScreenRecorder(self.lesson_path, region, fps=20.0)
+            self.screen_recorder.start()
         except Exception as e:
             messagebox.showerror("Recording Error", f"Failed to start screen recording: {str(e)}")
-            self.screen_recording = False
-
-    def record_screen(self, screen_pos, screen_size):
-        """Record the screen continuously"""
-        try:
-            while self.screen_recording:
-                # Capture screen
-                screenshot = pyautogui.screenshot(region=(screen_pos[0], screen_pos[1],
-                                                          screen_size[0], screen_size[1]))
-                frame = np.array(screenshot)
-                frame = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
-
-                # Write the frame
-                self.screen_out.write(frame)
-
-                # Small delay to control frame rate
-                time.sleep(0.05)  # ~20 FPS
-
-        except Exception as e:
-            print(f"Screen recording error: {e}")
-
-    def stop_screen_recording(self):
-        """Stop screen recording and save file"""
-        if self.screen_recording:
-            self.screen_recording = False
-
-            # Wait for recording thread to finish
-            if self.recording_thread and self.recording_thread.is_alive():
-                self.recording_thread.join(timeout=2.0)
-
-            # Release the video writer
-            if self.screen_out:
-                self.screen_out.release()
-                self.screen_out = None
-
-            # Hide recording indicator
-            self.rec_indicator.pack_forget()
-
-            # Reload videos to show the new recording
-            self.load_all_videos()
-
-    def monitor_asl_process(self):
-        """Monitor the ASL process and stop recording when it closes"""
-        try:
-            # Wait for the process to finish
-            self.asl_process.wait()
-
-            # Stop recording
-            self.stop_screen_recording()
-
-            # Show success message
-            messagebox.showinfo("Recording Complete",
-                                "ASL lesson recording has been saved successfully!")
-
-        except Exception as e:
-            print(f"Error monitoring ASL process: {e}")
-            self.stop_screen_recording()
+            self.screen_recorder = None
+
+    def finish_screen_recording(self, recorder):
+        """Stop the recorder and flush the file (runs on a worker thread)"""
+        recorder.stop()
+        print(f"Screen recording saved: {recorder.summary()}")
+        return {"path": recorder.filename}
+
+    def on_screen_recording_saved(self, message):
+        self.lesson_saved = message
+        self.executor.submit(self.transcoder.enqueue, message['path'],
+                             on_error=lambda e: print(f"Error queueing transcode: {e}"))
+        self.load_all_videos(folders=["recordings_demonstrations"])
+        messagebox.showinfo("Recording Complete", "ASL lesson recording has been saved successfully!")
+
+    def on_asl_process_exit(self, returncode):
+        """Refresh the library once the ASL application has closed and saved the lesson"""
+        self.rec_indicator.pack_forget()
+        self.asl_process = None
+        recorder, self.screen_recorder = self.screen_recorder, None
+        if recorder:
+            self.executor.submit(self.finish_screen_recording, recorder, on_done=self.on_screen_recording_saved,
+                                 on_error=lambda e: print(f"Error saving screen recording: {e}"))
+        elif self.lesson_saved:
+            self.load_all_videos(folders=["recordings_demonstrations"])
+            messagebox.showinfo("Recording Complete", "ASL lesson recording has been saved successfully!")
+
+    def on_asl_process_error(self, e):
+        print(f"Error monitoring ASL process: {e}")
+        self.rec_indicator.pack_forget()
 
     def run_script_normally(self, script_name):
         """Runs ASL without recording."""
@@ -1654,9 +4433,16 @@ class ASLLearner:
                                    activebackground="#219653", padx=20, pady=10)
             upload_btn.pack(side='right', padx=10)
 
+            bulk_btn = tk.Button(title_frame, text="📦 Bulk Import",
+                                 command=self.bulk_import_lessons,
+                                 bg="#16a085", fg="white", font=("Arial", 12, "bold"),
+                                 relief="flat", height=1, cursor="hand2",
+                                 activebackground="#138d75", padx=20, pady=10)
+            bulk_btn.pack(side='right', padx=10)
+
         # Refresh button
         refresh_btn = tk.Button(title_frame, text="🔄 Refresh",
-                                command=self.load_all_videos,
+                                command=lambda: self.load_all_videos(full_rescan=True),
                                 bg="#3498db", fg="white", font=("Arial", 11, "bold"),
                                 relief="flat", cursor="hand2",
                                 activebackground="#2980b9", padx=15, pady=8)
@@ -1673,7 +4459,7 @@ class ASLLearner:
         self.search_entry = tk.Entry(search_frame, textvariable=self.search_var, width=40,
                                      font=("Arial", 11), relief="solid", bd=1)
         self.search_entry.pack(side='left', padx=(0, 10))
-        self.search_entry.bind('<KeyRelease>', self.filter_videos)
+        self.search_entry.bind('<KeyRelease>', self.schedule_filter)
 
         # Filter by category
         tk.Label(search_frame, text="Category:", font=("Arial", 11, "bold"),
@@ -1692,7 +4478,7 @@ class ASLLearner:
 
         self.sort_var = tk.StringVar(value="Newest")
         sort_menu = ttk.Combobox(search_frame, textvariable=self.sort_var,
-                                 values=["Newest", "Oldest", "Title A-Z", "Title Z-A", "Most Views"],
+                                 values=["Newest", "Oldest", "Title A-Z", "Title Z-A", "Most Views", "Relevance"],
                                  state="readonly", width=12)
         sort_menu.pack(side='left', padx=(0, 10))
         sort_menu.bind('<<ComboboxSelected>>', self.filter_videos)
@@ -1728,11 +4514,89 @@ class ASLLearner:
 
     def show_upload_dialog(self):
         """Show the upload lesson dialog"""
-        UploadLessonDialog(self.root, self.db, self.username)
+        dialog = UploadLessonDialog(self.root, self.db, self.username, self.metadata, self.executor, self.blobs)
+        dialog.on_saved = self.on_video_saved
+
+    def bulk_import_lessons(self):
+        """Import every video from a folder or zip archive as uploaded lessons"""
+        choice = messagebox.askyesnocancel("Bulk Import",
+                                           "Import all videos from a folder?\n\n"
+                                           "Yes: choose a folder\nNo: choose a zip archive")
+        if choice is None:
+            return
+        if choice:
+            source = filedialog.askdirectory(title="Select Folder of Lesson Videos")
+        else:
+            source = filedialog.askopenfilename(title="Select Lesson Archive",
+                                                filetypes=[("Zip archives", "*.zip"), ("All files", "*.*")])
+        if not source:
+            return
 
-    def load_all_videos(self):
-        """Load all videos from all sources into a unified YouTube-style list"""
-        self.all_videos = []
+        window = tk.Toplevel(self.root)
+        window.title("Bulk Import")
+        window.geometry("420x140")
+        window.configure(bg="#f0f8ff")
+        window.transient(self.root)
+        status = tk.Label(window, text=f"Importing from {os.path.basename(source)}...",
+                          font=("Arial", 10), bg="#f0f8ff", fg="#2c3e50")
+        status.pack(pady=(15, 5))
+        bar = ttk.Progressbar(window, mode='determinate', length=380)
+        bar.pack(pady=5)
+
+        def progress(done, total, detail=None):
+            if window.winfo_exists():
+                bar['maximum'] = total
+                bar['value'] = done
+                text = f"Imported {done} of {total} videos"
+                status.config(text=f"{text}\n{detail}" if detail else text)
+
+        def finished(report):
+            if window.winfo_exists():
+                window.destroy()
+            self.load_all_videos(folders=["uploaded_lessons"])
+            messagebox.showinfo("Bulk Import", BulkImporter.format_report(report))
+
+        def failed(e):
+            if window.winfo_exists():
+                window.destroy()
+            messagebox.showerror("Bulk Import", f"Import failed: {str(e)}")
+
+        importer = BulkImporter(self.db, self.blobs, self.metadata)
+        task = self.executor.submit(importer.run, source, self.username, with_task=True,
+                                    on_progress=progress, on_done=finished, on_error=failed)
+        tk.Button(window, text="Stop", command=lambda: (task.cancel(), window.destroy()),
+                  bg="#e74c3c", fg="white", font=("Arial", 9, "bold"), relief="flat").pack(pady=5)
+
+    def on_video_saved(self, folder, file_path):
+        self.load_all_videos(folders=[folder])
+        self.executor.submit(self.transcoder.enqueue, file_path,
+                             on_error=lambda e: print(f"Error queueing transcode for {file_path}: {e}"))
+
+    def on_transcode_complete(self, source_path, rendition_path, preview_path):
+        """Enable the hover preview on a displayed item once its renditions are ready"""
+        key = self.transcoder.key(source_path)
+        for path, item in self.video_items.items():
+            if self.transcoder.key(path) == key:
+                item.set_preview_path(preview_path)
+
+    def load_all_videos(self, full_rescan=False, folders=None):
+        """Show the indexed library now and refresh it after a background rescan"""
+        self.refresh_gallery()
+        self.library.request_scan(self.on_library_scanned, full=full_rescan, folders=folders)
+
+    def on_library_scanned(self, changed):
+        if changed:
+            self.refresh_gallery()
+
+    def refresh_gallery(self):
+        """Reload the video list from the database in the background"""
+        if self.gallery_task and not self.gallery_task.done():
+            self.gallery_task.cancel()
+        self.gallery_task = self.executor.submit(self.query_all_videos, on_done=self.show_all_videos)
+
+    def query_all_videos(self):
+        """Load all videos from all sources into a unified YouTube-style list (runs on a worker thread)"""
+        all_videos = []
 
         # Load uploaded lessons from database
         try:
@@ -1742,113 +4606,27 @@ class ASLLearner:
                 if os.path.exists(lesson['file_path']):
                     lesson['type'] = 'uploaded'
                     lesson['source'] = 'Uploaded Lesson'
-                    self.all_videos.append(lesson)
+                    all_videos.append(lesson)
                 else:
                     print(f"Uploaded lesson file not found: {lesson['file_path']}")
         except Exception as e:
             print(f"Error loading uploaded lessons: {e}")
 
-        # Load recorded demonstrations (including screen recordings)
-        demo_folder = "recordings_demonstrations"
-        if os.path.exists(demo_folder):
-            video_extensions = ['*.avi', '*.mp4', '*.mov', '*.mkv', '*.wmv', '*.flv', '*.webm']
-            for ext in video_extensions:
-                try:
-                    for video_file in glob.glob(os.path.join(demo_folder, ext)):
-                        if os.path.exists(video_file):
-                            video_data = {
-                                'file_path': video_file,
-                                'title': os.path.basename(video_file)
-                                .replace('recording_', '')
-                                .replace('asl_lesson_', 'ASL Lesson ')
-                                .replace('.avi', '')
-                                .replace('.mp4', '')
-                                .replace('_', ' ')
-                                .title(),
-                                'type': 'demonstration',
-                                'source': 'Demonstration',
-                                'uploaded_by': 'System',
-                                'file_size': os.path.getsize(video_file),
-                                'upload_date': datetime.fromtimestamp(os.path.getmtime(video_file)).strftime("%Y-%m-%d")
-                            }
-                            self.all_videos.append(video_data)
-                except Exception as e:
-                    print(f"Error loading demonstration videos with extension {ext}: {e}")
-
-        # Load practice sessions
-        practice_folder = "recordings_practice"
-        if os.path.exists(practice_folder):
-            for ext in video_extensions:
-                try:
-                    for video_file in glob.glob(os.path.join(practice_folder, ext)):
-                        if os.path.exists(video_file):
-                            video_data = {
-                                'file_path': video_file,
-                                'title': os.path.basename(video_file)
-                                .replace('recording_', '')
-                                .replace('.avi', '')
-                                .replace('.mp4', '')
-                                .replace('_', ' ')
-                                .title(),
-                                'type': 'practice',
-                                'source': 'Practice Session',
-                                'uploaded_by': 'System',
-                                'file_size': os.path.getsize(video_file),
-                                'upload_date': datetime.fromtimestamp(os.path.getmtime(video_file)).strftime("%Y-%m-%d")
-                            }
-                            self.all_videos.append(video_data)
-                except Exception as e:
-                    print(f"Error loading practice videos with extension {ext}: {e}")
+        # Load demonstrations, practice sessions, saved and ASL frame videos from the library index
+        try:
+            all_videos.extend(self.db.get_library_files())
+        except Exception as e:
+            print(f"Error loading library index: {e}")
 
-        # Load saved videos
-        saved_folder = "saved_videos"
-        if os.path.exists(saved_folder):
-            for ext in video_extensions:
-                try:
-                    for video_file in glob.glob(os.path.join(saved_folder, ext)):
-                        if os.path.exists(video_file):
-                            video_data = {
-                                'file_path': video_file,
-                                'title': os.path.basename(video_file)
-                                .replace('saved_video_', '')
-                                .replace('.mp4', '')
-                                .replace('.avi', '')
-                                .replace('_', ' ')
-                                .title(),
-                                'type': 'saved',
-                                'source': 'Saved Video',
-                                'uploaded_by': 'System',
-                                'file_size': os.path.getsize(video_file),
-                                'upload_date': datetime.fromtimestamp(os.path.getmtime(video_file)).strftime("%Y-%m-%d")
-                            }
-                            self.all_videos.append(video_data)
-                except Exception as e:
-                    print(f"Error loading saved videos with extension {ext}: {e}")
+        return all_videos
 
-        # Load ASL Learner Frame videos
-        asl_frame_folder = "asl_learner_frame"
-        if os.path.exists(asl_frame_folder):
-            for ext in video_extensions:
-                try:
-                    for video_file in glob.glob(os.path.join(asl_frame_folder, ext)):
-                        if os.path.exists(video_file):
-                            video_data = {
-                                'file_path': video_file,
-                                'title': os.path.basename(video_file)
-                                .replace('asl_frame_', 'ASL Frame: ')
-                                .replace('.mp4', '')
-                                .replace('.avi', '')
-                                .replace('_', ' ')
-                                .title(),
-                                'type': 'asl_frame',
-                                'source': 'ASL Learner Frame',
-                                'uploaded_by': 'System',
-                                'file_size': os.path.getsize(video_file),
-                                'upload_date': datetime.fromtimestamp(os.path.getmtime(video_file)).strftime("%Y-%m-%d")
-                            }
-                            self.all_videos.append(video_data)
-                except Exception as e:
-                    print(f"Error loading ASL frame videos with extension {ext}: {e}")
+    def show_all_videos(self, all_videos):
+        for video in all_videos:
+            if video.get('type') == 'uploaded':
+                # Include views that have not been flushed to the database yet
+                video['views'] += self.pending_views.get(video['id'], 0)
+        self.all_videos = all_videos
+        self.video_index = {video['file_path']: video for video in self.all_videos}
 
         # Update video count
         self.video_count_label.config(text=f"Total Videos: {len(self.all_videos)}")
@@ -1856,13 +4634,42 @@ class ASLLearner:
         # Apply current filters
         self.filter_videos()
 
+    def schedule_filter(self, event=None):
+        """Debounce search typing so the query runs once the user pauses"""
+        if self.filter_after_id:
+            self.root.after_cancel(self.filter_after_id)
+        self.filter_after_id = self.root.after(self.search_debounce_ms, self.filter_videos)
+
     def filter_videos(self, event=None):
         """Filter and sort videos based on search and category filters"""
+        self.filter_after_id = None
         search_term = self.search_var.get().lower()
         category_filter = self.category_var.get()
         sort_by = self.sort_var.get()
 
-        # Filter videos
+        # Use the full-text index when available; filtering and sorting happen in SQL on a worker
+        if self.db.fts_enabled:
+            if sort_by == "Most Views" and self.pending_views:
+                # Save deferred views on a worker first so the ranking includes them
+                self.flush_view_counts(on_saved=lambda _: self.filter_videos())
+                return
+            if self.search_task and not self.search_task.done():
+                self.search_task.cancel()
+            self.search_task = self.executor.submit(
+                self.db.search_lessons, search_term, category_filter, sort_by,
+                on_done=self.show_search_results,
+                on_error=lambda e: self.search_failed(e, search_term, category_filter, sort_by))
+            return
+
+        self.filter_videos_locally(search_term, category_filter, sort_by)
+
+    def search_failed(self, error, search_term, category_filter, sort_by):
+        """Full-text query failed; filter with plain substring matching instead"""
+        print(f"Error searching lessons, falling back to simple filtering: {error}")
+        self.filter_videos_locally(search_term, category_filter, sort_by)
+
+    def filter_videos_locally(self, search_term, category_filter, sort_by):
+        """Filter and sort the loaded videos in Python (used without full-text search)"""
         filtered_videos = []
         for video in self.all_videos:
             # Search filter
@@ -1897,11 +4704,16 @@ class ASLLearner:
         # Display filtered videos
         self.display_videos(filtered_videos)
 
+    def show_search_results(self, paths):
+        self.display_videos([self.video_index[path] for path in paths if path in self.video_index])
+
     def display_videos(self, videos):
         """Display videos in YouTube-style list"""
         # Clear existing content
         for widget in self.scrollable_frame.winfo_children():
             widget.destroy()
+        self.video_items = {}
+        self.show_more_btn = None
 
         if not videos:
             # Show no results message
@@ -1911,35 +4723,53 @@ class ASLLearner:
             no_results.pack(pady=50)
             return
 
-        # Display each video
-        for video_data in videos:
-            VideoItem(self.scrollable_frame, video_data, self.select_video, self.db)
+        # Large result sets are built a page at a time
+        self.displayed_videos = videos
+        self.shown_count = 0
+        self.show_more_videos()
+
+    def show_more_videos(self):
+        """Append the next page of the current results"""
+        if self.show_more_btn:
+            self.show_more_btn.destroy()
+            self.show_more_btn = None
+
+        videos = self.displayed_videos
+        for video_data in videos[self.shown_count:self.shown_count + self.page_size]:
+            item = VideoItem(self.scrollable_frame, video_data, self.select_video, self.db, self.metadata,
+                             self.executor, self.transcoder.preview_for(video_data['file_path']))
+            self.video_items[video_data['file_path']] = item
+        self.shown_count = min(len(videos), self.shown_count + self.page_size)
 
         # Update video count
-        self.video_count_label.config(text=f"Showing {len(videos)} of {len(self.all_videos)} videos")
+        if self.shown_count < len(videos):
+            self.show_more_btn = tk.Button(self.scrollable_frame,
+                                           text=f"Show more ({len(videos) - self.shown_count} remaining)",
+                                           command=self.show_more_videos,
+                                           bg="#3498db", fg="white", font=("Arial", 11))
+            self.show_more_btn.pack(pady=10)
+            self.video_count_label.config(
+                text=f"Showing {self.shown_count} of {len(videos)} matches ({len(self.all_videos)} videos)")
+        else:
+            self.video_count_label.config(text=f"Showing {len(videos)} of {len(self.all_videos)} videos")
 
     def select_video(self, video_path):
         """Handle video selection"""
         self.filename = video_path
 
         # Find the video data to get proper title
-        video_title = "Selected Video"
-        video_id = None
-        for video in self.all_videos:
-            if video['file_path'] == video_path:
-                video_title = video.get('title', 'Selected Video')
-                # Get video ID for uploaded lessons to increment views
-                if video.get('type') == 'uploaded' and 'id' in video:
-                    video_id = video['id']
-                break
+        video = self.video_index.get(video_path)
+        video_title = video.get('title', 'Selected Video') if video else "Selected Video"
 
         self.selected_video_label.config(text=f"Now Playing: {video_title}")
 
-        # Increment views for uploaded lessons
-        if video_id:
-            self.db.increment_views(video_id)
-            # Refresh the video list to update view counts
-            self.load_all_videos()
+        # Increment views for uploaded lessons; the database write is deferred
+        if video and video.get('type') == 'uploaded' and 'id' in video:
+            video['views'] = video.get('views', 0) + 1
+            self.pending_views[video['id']] = self.pending_views.get(video['id'], 0) + 1
+            item = self.video_items.get(video_path)
+            if item:
+                item.update_views()
 
         self.open_video()
 
@@ -1971,6 +4801,11 @@ class ASLLearner:
                                              font=("Arial", 14, "bold"), bg="#2c3e50", fg="white")
         self.selected_video_label.pack(pady=5)
 
+        # Playback statistics (dropped frames and A/V drift)
+        self.player_stats_label = tk.Label(self.player_container, text="",
+                                           font=("Arial", 9), bg="#2c3e50", fg="#95a5a6")
+        self.player_stats_label.pack()
+
         # Controls frame - fixed at bottom
         self.controls_frame = tk.Frame(self.player_container, bg="#34495e", height=80)
         self.controls_frame.pack(fill='x', pady=5, side='bottom')
@@ -2023,6 +4858,8 @@ class ASLLearner:
                                  bg="#2c3e50", fg="white", highlightthickness=0,
                                  sliderrelief="flat", troughcolor="#7f8c8d")
         self.seek_bar.pack(fill='x', padx=10, pady=5)
+        self.seek_bar.bind("<ButtonPress-1>", self.start_scrub)
+        self.seek_bar.bind("<ButtonRelease-1>", self.end_scrub)
 
         # Time label
         self.time_label = tk.Label(self.controls_frame, text="00:00 / 00:00 (Remaining: 00:00)",
@@ -2031,96 +4868,205 @@ class ASLLearner:
 
     def set_volume(self, value):
         self.volume = float(value)
+        if self.audio:
+            self.audio.gain = self.volume
 
     def open_video(self):
         if not self.filename:
             return
-        self.cap = cv2.VideoCapture(self.filename)
-        if not self.cap.isOpened():
+        self.close_player()
+        # Play the lighter transcoded rendition when one is ready
+        play_path = self.transcoder.rendition_for(self.filename) or self.filename
+        metadata = self.metadata.lookup(play_path)
+        if not metadata:
             messagebox.showerror("Error", "Cannot open video file!")
             return
-        self.total_frames = int(self.cap.get(cv2.CAP_PROP_FRAME_COUNT))
-        self.fps = self.cap.get(cv2.CAP_PROP_FPS)
+        self.total_frames = metadata['frame_count']
+        self.fps = metadata['fps'] or 20
+        self.player = VideoPlayerEngine(play_path, self.fps)
+        self.player.set_target_size(self.video_container.winfo_width(), self.video_container.winfo_height())
+
+        # Stream the recorded audio if available; it becomes the master clock
+        audio_path = self.filename.replace(".avi", "_audio.wav")
+        if os.path.exists(audio_path):
+            try:
+                self.audio = AudioStreamEngine(audio_path, gain=self.volume)
+                self.player.clock.audio_source = self.audio.position
+            except Exception as e:
+                print(f"Error opening audio: {e}")
+                self.audio = None
+
+        # Load (or build once) the keyframe/preview index used for seeking
+        if self.seek_index_task and not self.seek_index_task.done():
+            self.seek_index_task.cancel()
+        player = self.player
+        self.seek_index_task = self.executor.submit(
+            SeekIndex.load_or_build, self.db, self.metadata, play_path, with_task=True,
+            on_done=player.set_seek_index,
+            on_error=lambda e: print(f"Error building seek index for {self.filename}: {e}"))
         self.current_frame = 0
         self.seek_bar.config(to=self.total_frames)
         self.update_time_label()
         self.play_video()
 
     def play_video(self):
-        if not self.cap:
+        if not self.player:
             self.open_video()
+            return
         self.playing = True
         self.paused = False
 
-        # Play audio if available
-        audio_path = self.filename.replace(".avi", "_audio.wav")
-        if os.path.exists(audio_path):
-            threading.Thread(target=self.play_audio_file, args=(audio_path,), daemon=True).start()
+        # Resume audio from the video position
+        if self.audio:
+            try:
+                self.audio.seek(self.player.position())
+                self.audio.start()
+            except Exception as e:
+                print(f"Error playing audio: {e}")
+        self.player.play()
 
-        self.show_frame()
+        self.schedule_frame(0)
 
-    def play_audio_file(self, audio_path):
-        """Play audio with amplified volume"""
-        try:
-            data, fs = sf.read(audio_path, dtype='float32')
-            data = np.clip(data * self.volume, -1.0, 1.0)  # Amplify safely
-            sd.play(data, fs)
-            sd.wait()
-        except Exception as e:
-            print(f"Error playing audio: {e}")
+    def close_player(self):
+        if self.player:
+            self.player.close()
+            self.player = None
+        if self.audio:
+            try:
+                self.audio.close()
+            except Exception as e:
+                print(f"Error closing audio: {e}")
+            self.audio = None
 
     def pause_video(self):
         self.paused = True
-        sd.stop()
+        if self.audio:
+            self.audio.pause()
+        if self.player:
+            self.player.pause()
 
     def stop_video(self):
         self.playing = False
-        sd.stop()
-        if self.cap:
-            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+        if self.audio:
+            self.audio.pause()
+            self.audio.seek(0)
+        if self.player:
+            self.player.pause()
+            self.player.seek(0)
             self.current_frame = 0
             self.seek_var.set(0)
             self.update_time_label()
             self.video_label.config(image="")
 
+    def start_scrub(self, event=None):
+        self.scrubbing = True
+
+    def end_scrub(self, event=None):
+        self.scrubbing = False
+        if self.pending_seek is not None:
+            self.apply_seek()
+
     def seek_video(self, val):
-        if self.cap:
-            frame_num = int(float(val))
-            self.cap.set(cv2.CAP_PROP_POS_FRAMES, frame_num)
-            self.current_frame = frame_num
-            self.update_time_label()
+        """Coalesce seek bar movement; while dragging only previews are shown"""
+        if not self.player:
+            return
+        frame_num = int(float(val))
+        if frame_num == self.current_frame and self.pending_seek is None:
+            # Triggered by the playback loop updating the seek bar
+            return
+        self.pending_seek = frame_num
+        self.current_frame = frame_num
+        self.update_time_label()
+
+        shown_preview = self.show_seek_preview(frame_num)
+        if self.scrubbing and shown_preview:
+            # The real seek happens on release
+            return
+        if self.seek_after_id is None:
+            self.seek_after_id = self.root.after(100 if self.scrubbing else 0, self.apply_seek)
+
+    def apply_seek(self):
+        """Send the latest requested position to the decoder"""
+        if self.seek_after_id:
+            self.root.after_cancel(self.seek_after_id)
+        self.seek_after_id = None
+        if self.pending_seek is None or not self.player:
+            return
+        target, self.pending_seek = self.pending_seek, None
+        self.player.seek(target)
+        if self.audio:
+            self.audio.seek(target / self.fps)
+        if self.paused or not self.playing:
+            # Show the new position when playback is stopped
+            self.root.after(50, self.show_paused_frame)
+
+    def show_seek_preview(self, frame_num):
+        """Show the cached preview nearest to frame_num; returns False if none is available"""
+        seek_index = self.player.seek_index if self.player else None
+        preview = seek_index.preview_near(frame_num) if seek_index else None
+        if preview is None:
+            return False
+        img = Image.open(io.BytesIO(preview))
+        width, height = self.video_container.winfo_width(), self.video_container.winfo_height()
+        if width > 1 and height > 1:
+            ratio = min(width / img.width, height / img.height)
+            img = img.resize((int(img.width * ratio), int(img.height * ratio)), Image.Resampling.BILINEAR)
+        imgtk = ImageTk.PhotoImage(image=img)
+        self.video_label.imgtk = imgtk
+        self.video_label.configure(image=imgtk)
+        return True
+
+    def show_paused_frame(self):
+        """Blit the decoded frame at the current position while playback is paused"""
+        if not self.player or (self.playing and not self.paused):
+            return
+        frame = self.player.peek_frame()
+        if frame is None:
+            self.root.after(50, self.show_paused_frame)
+            return
+        imgtk = ImageTk.PhotoImage(image=frame[2])
+        self.video_label.imgtk = imgtk
+        self.video_label.configure(image=imgtk)
+
+    def schedule_frame(self, delay_ms):
+        if self.frame_after_id:
+            self.root.after_cancel(self.frame_after_id)
+        self.frame_after_id = self.root.after(delay_ms, self.show_frame)
 
     def show_frame(self):
-        if self.cap and self.playing and not self.paused:
-            ret, frame = self.cap.read()
-            if ret:
-                self.current_frame = int(self.cap.get(cv2.CAP_PROP_POS_FRAMES))
-                frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-
-                # Resize frame to fit the container while maintaining aspect ratio
-                container_width = self.video_container.winfo_width()
-                container_height = self.video_container.winfo_height()
-
-                # If container dimensions are available, resize accordingly
-                if container_width > 1 and container_height > 1:
-                    h, w, _ = frame.shape
-                    ratio = min(container_width / w, container_height / h)
-                    new_w, new_h = int(w * ratio), int(h * ratio)
-                    frame = cv2.resize(frame, (new_w, new_h))
-
-                img = Image.fromarray(frame)
-                imgtk = ImageTk.PhotoImage(image=img)
-                self.video_label.imgtk = imgtk
-                self.video_label.configure(image=imgtk)
+        """Blit the frame that is due; decoding and scaling happen on the player's thread"""
+        self.frame_after_id = None
+        if not (self.player and self.playing and not self.paused):
+            return
+        if self.scrubbing:
+            # Previews own the display while the seek bar is dragged
+            self.schedule_frame(30)
+            return
+
+        self.player.set_target_size(self.video_container.winfo_width(), self.video_container.winfo_height())
+        frame, delay, finished = self.player.next_frame()
+        if finished:
+            if self.player.error:
+                messagebox.showerror("Error", self.player.error)
+            self.stop_video()
+            return
+
+        if frame is not None:
+            frame_index, pts, image = frame
+            imgtk = ImageTk.PhotoImage(image=image)
+            self.video_label.imgtk = imgtk
+            self.video_label.configure(image=imgtk)
+            if not self.scrubbing and self.pending_seek is None:
+                self.current_frame = frame_index + 1
                 self.seek_var.set(self.current_frame)
                 self.update_time_label()
-                delay = int(1000 / self.fps)
-                self.root.after(delay, self.show_frame)
-            else:
-                self.stop_video()
+            if self.player.frames_displayed % 10 == 0:
+                self.player_stats_label.config(text=self.player.stats_text())
+
+        self.schedule_frame(max(1, min(int(delay * 1000), 50)))
 
     def update_time_label(self):
-        if self.cap:
+        if self.player:
             total_secs = int(self.total_frames / self.fps)
             current_secs = int(self.current_frame / self.fps)
             remaining_secs = total_secs - current_secs
@@ -2128,7 +5074,41 @@ class ASLLearner:
             self.time_label.config(text=f"{fmt(current_secs)} / {fmt(total_secs)} (Remaining: {fmt(remaining_secs)})")
 
 
+def run_bulk_import(args):
+    """Command-line bulk import: python main.py --import <folder or zip> [--user NAME]"""
+    db = DatabaseManager()
+    importer = BulkImporter(db, BlobStore(db), VideoMetadataIndex(db), workers=args.workers)
+
+    class ConsoleTask:
+        cancelled = False
+
+        def check_cancelled(self):
+            pass
+
+        def report_progress(self, done, total, detail=""):
+            print(f"\r{done}/{total} videos {detail[:50]:<50}", end="", flush=True)
+
+    report = importer.run(ConsoleTask(), args.import_path, args.user, args.category)
+    print()
+    print(BulkImporter.format_report(report))
+
+
 if __name__ == "__main__":
-    login_root = tk.Tk()
-    login_app = LoginPage(login_root)
-    login_root.mainloop()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="ASL Learner")
+    parser.add_argument("--import", dest="import_path", help="bulk import videos from a folder or zip archive")
+    parser.add_argument("--user", default="teacher", help="uploader recorded for imported lessons")
+    parser.add_argument("--category", default="General", help="category for imported lessons")
+    parser.add_argument("--workers", type=int, default=4, help="parallel import workers")
+    parser.add_argument("--bench-kdf", type=float, nargs='?', const=250.0, metavar="TARGET_MS",
+                        help="benchmark password hashing work factors against a login latency target")
+    parser.add_argument("--apply", action="store_true", help="with --bench-kdf, save the recommended work factor")
+    args = parser.parse_args()
+
+    if args.bench_kdf is not None:
+        benchmark_kdf(args.bench_kdf, apply=args.apply)
+    elif args.import_path:
+        run_bulk_import(args)
+    else:
+        login_root = tk.Tk()
+        login_app = LoginPage(login_root)
+        login_root.mainloop()
\ No newline at end of file